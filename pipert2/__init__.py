@@ -2,12 +2,13 @@ __version__ = "2.1.3"
 
 # User interaction classes
 from .core import Pipe, Wire
+from .utils.parameter import Parameter
 
 # Interfaces for user implementations
 from .core import SourceRoutine, MiddleRoutine, DestinationRoutine, Network, MessageHandler, DataTransmitter
 
 # Given implementations
-from .core import QueueNetwork, QueueHandler, SharedMemoryTransmitter, BasicTransmitter
+from .core import QueueNetwork, QueueHandler, SocketNetwork, TcpNetwork, SocketHandler, SharedMemoryTransmitter, BasicTransmitter
 
 # Event names.
-from .utils import START_EVENT_NAME, STOP_EVENT_NAME, KILL_EVENT_NAME
+from .utils import START_EVENT_NAME, STOP_EVENT_NAME, KILL_EVENT_NAME, UPDATE_PARAMS_EVENT_NAME, PROFILE_EVENT_NAME
@@ -1,4 +1,4 @@
 from .base import DataTransmitter, BasicTransmitter, SharedMemoryTransmitter, Payload, Wire, Message, Routine, \
     DestinationRoutine, MiddleRoutine, SourceRoutine, Flow, Pipe
-from .managers import QueueNetwork, Network, EventBoard
-from .handlers import QueueHandler, EventHandler, MessageHandler
+from .managers import QueueNetwork, SocketNetwork, TcpNetwork, Network, EventBoard
+from .handlers import QueueHandler, SocketHandler, EventHandler, MessageHandler
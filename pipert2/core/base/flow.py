@@ -42,14 +42,17 @@ class Flow(EventExecutorInterface):
         self.flow_process = Dummy()
 
         flow_events_to_listen = set(self.get_events().keys())
+        routines_events = {}
 
         for routine in routines:
             routine.set_logger(logger=logger.getChild(routine.name))
             routine.flow_name = self.name
-            flow_events_to_listen.update(routine.get_events().keys())
+            routines_events[routine.name] = set(routine.get_events().keys()).union(routine.get_mailbox_events().keys())
+            flow_events_to_listen.update(routines_events[routine.name])
             self.routines[routine.name] = routine
 
-        self.event_handler: EventHandler = event_board.get_event_handler(flow_events_to_listen)
+        self.event_handler: EventHandler = event_board.get_event_handler(flow_events_to_listen, flow_name=self.name,
+                                                                         routines_events=routines_events)
 
     def build(self) -> None:
         """Start the flow process.
@@ -66,7 +69,11 @@ class Flow(EventExecutorInterface):
 
         event: Method = self.event_handler.wait()
         while event.event_name != KILL_EVENT_NAME:
-            self.execute_event(event)
+            results = self.execute_event(event)
+
+            if event.request_id is not None:
+                self.event_handler.reply(event, results)
+
             event = self.event_handler.wait()
 
         self.execute_event(Method(STOP_EVENT_NAME))
@@ -82,26 +89,36 @@ class Flow(EventExecutorInterface):
     def stop(self):
         self._logger.plog("Stopping")
 
-    def execute_event(self, event: Method) -> None:
+    def execute_event(self, event: Method) -> dict:
         """Execute the event callbacks in the flow and its routines.
 
         Args:
             event: The event to be executed.
 
+        Returns:
+            The results of the callbacks of the routines that listen to the event, mapped by the routines names.
+
         """
 
+        results = {}
+
         if event.is_applied_on_flow(self.name):
             if event.is_applied_on_specific_routines(self.name):
-                routines = event.specific_flow_routines.get(self.name)
-                for routine in routines:
-                    if routine in self.routines.keys():
-                        self.routines.get(routine).execute_event(event)
+                routines = [self.routines.get(routine) for routine in event.specific_flow_routines.get(self.name)
+                            if routine in self.routines.keys()]
             else:
-                for routine in self.routines.values():
-                    routine.execute_event(event)
+                routines = self.routines.values()
+
+            for routine in routines:
+                result = routine.execute_event(event)
+
+                if routine.listens_to(event.event_name):
+                    results[routine.name] = result
 
             EventExecutorInterface.execute_event(self, event)
 
+        return results
+
     def join(self) -> None:
         """Block until the flow process terminates
 
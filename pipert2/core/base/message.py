@@ -1,7 +1,8 @@
 import collections
-import time
 import pickle
+from typing import List
 from pipert2.core.base.payload import Payload
+from pipert2.utils.clock import monotonic_ns, MONOTONIC_CLOCK_ID
 
 
 class Message:
@@ -23,7 +24,11 @@ class Message:
         Attributes:
             payload (Payload): The payload that manages the data.
             source_address (str): Where the Message was first conceived.
-            history (collections.OrderedDict): Transition history of the Message between the routines
+            history (collections.OrderedDict): Transition history of the Message between the routines, tuples of the
+                entry and exit times of the message in monotonic nanoseconds mapped by the routines it passed through.
+            clock_id (str): The monotonic clock of the host that last recorded a time in the history.
+            cross_host_routines (set): The routines the message entered from another host, their entry time and the
+                exit time before it come from unrelated clocks.
             id (str): Unique id for the Message object.
 
         """
@@ -32,6 +37,8 @@ class Message:
 
         self.source_address = source_address
         self.history = collections.OrderedDict()
+        self.clock_id = None
+        self.cross_host_routines = set()
         self.id = f"{self.source_address}_{Message.counter}"
 
         Message.counter += 1
@@ -60,14 +67,32 @@ class Message:
         return self.payload.data
 
     def record_entry(self, routine_name) -> None:
-        """Records the timestamp of the message's entry into a routine.
+        """Records the monotonic time in nanoseconds of the message's entry into a routine.
 
         Args:
             routine_name: The name of the routine that the message entered.
 
         """
 
-        self.history[routine_name] = time.time()
+        if self.clock_id is not None and self.clock_id != MONOTONIC_CLOCK_ID:
+            self.cross_host_routines.add(routine_name)
+
+        self.clock_id = MONOTONIC_CLOCK_ID
+        self.history[routine_name] = (monotonic_ns(), None)
+
+    def record_exit(self, routine_name) -> None:
+        """Records the monotonic time in nanoseconds of the message's exit from a routine.
+        A routine the message didn't enter, like the source routine, is added to the history without an entry time.
+
+        Args:
+            routine_name: The name of the routine that the message exited.
+
+        """
+
+        times = self.history.get(routine_name)
+        self.history[routine_name] = (None if times is None else times[0], monotonic_ns())
+
+        self.clock_id = MONOTONIC_CLOCK_ID
 
     def __str__(self):
         return f"{{msg id: {self.id}, " \
@@ -128,3 +153,53 @@ class Message:
             msg.payload.decode()
 
         return msg
+
+    @staticmethod
+    def encode_batch(messages: List["Message"]) -> bytes:
+        """Encodes a batch of message objects into a single frame.
+        The whole batch is serialized with a single pickle call.
+
+        Args:
+            messages: The messages to encode.
+
+        Returns:
+            Bytes containing the messages.
+
+        """
+
+        for msg in messages:
+            msg.payload.encode()
+
+        try:
+            pickled_messages = pickle.dumps(messages)
+        except TypeError:
+            pickled_messages = messages
+
+        return pickled_messages
+
+    @staticmethod
+    def decode_batch(encoded_messages: bytes, lazy=False) -> List["Message"]:
+        """Decodes a frame that holds either a single message or a batch of messages.
+
+        Args:
+            encoded_messages: The frame to decode.
+            lazy: If this is True, then the payloads will only be decoded once they're accessed.
+
+        Returns:
+            The list of the messages in the frame.
+
+        """
+
+        try:
+            messages = pickle.loads(encoded_messages)
+        except TypeError:
+            messages = encoded_messages
+
+        if not isinstance(messages, list):
+            messages = [messages]
+
+        if not lazy:
+            for msg in messages:
+                msg.payload.decode()
+
+        return messages
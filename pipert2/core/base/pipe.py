@@ -1,4 +1,5 @@
-from typing import Dict
+from typing import Dict, List, Optional
+from concurrent.futures import Future
 from logging import Logger
 from collections import defaultdict
 from pipert2.core.base.flow import Flow
@@ -6,8 +7,13 @@ from pipert2.core.base.wire import Wire
 from pipert2.core.base.routine import Routine
 from pipert2.core.managers.network import Network
 from pipert2.core.managers.event_board import EventBoard
-from pipert2.utils.consts.event_names import KILL_EVENT_NAME
+from pipert2.utils.exceptions import WiresValidation
+from pipert2.utils.consts.event_names import KILL_EVENT_NAME, LINK_EVENT_NAME, UNLINK_EVENT_NAME, LATENCY_EVENT_NAME, \
+    SHARED_MEMORY_EVENT_NAME, FLIGHT_RECORDER_EVENT_NAME
 from pipert2.core.base.data_transmitter import DataTransmitter
+from pipert2.utils.output_route import OutputRoute
+from pipert2.utils.metrics_server import MetricsServer
+from pipert2.utils.shared_memory_manager import aggregate_shared_memory_stats
 from pipert2.core.managers.networks.queue_network import QueueNetwork
 from pipert2.core.base.validators import wires_validator, flow_validator
 from pipert2.core.base.transmitters.basic_transmitter import BasicTransmitter
@@ -38,20 +44,29 @@ class Pipe:
             logger: Logger object for logging the pipe actions.
             data_transmitter: DataTransmitter object to indicate how data flows through the pipe by default.
             flows (dict[str, Flow]): Dictionary mapping the pipe flows to their name.
+            remote_flows (dict[str, list[Routine]]): Dictionary mapping the routines of the flows that run on other
+                hosts to their flow name.
             event_board (EventBoard): EventBoard object responsible for the pipe events.
+            built (bool): Whether the pipe was built, after which linking and unlinking apply to the running routines.
+            metrics_server (MetricsServer): Serves the routines metrics, if it was started by the build.
 
         """
 
         self.network = network
         self.logger = logger
         self.flows = {}
+        self.remote_flows: Dict[str, List[Routine]] = {}
         self.event_board = EventBoard()
         self.default_data_transmitter = data_transmitter
         self.wires: Dict[tuple, Wire] = {}
+        self.built = False
+        self.metrics_server: Optional[MetricsServer] = None
 
     def create_flow(self, flow_name: str, auto_wire: bool, *routines: Routine,
-                    data_transmitter: DataTransmitter = None):
+                    data_transmitter: DataTransmitter = None, remote: bool = False):
         """Create a new flow in the pipe.
+        A remote flow is run by a pipe on another host, it is declared here only so local routines can be linked to
+        its routines. It isn't started by this pipe and doesn't receive its events.
 
         Args:
             flow_name (str): The name of the flow to be created.
@@ -59,50 +74,99 @@ class Pipe:
             routines: (Routine): List of routines to register to the flow.
             data_transmitter (DataTransmitter): A data transmitter object that indicates how data will be transferred
                                                 inside the flow.
+            remote (bool): Whether the flow runs on another host, requires a network that supports remote routines.
 
         """
 
-        for routine in routines:
-            routine.initialize(message_handler=self.network.get_message_handler(routine.name),
-                               event_notifier=self.event_board.get_event_notifier())
+        if remote:
+            for routine in routines:
+                routine.flow_name = flow_name
+                routine.initialize(message_handler=self.network.get_remote_message_handler(routine.name),
+                                   event_notifier=self.event_board.get_event_notifier())
 
-        flow = Flow(flow_name, self.event_board, self.logger.getChild(flow_name), routines=list(routines))
-        self.flows[flow_name] = flow
+            self.remote_flows[flow_name] = list(routines)
+        else:
+            for routine in routines:
+                routine.initialize(message_handler=self.network.get_message_handler(routine.name),
+                                   event_notifier=self.event_board.get_event_notifier())
+
+            flow = Flow(flow_name, self.event_board, self.logger.getChild(flow_name), routines=list(routines))
+            self.flows[flow_name] = flow
 
         flow_data_transmitter = data_transmitter if data_transmitter is not None else self.default_data_transmitter
 
         if auto_wire:
             for first_routine, second_routine in zip(routines, routines[1:]):
                 wire = Wire(source=first_routine, destinations=(second_routine,), data_transmitter=flow_data_transmitter)
-                self.wires[(wire.source.flow_name, wire.source.name)] = wire
+                self.wires[wire.key] = wire
 
     def link(self, *wires):
         """Connect the routines to each other by their wires configuration.
+        Once the pipe is built, the wires are linked while the routines run. Only wires that were added before the
+        build can be linked then, disabled wires are added for that purpose.
 
         Args:
             wires (Wire): List of wires to connect their routines
 
+        Raises:
+            WiresValidation: If the pipe is built and one of the wires wasn't added before the build.
+
         """
 
-        for wire in wires:
-            self.wires[(wire.source.flow_name, wire.source.name)] = wire
+        if self.built:
+            self._set_wires_enabled(wires, True)
+        else:
+            for wire in wires:
+                self.wires[wire.key] = wire
+
+    def unlink(self, *wires):
+        """Disconnect the routines of the given wires.
+        Once the pipe is built, the wires stay in place and only stop carrying messages, so they can be linked again.
+
+        Args:
+            wires (Wire): List of wires to disconnect.
 
-    def build(self):
+        Raises:
+            WiresValidation: If the pipe is built and one of the wires wasn't added before the build.
+
+        """
+
+        if self.built:
+            self._set_wires_enabled(wires, False)
+        else:
+            for wire in wires:
+                self.wires.pop(wire.key, None)
+
+    def build(self, metrics_port: Optional[int] = None, metrics_host: str = "127.0.0.1"):
         """Build the pipe to be ready to start working.
 
+        Args:
+            metrics_port: If given, serve the routines metrics in the Prometheus format on this port, 0 for any free
+                          port. The server's address is in `metrics_server.address`.
+            metrics_host: The host the metrics server listens on.
+
         """
 
         self._validate_pipe()
 
+        sources_wires = defaultdict(list)
+
         for wire in self.wires.values():
-            data_transmitter = wire.data_transmitter if wire.data_transmitter is not None else self.default_data_transmitter
+            sources_wires[(wire.source.flow_name, wire.source.name)].append(wire)
 
-            self.network.link(source=wire.source, destinations=wire.destinations, data_transmitter=data_transmitter)
+        for source_wires in sources_wires.values():
+            self._link_source_wires(source_wires)
 
         for flow in self.flows.values():
             flow.build()
 
         self.event_board.build()
+        self.built = True
+
+        if metrics_port is not None:
+            self.metrics_server = MetricsServer(self.get_metrics, metrics_host, metrics_port)
+            self.metrics_server.start()
+            self.logger.plog(f"Serving metrics on {self.metrics_server.address}")
 
     def notify_event(self, event_name: str, specific_flow_routines: dict = defaultdict(list), **event_parameters) -> None:
         """Notify an event has started
@@ -118,6 +182,135 @@ class Pipe:
 
         self.event_board.notify_event(event_name, specific_flow_routines, **event_parameters)
 
+    def request_event(self, event_name: str, specific_flow_routines: dict = defaultdict(list), timeout: float = 1,
+                      **event_parameters) -> Future:
+        """Notify an event and collect the return values of its callbacks from the routines.
+
+        Args:
+            event_name: The name of the event.
+            specific_flow_routines: The flows and routines to execute the event in, all of them if empty.
+            timeout: How long to wait in seconds for the flows to reply.
+            event_parameters: The parameters of the event's callbacks.
+
+        Returns:
+            A future resolving to the callbacks results, mapped by flow name and then by routine name.
+            If the timeout passed, the flows that didn't reply are missing from the results.
+
+        Raises:
+            PipeNotBuilt: If routines listen to the event but the pipe wasn't built yet.
+
+        """
+
+        return self.event_board.request_event(event_name, specific_flow_routines, timeout, **event_parameters)
+
+    def schedule_event(self, event_name: str, delay: float, interval: float = None,
+                       specific_flow_routines: dict = defaultdict(list), **event_parameters) -> int:
+        """Schedule an event to be notified after a delay, and optionally every interval after that.
+
+        Args:
+            event_name: The name of the event.
+            delay: The seconds until the event is notified.
+            interval: The seconds between the notifications of a periodic event, None for notifying it once.
+            specific_flow_routines: The flows and routines to notify the event to, all of them if empty.
+            event_parameters: The parameters of the event's callbacks.
+
+        Returns:
+            The id of the scheduled event, for cancelling it.
+
+        """
+
+        return self.event_board.schedule_event(event_name, delay, interval, specific_flow_routines,
+                                               **event_parameters)
+
+    def cancel_scheduled_event(self, timer_id: int) -> bool:
+        """Cancel a scheduled event.
+
+        Args:
+            timer_id: The id returned when the event was scheduled.
+
+        Returns:
+            True if the event was cancelled, False if it was already notified or cancelled.
+
+        """
+
+        return self.event_board.cancel_scheduled_event(timer_id)
+
+    def get_metrics(self) -> Dict[str, Dict[str, dict]]:
+        """Get the metrics of the routines that run on this host.
+        The metrics are published by the routines while they run, so they are behind by up to a fraction of a second.
+
+        Returns:
+            The metrics of each routine mapped by flow name and then by routine name. Along with the routine's own
+            metrics, 'drops' counts the messages that were dropped on their way to the routine.
+
+        """
+
+        drops = defaultdict(int)
+
+        for wire in self.wires.values():
+            for destination_name, destination_drops in wire.get_drops().items():
+                drops[destination_name] += destination_drops
+
+        return {
+            flow_name: {
+                routine_name: {**routine.metrics.get_stats(), "drops": drops[routine_name]}
+                for routine_name, routine in flow.routines.items()
+            }
+            for flow_name, flow in self.flows.items()
+        }
+
+    def get_latency(self, timeout: float = 1) -> Dict[str, dict]:
+        """Get the latency statistics of the messages that arrived at the destination routines.
+        The pipe must be built, the statistics are requested from the running routines.
+
+        Args:
+            timeout: How long to wait in seconds for the flows to reply.
+
+        Returns:
+            The end to end latency of each path and the queue wait and service time of each routine along them,
+            mapped by the destination routines names.
+
+        """
+
+        replies = self.request_event(LATENCY_EVENT_NAME, timeout=timeout).result()
+
+        return {routine_name: stats for flow_replies in replies.values() for routine_name, stats in flow_replies.items()}
+
+    def get_shared_memory_stats(self, timeout: float = 1) -> dict:
+        """Get the shared memory statistics of every flow's process and of the whole pipe.
+        The pipe must be built, the statistics are requested from the running flows.
+
+        Args:
+            timeout: How long to wait in seconds for the flows to reply.
+
+        Returns:
+            The statistics of each flow under 'flows', mapped by the flow names, and their aggregation under 'total'.
+
+        """
+
+        replies = self.request_event(SHARED_MEMORY_EVENT_NAME, timeout=timeout).result()
+        flows_stats = {flow_name: next(iter(flow_replies.values()))
+                       for flow_name, flow_replies in replies.items() if flow_replies}
+
+        return {"flows": flows_stats, "total": aggregate_shared_memory_stats(flows_stats.values())}
+
+    def dump_flight_recorders(self, output_dir: str = None, timeout: float = 5) -> Dict[str, Optional[str]]:
+        """Dump the summaries of the last messages every routine handled, each routine to a JSON file of its own.
+        The pipe must be built, the dumps are requested from the running routines.
+
+        Args:
+            output_dir: The directory of the dumps, the temporary directory of each flow if None.
+            timeout: How long to wait in seconds for the flows to reply.
+
+        Returns:
+            The paths of the dumps mapped by the routines names, None for routines whose dump failed.
+
+        """
+
+        replies = self.request_event(FLIGHT_RECORDER_EVENT_NAME, timeout=timeout, output_dir=output_dir).result()
+
+        return {routine_name: path for flow_replies in replies.values() for routine_name, path in flow_replies.items()}
+
     def join(self, to_kill=False):
         """Block the execution until all of the flows have been killed
 
@@ -134,6 +327,82 @@ class Pipe:
         self.event_board.join()
         self.logger.plog(f"Joined event board")
 
+        if self.metrics_server is not None:
+            self.metrics_server.stop()
+
+    def _link_source_wires(self, source_wires: List[Wire]):
+        """Link the wires of a single source, one after the other.
+        If the source has several wires, or its wire is conditional, the source gets a route for each wire that
+        selects the messages going through it.
+
+        Args:
+            source_wires: The wires of the source.
+
+        """
+
+        source = source_wires[0].source
+        routes = []
+        outputs_count = 0
+
+        for wire in source_wires:
+            data_transmitter = wire.data_transmitter if wire.data_transmitter is not None else self.default_data_transmitter
+
+            wire.drop_counters = self.network.link(source=wire.source, destinations=wire.destinations,
+                                                   data_transmitter=data_transmitter, weight=wire.weight,
+                                                   overflow_policy=wire.overflow_policy,
+                                                   max_queue_size=wire.max_queue_size,
+                                                   max_queue_bytes=wire.max_queue_bytes,
+                                                   append=outputs_count > 0)
+
+            wire.route_index = len(routes)
+            routes.append(OutputRoute(list(range(outputs_count, outputs_count + len(wire.destinations))),
+                                      port=wire.port, predicate=wire.predicate,
+                                      distribution_policy=wire.distribution_policy, enabled=wire.enabled))
+            outputs_count += len(wire.destinations)
+
+            if wire.max_batch_size > 1:
+                source.message_handler.set_batching(max_size=wire.max_batch_size, max_delay=wire.max_batch_delay)
+
+        if len(routes) > 1 or routes[0].is_conditional():
+            source.message_handler.routes = routes
+
+    def _set_wires_enabled(self, wires, enabled: bool):
+        """Tell the sources of the given built wires to link or unlink them.
+
+        Raises:
+            WiresValidation: If one of the wires wasn't added before the build.
+
+        """
+
+        for wire in wires:
+            built_wire = self._get_built_wire(wire)
+
+            if built_wire is None:
+                raise WiresValidation(f"The wire of {wire.source.name} wasn't added before the pipe was built.")
+
+            built_wire.enabled = enabled
+            self.notify_event(LINK_EVENT_NAME if enabled else UNLINK_EVENT_NAME,
+                              {built_wire.source.flow_name: [built_wire.source.name]},
+                              route_index=built_wire.route_index)
+
+    def _get_built_wire(self, wire: Wire) -> Optional[Wire]:
+        """Find the built wire of the same source routine, destination routines, port and predicate as the given wire.
+        The key can't be used, since the key of a wire that was built disabled differs from the key of the same wire
+        constructed again as enabled.
+
+        """
+
+        wire_layout = (wire.source, wire.port, wire.predicate, tuple(wire.destinations))
+
+        for built_wire in self.wires.values():
+            built_wire_layout = (built_wire.source, built_wire.port, built_wire.predicate,
+                                 tuple(built_wire.destinations))
+
+            if built_wire.route_index is not None and built_wire_layout == wire_layout:
+                return built_wire
+
+        return None
+
     def _validate_pipe(self):
         """Validate routines and wires in current pipeline.
 
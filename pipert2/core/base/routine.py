@@ -1,17 +1,33 @@
+import os
+import time
+import cProfile
+import tempfile
 import threading
 import multiprocessing as mp
-from collections import defaultdict
+from collections import defaultdict, deque
 from logging import Logger
-from typing import Callable
+from typing import Callable, Optional
 from functools import partial
 from abc import ABCMeta, abstractmethod
 from pipert2.utils.method_data import Method
 from pipert2.utils.dummy_object import Dummy
 from pipert2.core.handlers.message_handler import MessageHandler
 from pipert2.utils.annotations import class_functions_dictionary
-from pipert2.utils.consts.event_names import START_EVENT_NAME, STOP_EVENT_NAME
+from pipert2.utils.parameter import Parameter
+from pipert2.utils.routine_metrics import RoutineMetrics
+from pipert2.utils.shared_memory_manager import get_shared_memory_stats
+from pipert2.utils.flight_recorder import FlightRecorder, OUTCOME_EXCEPTION
+from pipert2.utils.exceptions import InvalidRoutineParameter
+from pipert2.utils.consts.event_names import START_EVENT_NAME, STOP_EVENT_NAME, LINK_EVENT_NAME, UNLINK_EVENT_NAME, \
+    UPDATE_PARAMS_EVENT_NAME, PROFILE_EVENT_NAME, SHARED_MEMORY_EVENT_NAME, FLIGHT_RECORDER_EVENT_NAME
 from pipert2.utils.interfaces.event_executor_interface import EventExecutorInterface
 
+CRASH_DUMP_INTERVAL = 10
+
+# A single routine of a process profiles at a time, since python 3.12 cProfile profiles through `sys.monitoring`, which
+# allows one profiler per process that records all of its threads.
+_profiling_lock = threading.Lock()
+
 
 class Routine(EventExecutorInterface, metaclass=ABCMeta):
     """A routine is responsible for performing one of the flow’s main tasks.
@@ -19,9 +35,14 @@ class Routine(EventExecutorInterface, metaclass=ABCMeta):
     First it runs a setup function, then it runs its main logic function in a continuous loop, until it is told to terminate.
     Once terminated it runs a cleanup function.
 
+    Callbacks registered with `events` run on the flow's thread, concurrently with the main logic. Callbacks registered
+    with `mailbox_events` are queued in the routine's mailbox instead, and run on the routine's own thread between two
+    runs of the main logic, so they can change the routine's state without locking.
+
     """
 
     events = class_functions_dictionary()
+    mailbox_events = class_functions_dictionary()
     runners = class_functions_dictionary()
     routines_created_counter = 0
 
@@ -38,6 +59,10 @@ class Routine(EventExecutorInterface, metaclass=ABCMeta):
             event_notifier (Callback): Callback for notifying an event has occurred.
             _logger (Logger): The routines logger object.
             stop_event (mp.Event): A multiprocessing event object indicating the routine state (run/stop).
+            mailbox (deque[Method]): The events waiting to be executed on the routine's thread.
+            params_version (int): Counts the updates of the routine's parameters.
+            metrics (RoutineMetrics): The throughput, service time and input queue depth of the routine.
+            flight_recorder (FlightRecorder): The summaries of the last messages the routine handled.
 
         """
 
@@ -55,6 +80,14 @@ class Routine(EventExecutorInterface, metaclass=ABCMeta):
         self.stop_event = mp.Event()
         self.stop_event.set()
         self.runner = Dummy()
+        self.mailbox = deque()
+        self.params_version = 0
+        self.metrics = RoutineMetrics()
+        self._profiler = None
+        self._profile_deadline = 0
+        self._profile_path = None
+        self.flight_recorder = FlightRecorder()
+        self._next_crash_dump = 0
 
     def initialize(self, message_handler: MessageHandler, event_notifier: Callable, *args, **kwargs):
         """Initialize the routine to be ready to run
@@ -70,6 +103,7 @@ class Routine(EventExecutorInterface, metaclass=ABCMeta):
         self.event_notifier = event_notifier
 
         self.message_handler.logger = self._logger
+        self.metrics.queue_depth_getter = self.message_handler.get_input_depth
 
         if "runner" in kwargs and kwargs["runner"] in self.runners.all:
             self._get_runners()[kwargs["runner"]](self)
@@ -79,6 +113,9 @@ class Routine(EventExecutorInterface, metaclass=ABCMeta):
     def set_logger(self, logger: Logger):
         self._logger = logger
 
+        if self.message_handler is not None:
+            self.message_handler.logger = logger
+
     @classmethod
     def get_events(cls):
         """Get the events of the routine
@@ -88,11 +125,56 @@ class Routine(EventExecutorInterface, metaclass=ABCMeta):
 
         """
 
-        routine_events = cls.events.all[Routine.__name__]
-        for event_name, events_functions in routine_events.items():
-            cls.events.all[cls.__name__][event_name].update(events_functions)
+        return cls._get_inherited_functions(cls.events)
+
+    @classmethod
+    def get_mailbox_events(cls):
+        """Get the events of the routine that are executed on the routine's thread
+
+        Returns:
+            dict[str, list[Callback]]: The events callbacks mapped by their events
+
+        """
+
+        return cls._get_inherited_functions(cls.mailbox_events)
+
+    @classmethod
+    def _get_inherited_functions(cls, functions_dictionary):
+        """Merge the functions the routine's base classes registered into the routine's own functions.
+
+        """
+
+        for base in cls.__mro__[1:]:
+            if issubclass(base, Routine):
+                for key, functions in functions_dictionary.all[base.__name__].items():
+                    functions_dictionary.all[cls.__name__][key].update(functions)
 
-        return cls.events.all[cls.__name__]
+        return functions_dictionary.all[cls.__name__]
+
+    @classmethod
+    def get_parameters(cls):
+        """Get the parameters the routine declares
+
+        Returns:
+            dict[str, Parameter]: The parameters mapped by their names
+
+        """
+
+        parameters = {}
+
+        for base in reversed(cls.__mro__):
+            for name, attribute in vars(base).items():
+                if isinstance(attribute, Parameter):
+                    parameters[name] = attribute
+
+        return parameters
+
+    def get_params(self) -> dict:
+        """Get the current values of the routine's parameters.
+
+        """
+
+        return {name: getattr(self, name) for name in self.get_parameters()}
 
     @classmethod
     def _get_runners(cls):
@@ -126,7 +208,9 @@ class Routine(EventExecutorInterface, metaclass=ABCMeta):
 
         """
 
+        self.message_handler.flush()
         self.message_handler.teardown()
+        self.metrics.flush()
         self.cleanup()
 
     def _start_routine_logic(self) -> None:
@@ -137,10 +221,38 @@ class Routine(EventExecutorInterface, metaclass=ABCMeta):
         self.setup()
 
         while not self.stop_event.is_set():
+            if self.mailbox:
+                self._drain_mailbox()
+
+            if self._profiler is not None and time.monotonic() >= self._profile_deadline:
+                self._stop_profiling()
+
             self._extended_run()
 
+        self._drain_mailbox()
+
+        if self._profiler is not None:
+            self._stop_profiling()
+
         self._base_cleanup()
 
+    def _drain_mailbox(self) -> None:
+        """Execute the events waiting in the mailbox, by the order they arrived.
+
+        """
+
+        mapped_events = self.get_mailbox_events()
+
+        while self.mailbox:
+            event = self.mailbox.popleft()
+            self._logger.plog(f"Running event '{event.event_name}' from the mailbox")
+
+            for callback in mapped_events[event.event_name]:
+                try:
+                    callback(self, **event.params)
+                except Exception as error:
+                    self._logger.exception(f"The event '{event.event_name}' has crashed: {error}")
+
     @runners("thread")
     def set_runner_as_thread(self):
         self.runner_creator = partial(threading.Thread, target=self._start_routine_logic)
@@ -172,15 +284,234 @@ class Routine(EventExecutorInterface, metaclass=ABCMeta):
             self.stop_event.set()
             self.runner.join()
 
-    def execute_event(self, event: Method) -> None:
+    @events(LINK_EVENT_NAME)
+    def link_route(self, route_index: int) -> None:
+        """Start sending messages through one of the routine's wires
+
+        (This method will be called when the 'link' event is triggered)
+
+        """
+
+        self.message_handler.set_route_enabled(route_index, True)
+
+    @events(UNLINK_EVENT_NAME)
+    def unlink_route(self, route_index: int) -> None:
+        """Stop sending messages through one of the routine's wires
+
+        (This method will be called when the 'unlink' event is triggered)
+
+        """
+
+        self.message_handler.set_route_enabled(route_index, False)
+
+    @events(UPDATE_PARAMS_EVENT_NAME)
+    def check_params(self, **params) -> Optional[str]:
+        """Check the new values of the routine's parameters, before they are applied on the routine's thread.
+
+        (This method will be called when the 'update_params' event is triggered)
+
+        Returns:
+            The reason the values are invalid, None if all of them are valid.
+
+        """
+
+        try:
+            self._validate_params(params)
+        except InvalidRoutineParameter as error:
+            self._logger.warning(f"Not updating the parameters: {error}")
+            return str(error)
+
+        return None
+
+    @mailbox_events(UPDATE_PARAMS_EVENT_NAME)
+    def update_params(self, **params) -> None:
+        """Update the routine's parameters between two runs of the main logic.
+        Either all of the given parameters are updated or none of them, and the params version is increased.
+
+        (This method will be called from the mailbox when the 'update_params' event is triggered)
+
+        """
+
+        try:
+            params = self._validate_params(params)
+        except InvalidRoutineParameter:
+            return
+
+        self.__dict__.update(params)
+        self.params_version += 1
+
+    @mailbox_events(PROFILE_EVENT_NAME)
+    def start_profiling(self, duration: float = 10, output_dir: str = None) -> None:
+        """Profile the routine's thread with cProfile, and dump the stats in pstats format once the duration passes or
+        the routine stops. Profiling again while profiling dumps the current stats and starts over.
+        Only one routine of a process profiles at a time, from python 3.12 the profile includes all of the threads of
+        the process, like the flow's other routines.
+
+        (This method will be called from the mailbox when the 'profile' event is triggered)
+
+        Args:
+            duration: How long to profile in seconds.
+            output_dir: The directory of the dump, the temporary directory if None. The dump is named by the flow,
+                        the routine and the time the profiling started.
+
+        """
+
+        if self.stop_event.is_set():
+            self._logger.warning("Not profiling, the routine isn't running")
+            return
+
+        if self._profiler is not None:
+            self._stop_profiling()
+
+        if not _profiling_lock.acquire(blocking=False):
+            self._logger.warning("Not profiling, another routine of the process is profiling")
+            return
+
+        profiler = cProfile.Profile()
+
+        try:
+            profiler.enable()
+        except ValueError as error:
+            _profiling_lock.release()
+            self._logger.warning(f"Not profiling, another profiler is active: {error}")
+            return
+
+        file_name = f"{self.flow_name}.{self.name}.{time.strftime('%Y%m%d-%H%M%S')}.pstats"
+        self._profile_path = os.path.join(output_dir if output_dir is not None else tempfile.gettempdir(), file_name)
+        self._profile_deadline = time.monotonic() + duration
+        self._profiler = profiler
+        self._logger.plog(f"Profiling for {duration} seconds")
+
+    @events(SHARED_MEMORY_EVENT_NAME)
+    def get_shared_memory_stats(self) -> dict:
+        """Get the shared memory statistics of the routine's process, shared by all of the routines in its flow.
+
+        (This method will be called when the 'shared_memory' event is requested)
+
+        """
+
+        return get_shared_memory_stats()
+
+    @events(FLIGHT_RECORDER_EVENT_NAME)
+    def dump_flight_recorder(self, output_dir: str = None) -> Optional[str]:
+        """Dump the summaries of the last messages the routine handled to a JSON file.
+
+        (This method will be called when the 'flight_recorder' event is triggered)
+
+        Args:
+            output_dir: The directory of the dump, the temporary directory if None. The dump is named by the flow,
+                        the routine and the time it was made, in milliseconds.
+
+        Returns:
+            The path of the dump, None if it failed.
+
+        """
+
+        return self._dump_flight_recorder(output_dir, reason="requested")
+
+    def _record_crash(self, error: Exception, message=None) -> None:
+        """Record an exception of the main logic in the flight recorder, and dump the recorder if it wasn't dumped
+        because of an exception in the last `CRASH_DUMP_INTERVAL` seconds.
+
+        Args:
+            error: The exception the main logic raised.
+            message: The message the main logic was handling, None for a source routine.
+
+        """
+
+        self.flight_recorder.record(message, OUTCOME_EXCEPTION, error=error)
+        now = time.monotonic()
+
+        if now >= self._next_crash_dump:
+            self._next_crash_dump = now + CRASH_DUMP_INTERVAL
+            self._dump_flight_recorder(None, reason=repr(error))
+
+    def _dump_flight_recorder(self, output_dir: Optional[str], reason: str) -> Optional[str]:
+        now = time.time()
+        file_name = f"{self.flow_name}.{self.name}.{time.strftime('%Y%m%d-%H%M%S', time.localtime(now))}." \
+                    f"{int(now * 1000) % 1000:03d}.flight.json"
+        path = os.path.join(output_dir if output_dir is not None else tempfile.gettempdir(), file_name)
+
+        try:
+            self.flight_recorder.dump(path, flow=self.flow_name, routine=self.name, reason=reason)
+        except OSError as error:
+            self._logger.exception(f"Failed to dump the flight recorder: {error}")
+            return None
+
+        self._logger.plog(f"The flight recorder was dumped to {path}")
+
+        return path
+
+    def _stop_profiling(self) -> None:
+        """Stop the profiler and dump its stats.
+
+        """
+
+        self._profiler.disable()
+        _profiling_lock.release()
+
+        try:
+            self._profiler.dump_stats(self._profile_path)
+        except OSError as error:
+            self._logger.exception(f"Failed to dump the profile: {error}")
+        else:
+            self._logger.plog(f"The profile was dumped to {self._profile_path}")
+
+        self._profiler = None
+
+    def _validate_params(self, params: dict) -> dict:
+        """Validate new values of the routine's parameters.
+
+        Args:
+            params: The new values mapped by the parameters names.
+
+        Returns:
+            The validated values mapped by the parameters names.
+
+        Raises:
+            InvalidRoutineParameter: If a parameter doesn't exist or a value is invalid.
+
+        """
+
+        parameters = self.get_parameters()
+        unknown_params = set(params).difference(parameters)
+
+        if unknown_params:
+            raise InvalidRoutineParameter(f"Unknown parameters {sorted(unknown_params)}")
+
+        return {name: parameters[name].validate(value) for name, value in params.items()}
+
+    def execute_event(self, event: Method):
         """Execute an event to start
 
         Args:
             event: The event to execute
 
+        If the event has mailbox callbacks, the event is put in the mailbox while the routine is running, and executed
+        right away while it isn't.
+
+        Returns:
+            The return value of the event's callback, or the return values of its callbacks mapped by their names if it
+            has several. Mailbox callbacks don't return values.
+
+        """
+
+        result = EventExecutorInterface.execute_event(self, event)
+
+        if event.event_name in self.get_mailbox_events():
+            self.mailbox.append(event)
+
+            if self.stop_event.is_set():
+                self._drain_mailbox()
+
+        return result
+
+    def listens_to(self, event_name: str) -> bool:
+        """Check whether the routine has callbacks for an event, on either thread.
+
         """
 
-        EventExecutorInterface.execute_event(self, event)
+        return event_name in self.get_events() or event_name in self.get_mailbox_events()
 
     def notify_event(self, event_name: str, routines_by_flow: dict = defaultdict(list), **event_parameters) -> None:
         """Notify an event has started
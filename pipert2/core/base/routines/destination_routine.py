@@ -1,8 +1,21 @@
+from pipert2.utils.clock import perf_counter_ns
 from abc import ABCMeta, abstractmethod
 from pipert2.core.base.routine import Routine
+from pipert2.utils.latency_tracker import LatencyTracker
+from pipert2.utils.flight_recorder import OUTCOME_RECEIVED
+from pipert2.utils.consts.event_names import LATENCY_EVENT_NAME
 
 
 class DestinationRoutine(Routine, metaclass=ABCMeta):
+    """A routine at the end of the messages paths.
+    It aggregates the histories of the messages it receives into latency histograms of their paths and of every routine
+    along them.
+
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.latency_tracker = LatencyTracker()
 
     @abstractmethod
     def main_logic(self, data: dict) -> None:
@@ -17,7 +30,27 @@ class DestinationRoutine(Routine, metaclass=ABCMeta):
     def _extended_run(self) -> None:
         message = self.message_handler.get()
         if message is not None:
+            start_time = perf_counter_ns()
             try:
                 self.main_logic(message.get_data())
             except Exception as error:
+                self.metrics.record_exception()
                 self._logger.exception(f"The routine has crashed: {error}")
+                self._record_crash(error, message)
+            else:
+                self.metrics.record(start_time, sent=0)
+                message.record_exit(self.name)
+                self.latency_tracker.record(message.history, message.cross_host_routines)
+                self.flight_recorder.record(message, OUTCOME_RECEIVED)
+        else:
+            self.metrics.flush()
+
+    @Routine.events(LATENCY_EVENT_NAME)
+    def get_latency(self) -> dict:
+        """Get the latency statistics of the messages that arrived at the routine.
+
+        (This method will be called when the 'latency' event is requested)
+
+        """
+
+        return self.latency_tracker.get_stats()
@@ -1,5 +1,7 @@
+from pipert2.utils.clock import perf_counter_ns
 from abc import ABCMeta, abstractmethod
 from pipert2.core.base.routine import Routine
+from pipert2.utils.flight_recorder import OUTCOME_SENT, OUTCOME_FILTERED
 
 
 class MiddleRoutine(Routine, metaclass=ABCMeta):
@@ -20,11 +22,21 @@ class MiddleRoutine(Routine, metaclass=ABCMeta):
     def _extended_run(self) -> None:
         message = self.message_handler.get()
         if message is not None:
+            start_time = perf_counter_ns()
             try:
                 output_data = self.main_logic(message.get_data())
             except Exception as error:
+                self.metrics.record_exception()
                 self._logger.exception(f"The routine has crashed: {error}")
+                self._record_crash(error, message)
             else:
+                self.metrics.record(start_time, sent=output_data is not None)
+
                 if output_data is not None:
                     message.update_data(output_data)
                     self.message_handler.put(message)
+                    self.flight_recorder.record(message, OUTCOME_SENT, data=output_data)
+                else:
+                    self.flight_recorder.record(message, OUTCOME_FILTERED)
+        else:
+            self.metrics.flush()
@@ -1,6 +1,8 @@
+from pipert2.utils.clock import perf_counter_ns
 from abc import ABCMeta, abstractmethod
 from pipert2.core.base.message import Message
 from pipert2.core.base.routine import Routine
+from pipert2.utils.flight_recorder import OUTCOME_SENT
 
 
 class SourceRoutine(Routine, metaclass=ABCMeta):
@@ -20,11 +22,17 @@ class SourceRoutine(Routine, metaclass=ABCMeta):
 
         """
 
+        start_time = perf_counter_ns()
         try:
             output_data = self.main_logic()
         except Exception as error:
+            self.metrics.record_exception(received=0)
             self._logger.exception(f"The routine has crashed: {error}")
+            self._record_crash(error)
         else:
+            self.metrics.record(start_time, sent=output_data is not None, received=0)
+
             if output_data is not None:
                 message = Message(output_data, source_address=self.name)
                 self.message_handler.put(message)
+                self.flight_recorder.record(message, OUTCOME_SENT, data=output_data)
@@ -1,6 +1,7 @@
 import numpy as np
 from pipert2.core.base.data_transmitter import DataTransmitter
 from pipert2.utils.shared_memory_manager import SharedMemoryManager
+from pipert2.utils.exceptions import SharedMemoryPayloadTooLarge
 
 
 class SharedMemoryTransmitter(DataTransmitter):
@@ -32,6 +33,7 @@ class SharedMemoryTransmitter(DataTransmitter):
 
             Returns:
                 A dictionary containing the same values as before, other than values saved in shared memory.
+                Values that are too large for a shared memory segment are kept as they are.
                 In the format of: given dict: {"x": 1, "y":2, "z": [5]*size_threshold}
                                   returned_dict: {"x": 1, "y":2, "z": {"address": "{process_id}_{shared_mem_id}",
                                                                        "size": {size_threshold}}}
@@ -48,7 +50,11 @@ class SharedMemoryTransmitter(DataTransmitter):
                         return_dict[key] = value
                     else:
                         if len(new_val) >= self.data_size_threshold:
-                            address = SharedMemoryManager().write_to_mem(new_val)
+                            try:
+                                address = SharedMemoryManager().write_to_mem(new_val)
+                            except SharedMemoryPayloadTooLarge:
+                                return_dict[key] = value
+                                continue
 
                             if type(value) == np.ndarray:
                                 return_dict[key] = {"address": address, "size": len(new_val), "shape": value.shape,
@@ -19,6 +19,8 @@ def validate_wires(wires: List[Wire]):
     validate_existing_source_and_destination_routines(wires)
     validate_routines_place_properly(wires)
     validate_consume_and_produce_on_middle_routines(wires)
+    validate_sources_batching(wires)
+    validate_wires_weights(wires)
 
 
 def validate_routines_place_properly(wires: List[Wire]):
@@ -101,3 +103,41 @@ def validate_consume_and_produce_on_middle_routines(wires: List[Wire]):
         if not middle_routine["destination"]:
             raise WiresValidation(f"The routine {routine_name} isn't have a destination routine,"
                                   f"add a routine that produce data from current routine.")
+
+
+def validate_sources_batching(wires: List[Wire]):
+    """Validate that all of the wires of each source batch their messages alike, since the batching of a source applies
+    to all of its messages.
+
+    Args:
+        wires: Wires to validate.
+
+    Raises:
+        WiresValidation: If wires of the same source have different batch sizes or delays.
+    """
+
+    sources_batching = {}
+
+    for wire in wires:
+        batching = (wire.max_batch_size, wire.max_batch_delay if wire.max_batch_size > 1 else None)
+        source_batching = sources_batching.setdefault(wire.source, batching)
+
+        if source_batching != batching:
+            raise WiresValidation(f"The wires of {wire.source.name} have different batch settings, "
+                                  f"all of a source's wires must batch their messages alike.")
+
+
+def validate_wires_weights(wires: List[Wire]):
+    """Validate that the weight of every wire is positive, since the input schedulers serve the inputs by their weights.
+
+    Args:
+        wires: Wires to validate.
+
+    Raises:
+        WiresValidation: If a wire's weight isn't positive.
+    """
+
+    for wire in wires:
+        if wire.weight <= 0:
+            raise WiresValidation(f"The wire of {wire.source.name} has the weight {wire.weight}, "
+                                  f"the weight of a wire must be positive.")
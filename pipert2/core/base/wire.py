@@ -1,12 +1,87 @@
-from typing import Tuple
+from typing import Tuple, Dict, Callable
 from pipert2.core.base.routine import Routine
 from pipert2.core.base.data_transmitter import DataTransmitter
-
+from pipert2.utils.overflow_policies import OverflowPolicy
+from pipert2.utils.distribution_policies import DistributionPolicy
 
 
 class Wire:
+    """The wire describes a connection from a source routine to its destination routines.
+
+    """
+
     def __init__(self, source: Routine, destinations: Tuple[Routine, ...],
-                 data_transmitter: DataTransmitter = None):
+                 data_transmitter: DataTransmitter = None, weight: int = 1, overflow_policy: OverflowPolicy = None,
+                 max_queue_size: int = None, max_queue_bytes: int = None, max_batch_size: int = 1,
+                 max_batch_delay: float = 0.001, distribution_policy: DistributionPolicy = None, port: str = None,
+                 predicate: Callable[[dict], bool] = None, enabled: bool = True):
+        """
+        Args:
+            source: The routine that sends the messages.
+            destinations: The routines that receive the messages.
+            data_transmitter: Indicates how the data moves through the wire, the pipe's default if None.
+            weight: The weight (or priority) of the wire's messages in the destinations' input scheduling.
+            overflow_policy: What to do when a destination's queue is full, decided by the network if None.
+            max_queue_size: The maximum amount of the wire's messages waiting in each destination,
+                            the network's default if None.
+            max_queue_bytes: The maximum total size of the wire's messages waiting in each destination,
+                             unlimited if None.
+            max_batch_size: The maximum amount of messages sent together as a single frame, 1 disables batching.
+            max_batch_delay: The maximum time in seconds a message waits for its batch to fill up.
+            distribution_policy: Which destinations receive each message, every destination if None.
+            port: The named output port of the source the wire is connected to. If set, the wire carries only the
+                  data the source returns under this key, for example `{"night": data}`.
+            predicate: A function of the data that tells whether a message goes through the wire, all do if None.
+            enabled: Whether the wire carries messages once the pipe is built. A disabled wire is still linked, so
+                     it can be enabled by `Pipe.link` while the pipe runs, for example to attach a recorder.
+
+        A source has a single wire, unless its wires have ports, predicates or start disabled. The batching and data
+        transmitter of the source's wires apply to all of its messages, so all of its wires must batch alike.
+
+        Attributes:
+            drop_counters (dict[str, SharedCounter]): The drop counters of the wire mapped by the destinations names,
+                                                      available once the wire is linked.
+            route_index (int): The index of the wire among its source's wires, available once the wire is linked.
+
+        """
+
         self.source = source
         self.destinations = destinations
         self.data_transmitter = data_transmitter
+        self.weight = weight
+        self.overflow_policy = overflow_policy
+        self.max_queue_size = max_queue_size
+        self.max_queue_bytes = max_queue_bytes
+        self.max_batch_size = max_batch_size
+        self.max_batch_delay = max_batch_delay
+        self.distribution_policy = distribution_policy
+        self.port = port
+        self.predicate = predicate
+        self.enabled = enabled
+        self._standby = not enabled
+        self.drop_counters = {}
+        self.route_index = None
+
+    @property
+    def key(self) -> tuple:
+        """The key of the wire in the pipe, linking a wire with the same key replaces it.
+        A source has a single plain wire, while wires with a port, a predicate or that start disabled are told apart
+        by their destinations as well.
+
+        """
+
+        if self.port is None and self.predicate is None and not self._standby:
+            return self.source.flow_name, self.source.name
+
+        return self.source.flow_name, self.source.name, self.port, self.predicate, \
+            tuple(destination.name for destination in self.destinations)
+
+    def get_drops(self) -> Dict[str, int]:
+        """Get how many messages were dropped on their way to each destination.
+
+        Returns:
+            Dictionary mapping each destination name to its amount of dropped messages.
+
+        """
+
+        return {destination_name: drop_counter.value for destination_name, drop_counter in self.drop_counters.items()}
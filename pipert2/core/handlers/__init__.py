@@ -1,3 +1,4 @@
 from .event_handler import EventHandler as EventHandler
 from .message_handlers import QueueHandler as QueueHandler
+from .message_handlers import SocketHandler as SocketHandler
 from .message_handler import MessageHandler as MessageHandler
@@ -1,7 +1,21 @@
 class EventHandler:
 
-    def __init__(self, input_event_pipe):
+    def __init__(self, input_event_pipe, replies_queue=None, flow_name: str = None):
         self.input_event_pipe = input_event_pipe
+        self.replies_queue = replies_queue
+        self.flow_name = flow_name
 
     def wait(self):
         return self.input_event_pipe.recv()
+
+    def reply(self, event, results: dict):
+        """Reply to a request event with the results of its callbacks.
+
+        Args:
+            event: The request event.
+            results: The callbacks results, mapped by routine name.
+
+        """
+
+        if self.replies_queue is not None:
+            self.replies_queue.put((event.request_id, self.flow_name, results))
@@ -1,8 +1,13 @@
+import copy
 from logging import Logger
-from typing import Optional
+from typing import List, Optional
+from collections import deque, defaultdict
 from abc import ABC, abstractmethod
 from pipert2.utils.dummy_object import Dummy
 from pipert2.core.base.message import Message
+from pipert2.utils.message_batcher import MessageBatcher
+from pipert2.core.base.payload import Payload
+from pipert2.utils.output_route import OutputRoute, NO_DATA
 
 
 class MessageHandler(ABC):
@@ -18,6 +23,9 @@ class MessageHandler(ABC):
         self.transmit = None
         self.receive = None
         self.logger: Logger = Dummy()
+        self.batcher: Optional[MessageBatcher] = None
+        self.routes: Optional[List[OutputRoute]] = None
+        self._received_messages = deque()
 
     @abstractmethod
     def _get(self) -> Optional[bytes]:
@@ -41,6 +49,35 @@ class MessageHandler(ABC):
 
         raise NotImplementedError
 
+    def _get_outputs(self) -> list:
+        """Get the outputs leading to each destination, used by the distribution policies.
+        Message handlers that support routes implement it along with `_put_to`.
+
+        Returns:
+            The outputs ordered like the destinations, each with a `qsize` method.
+
+        """
+
+        raise NotImplementedError(f"{self.__class__.__name__} doesn't support routes")
+
+    def _put_to(self, message: bytes, output_index: int):
+        """Puts a given message into a single output.
+
+        Args:
+            message: The message to be sent.
+            output_index: The index of the output, by the order of the destinations.
+
+        """
+
+        raise NotImplementedError(f"{self.__class__.__name__} doesn't support routes")
+
+    def get_input_depth(self) -> int:
+        """Get the amount of messages waiting to be received, 0 if the message handler can't tell.
+
+        """
+
+        return len(self._received_messages)
+
     @abstractmethod
     def teardown(self):
         """Teardown resources used by the message handler.
@@ -49,33 +86,90 @@ class MessageHandler(ABC):
 
         raise NotImplementedError
 
+    def set_batching(self, max_size: int, max_delay: float):
+        """Send the messages in batches, each encoded as a single frame.
+
+        Args:
+            max_size: The maximum amount of messages in a batch.
+            max_delay: The maximum time in seconds a message waits for its batch to fill up.
+
+        """
+
+        self.batcher = MessageBatcher(self._put_batch, max_size=max_size, max_delay=max_delay,
+                                      get_logger=self._get_logger)
+
+    def _get_logger(self) -> Logger:
+        """Get the current logger, the routine sets it after the batching is set.
+
+        """
+
+        return self.logger
+
+    def flush(self):
+        """Send the messages that wait in the current batch.
+
+        """
+
+        if self.batcher is not None:
+            self.batcher.flush()
+
+    def set_route_enabled(self, route_index: int, enabled: bool):
+        """Link or unlink one of the routes while the routine runs.
+        The routes are replaced as a whole, so every message is routed either before or after the change.
+
+        The messages batched before the change are flushed first, to the outputs they were routed to.
+
+        Args:
+            route_index: The index of the route, by the order of the source's wires.
+            enabled: Whether the route is linked.
+
+        """
+
+        self.flush()
+
+        routes = self.routes if self.routes is not None else [OutputRoute(list(range(len(self._get_outputs()))))]
+        routes = list(routes)
+        routes[route_index] = copy.copy(routes[route_index])
+        routes[route_index].enabled = enabled
+
+        self.routes = routes
+
     def put(self, message: Message):
         """Encodes a given message and calls the implemented put method.
+        If routes are set, the message is sent only to the outputs its routes select, and if batching is set, the
+        message is added to the current batch instead.
 
         Args:
             message: The message to be sent.
 
         """
 
-        if callable(self.transmit):
-            transmitted_data = self.transmit(message.payload.data)
-            message.update_data(transmitted_data)
+        message.record_exit(self.routine_name)
 
-        self._put(Message.encode(message))
+        if self.routes is None:
+            self._send(message, None)
+        else:
+            for routed_message, output_indices in self._route(message):
+                self._send(routed_message, output_indices)
 
     def get(self) -> Message:
         """Decodes the message received from the implemented get method.
+        A received batch is unpacked, and its messages are returned one by one.
 
         Returns:
             A decoded message object.
 
         """
 
-        message = self._get()
+        if not self._received_messages:
+            frame = self._get()
 
-        if message is not None:
-            message = Message.decode(message)
+            if frame is not None:
+                self._received_messages.extend(Message.decode_batch(frame))
+
+        message = self._received_messages.popleft() if self._received_messages else None
 
+        if message is not None:
             if callable(self.receive):
                 received_data = self.receive(message.payload.data)
                 message.update_data(received_data)
@@ -83,3 +177,90 @@ class MessageHandler(ABC):
             message.record_entry(self.routine_name)
 
         return message
+
+    def _route(self, message: Message) -> list:
+        """Split a message between the outputs selected by the routes.
+        The data emitted to each port becomes a message of its own, and is encoded once however many routes take it.
+        A route whose predicate raises an exception is logged and doesn't take the message.
+
+        Args:
+            message: The message the routine emitted.
+
+        Returns:
+            The messages to send, each with the indices of the outputs it is sent to.
+
+        """
+
+        data = message.payload.data
+        ports_outputs = {}
+
+        for route_index, route in enumerate(self.routes):
+            try:
+                route_data = route.get_data(data)
+
+                if route_data is NO_DATA:
+                    continue
+
+                selected_outputs = route.select(route_data, self._get_outputs)
+            except Exception:
+                self.logger.exception(f"Route {route_index} failed to route the message, the message doesn't go "
+                                      f"through it")
+                continue
+
+            ports_outputs.setdefault(route.port, []).extend(selected_outputs)
+
+        routed_messages = []
+
+        for port, output_indices in ports_outputs.items():
+            if port is None:
+                routed_messages.append((message, output_indices))
+            else:
+                port_message = copy.copy(message)
+                port_message.payload = Payload(data[port])
+                routed_messages.append((port_message, output_indices))
+
+        return routed_messages
+
+    def _send(self, message: Message, output_indices: Optional[List[int]]):
+        """Transmit and encode a message and put it into the given outputs, or into all of them if None.
+
+        """
+
+        if callable(self.transmit):
+            transmitted_data = self.transmit(message.payload.data)
+            message.update_data(transmitted_data)
+
+        if self.batcher is not None:
+            self.batcher.add((message, output_indices))
+        elif output_indices is None:
+            self._put(Message.encode(message))
+        elif output_indices:
+            encoded_message = Message.encode(message)
+
+            for output_index in output_indices:
+                self._put_to(encoded_message, output_index)
+
+    def _put_batch(self, batch: list):
+        """Encodes a batch of messages as a single frame and calls the implemented put method.
+        With routes, a frame is encoded for each output from the messages that are sent to it. Messages batched
+        before the routes were set are sent to all of the outputs.
+
+        Args:
+            batch: The messages, each with the indices of its outputs or None for all of the outputs.
+
+        """
+
+        if self.routes is None:
+            self._put(Message.encode_batch([message for message, _ in batch]))
+        else:
+            outputs_batches = defaultdict(list)
+
+            for message, output_indices in batch:
+                if output_indices is None:
+                    output_indices = range(len(self._get_outputs()))
+
+                for output_index in output_indices:
+                    outputs_batches[output_index].append(message)
+
+            for output_index, output_batch in outputs_batches.items():
+                self._put_to(Message.encode_batch(output_batch), output_index)
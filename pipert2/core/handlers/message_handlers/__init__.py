@@ -1 +1,2 @@
 from .queue_handler import QueueHandler as QueueHandler
+from .socket_handler import SocketHandler as SocketHandler
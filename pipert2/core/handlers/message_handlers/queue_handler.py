@@ -1,6 +1,7 @@
 from queue import Full, Empty
 from pipert2.core.handlers.message_handler import MessageHandler
 from pipert2.utils.queue_wrapper import QueueWrapper
+from pipert2.utils.input_schedulers import InputScheduler
 from pipert2.utils.exceptions.queue_not_initialized import QueueNotInitialized
 
 
@@ -11,12 +12,14 @@ class QueueHandler(MessageHandler):
     Args:
         block: If the queues will behave as blocking behavior detailed in each function or not.
         timeout: How long the queues will wait in seconds if blocking is true.
+        input_scheduler: The scheduler that picks the input the next message is taken from, round robin if None.
 
     """
 
-    def __init__(self, routine_name: str, max_queue_len=1, block=False, timeout=1):
+    def __init__(self, routine_name: str, max_queue_len=1, block=False, timeout=1,
+                 input_scheduler: InputScheduler = None):
         super().__init__(routine_name)
-        self.input_queue = QueueWrapper(max_queue_len)
+        self.input_queue = QueueWrapper(max_queue_len, scheduler=input_scheduler)
         self.output_queue = None
         self.block = block
         self.timeout = timeout
@@ -58,5 +61,40 @@ class QueueHandler(MessageHandler):
         except Full:
             self.logger.exception("The queue is full!")
 
+    def _get_outputs(self) -> list:
+        """Get the queues leading to each destination.
+
+        """
+
+        if self.output_queue is None:
+            raise QueueNotInitialized(f"{self.routine_name}'s output_queue was not initialized when put was called!")
+
+        return self.output_queue.get_queues()
+
+    def _put_to(self, message: bytes, output_index: int):
+        """Put a message into the queue of a single destination.
+
+        Args:
+            message: The given message to push.
+            output_index: The index of the destination's queue.
+
+        """
+
+        try:
+            self.output_queue.put_to(output_index, message, block=self.block, timeout=self.timeout)
+        except Full:
+            self.logger.exception("The queue is full!")
+
+    def get_input_depth(self) -> int:
+        """Get the amount of messages waiting in all of the input queues.
+
+        """
+
+        return super().get_input_depth() + self.input_queue.qsize()
+
     def teardown(self):
-        self.input_queue.kill_queue_worker()
+        """Close the pipe used for waking the reader of the input queues.
+
+        """
+
+        self.input_queue.close()
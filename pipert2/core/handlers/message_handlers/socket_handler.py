@@ -0,0 +1,117 @@
+import os
+import socket
+from typing import List, Optional
+from pipert2.core.handlers.message_handler import MessageHandler
+from pipert2.utils.socket_frames import FrameReceiver, FrameSender
+from pipert2.utils.exceptions.queue_not_initialized import QueueNotInitialized
+
+
+class SocketHandler(MessageHandler):
+    """The socket message handler sends and receives messages as length-prefixed frames over stream sockets.
+    The routine listens on its own address and connects to the addresses of its destinations.
+
+    Args:
+        address: The address the routine receives its messages on.
+        family: The address family of the sockets.
+        block: If sending waits for room in the sockets' backlog and receiving waits for a message.
+        timeout: How long to wait in seconds if blocking is true.
+
+    Attributes:
+        remote: Whether the routine runs elsewhere, in which case it listens on its own host and not here.
+
+    """
+
+    def __init__(self, routine_name: str, address, family=socket.AF_UNIX, block=False, timeout=1):
+        super().__init__(routine_name)
+        self.address = address
+        self.family = family
+        self.block = block
+        self.timeout = timeout
+        self.receiver: Optional[FrameReceiver] = None
+        self.senders: Optional[List[FrameSender]] = None
+        self.remote = False
+
+    def listen(self):
+        """Start listening on the routine's address, if it doesn't listen already and isn't remote.
+        Listening on port 0 picks a free port and updates the address accordingly.
+
+        """
+
+        if self.receiver is None and not self.remote:
+            listener = socket.socket(self.family, socket.SOCK_STREAM)
+
+            if self.family == socket.AF_UNIX:
+                if os.path.exists(self.address):
+                    os.unlink(self.address)
+            else:
+                listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+
+            listener.bind(self.address)
+            listener.listen()
+            self.address = listener.getsockname()
+            self.receiver = FrameReceiver(listener)
+
+    def _get(self) -> Optional[bytes]:
+        """Get a frame from one of the connections to the routine.
+        If blocking is true, wait the set timeout for a frame to arrive.
+
+        Returns:
+            The received frame or None if there was none.
+
+        """
+
+        if self.receiver is None:
+            return None
+
+        return self.receiver.receive(timeout=self.timeout if self.block else 0)
+
+    def _put(self, message: bytes):
+        """Send the message to every destination.
+
+        Args:
+            message: The encoded message to send.
+
+        """
+
+        if self.senders is None:
+            raise QueueNotInitialized(f"{self.routine_name}'s senders were not initialized when put was called!")
+
+        for sender in self.senders:
+            sender.send(message, block=self.block, timeout=self.timeout)
+
+    def _get_outputs(self) -> List[FrameSender]:
+        """Get the senders to each destination, their size is the amount of frames in their backlog.
+
+        """
+
+        if self.senders is None:
+            raise QueueNotInitialized(f"{self.routine_name}'s senders were not initialized when put was called!")
+
+        return self.senders
+
+    def _put_to(self, message: bytes, output_index: int):
+        """Send the message to a single destination.
+
+        Args:
+            message: The encoded message to send.
+            output_index: The index of the destination's sender.
+
+        """
+
+        self.senders[output_index].send(message, block=self.block, timeout=self.timeout)
+
+    def get_input_depth(self) -> int:
+        """Get the amount of frames that were received and not read yet, the frames still in the socket aren't counted.
+
+        """
+
+        return super().get_input_depth() + (self.receiver.qsize() if self.receiver is not None else 0)
+
+    def teardown(self):
+        """Give the frames that are still in the senders' backlogs a chance to be sent.
+
+        """
+
+        if self.senders is not None:
+            for sender in self.senders:
+                sender.flush(timeout=self.timeout)
@@ -1,3 +1,5 @@
 from .network import Network as Network
 from .networks import QueueNetwork as QueueNetwork
+from .networks import SocketNetwork as SocketNetwork
+from .networks import TcpNetwork as TcpNetwork
 from .event_board import EventBoard as EventBoard
@@ -1,29 +1,67 @@
-from typing import Callable
-from threading import Thread
+import itertools
+from queue import Empty
+from time import monotonic
+from concurrent.futures import Future
+from typing import Callable, Dict, Iterable, List
+from threading import Thread, Lock, Condition
 from functools import partial
 from collections import defaultdict
-from multiprocessing import Pipe, SimpleQueue
+from multiprocessing import Pipe, SimpleQueue, Queue
 from pipert2.core.handlers.event_handler import EventHandler
 from pipert2.utils.method_data import Method
+from pipert2.utils.event_request import EventRequest
+from pipert2.utils.exceptions import PipeNotBuilt
+from pipert2.utils.timer_wheel import TimerWheel, JitterStats
 from pipert2.utils.consts.event_names import KILL_EVENT_NAME, STOP_EVENT_NAME, START_EVENT_NAME
 
 DEFAULT_EVENT_HANDLER_EVENTS = [START_EVENT_NAME, STOP_EVENT_NAME, KILL_EVENT_NAME]
+FLOW_SUBSCRIBER = None
+STOP_COLLECTING_REPLIES = "stop"
 
 
 class EventBoard:
     """The event board is responsible for managing the event system in the pipe.
+    It keeps an index of which flows and routines subscribe to each event, so an event meant for specific routines is
+    sent only to the flows of the routines that listen to it.
+
+    Attributes:
+        events_pipes: The pipes of the handlers subscribed to each event.
+        subscriptions: For each event, the subscribed flows mapped to the names of their subscribed routines.
+                       `FLOW_SUBSCRIBER` stands for the flow itself.
+        flows_pipes: The pipe of each flow's handler.
+        anonymous_events_pipes: The pipes of the handlers that aren't of a specific flow, subscribed to each event.
+                                They receive the events meant for specific routines as well.
+        replies_queue: The channel the flows reply to request events through.
+        timer_wheel: Holds the scheduled events until they are due.
+        scheduling_jitter: Measures how late the scheduled events are notified.
 
     """
 
     def __init__(self):
         self.events_pipes = defaultdict(list)
+        self.subscriptions = defaultdict(lambda: defaultdict(set))
+        self.flows_pipes = {}
+        self.anonymous_events_pipes = defaultdict(list)
         self.new_events_queue = SimpleQueue()
+        self.replies_queue = Queue()
+        self._requests: Dict[int, EventRequest] = {}
+        self._requests_lock = Lock()
+        self._requests_ids = itertools.count()
+        self.timer_wheel = TimerWheel()
+        self.scheduling_jitter = JitterStats()
+        self._scheduler_condition = Condition()
+        self._scheduler_running = False
+        self.replies_thread = None
 
-    def get_event_handler(self, events_to_listen: list):
+    def get_event_handler(self, events_to_listen: Iterable[str], flow_name: str = None,
+                          routines_events: Dict[str, Iterable[str]] = None):
         """Return an event handler adjusted to the given events.
 
         Args:
             events_to_listen: List of event names to listen.
+            flow_name: The name of the flow the handler belongs to, if it belongs to one.
+            routines_events: The events each routine of the flow listens to, mapped by the routines names.
+                             Events that no routine listens to are of the flow itself.
 
         Returns:
             An event handler adjusted to the given events.
@@ -31,14 +69,76 @@ class EventBoard:
         """
 
         pipe_output, pipe_input = Pipe(duplex=False)
+        events_to_listen = set(events_to_listen).union(DEFAULT_EVENT_HANDLER_EVENTS)
 
         for event_name in events_to_listen:
             self.events_pipes[event_name].append(pipe_input)
 
-        for default_event_name in DEFAULT_EVENT_HANDLER_EVENTS:
-            self.events_pipes[default_event_name].append(pipe_input)
+        if flow_name is None:
+            for event_name in events_to_listen:
+                self.anonymous_events_pipes[event_name].append(pipe_input)
+        else:
+            self.flows_pipes[flow_name] = pipe_input
+            routines_events = routines_events if routines_events is not None else {}
+            routines_events_names = set()
+
+            for routine_name, routine_events in routines_events.items():
+                for event_name in routine_events:
+                    self.subscriptions[event_name][flow_name].add(routine_name)
+                    routines_events_names.add(event_name)
+
+            for event_name in events_to_listen:
+                if event_name not in routines_events_names or event_name in DEFAULT_EVENT_HANDLER_EVENTS:
+                    self.subscriptions[event_name][flow_name].add(FLOW_SUBSCRIBER)
+
+        return EventHandler(pipe_output, self.replies_queue, flow_name)
+
+    def get_event_pipes(self, event: Method) -> List:
+        """Get the pipes of the handlers that should receive the event.
+        An event for specific flows and routines is looked up by its targets only, instead of by all of the flows.
+
+        Args:
+            event: The event to deliver.
+
+        Returns:
+            The pipes to send the event to.
+
+        """
+
+        if not _is_targeted(event):
+            return self.events_pipes[event.event_name]
+
+        pipes = list(self.anonymous_events_pipes.get(event.event_name, []))
+        pipes.extend(self.flows_pipes[flow_name] for flow_name in self.get_event_flows(event))
+
+        return pipes
+
+    def get_event_flows(self, event: Method) -> List[str]:
+        """Get the names of the flows that should receive the event.
+
+        Args:
+            event: The event to deliver.
+
+        Returns:
+            The flows subscribed to the event, only the targeted ones if the event is for specific flows and routines.
+
+        """
+
+        event_subscriptions = self.subscriptions.get(event.event_name, {})
+
+        if not _is_targeted(event):
+            return list(event_subscriptions)
+
+        flows = []
+
+        for flow_name, routines_names in event.specific_flow_routines.items():
+            flow_subscribers = event_subscriptions.get(flow_name)
 
-        return EventHandler(pipe_output)
+            if flow_subscribers and (not routines_names or FLOW_SUBSCRIBER in flow_subscribers or
+                                     not flow_subscribers.isdisjoint(routines_names)):
+                flows.append(flow_name)
+
+        return flows
 
     def event_loop(self):
         """Wait for new events to come and spread them to the pipes.
@@ -47,7 +147,7 @@ class EventBoard:
 
         event: Method = self.new_events_queue.get()
         while event.event_name != KILL_EVENT_NAME:
-            for pipe in self.events_pipes[event.event_name]:
+            for pipe in self.get_event_pipes(event):
                 pipe.send(event)
 
             event = self.new_events_queue.get()
@@ -64,6 +164,13 @@ class EventBoard:
         self.event_board_thread = Thread(target=self.event_loop)
         self.event_board_thread.start()
 
+        self.replies_thread = Thread(target=self.collect_replies, daemon=True)
+        self.replies_thread.start()
+
+        self._scheduler_running = True
+        self.scheduler_thread = Thread(target=self.scheduler_loop, daemon=True)
+        self.scheduler_thread.start()
+
     def get_event_notifier(self) -> Callable:
         """Return a callable for notifying that new event occurred
 
@@ -79,5 +186,144 @@ class EventBoard:
                                          specific_flow_routines=specific_flow_routines,
                                          params=params))
 
+    def request_event(self, event_name: str, specific_flow_routines: dict = defaultdict(list), timeout: float = 1,
+                      **params) -> Future:
+        """Notify an event and collect the return values of its callbacks from every routine it is executed in.
+
+        Args:
+            event_name: The name of the event.
+            specific_flow_routines: The flows and routines to execute the event in, all of them if empty.
+            timeout: How long to wait in seconds for the flows to reply.
+            params: The parameters of the event's callbacks.
+
+        Returns:
+            A future resolving to the callbacks results, mapped by flow name and then by routine name.
+            If the timeout passed, the flows that didn't reply are missing from the results.
+
+        Raises:
+            PipeNotBuilt: If flows listen to the event but the board wasn't built yet, since the replies are collected
+                          only once it is.
+
+        """
+
+        event = Method(event_name=event_name, specific_flow_routines=specific_flow_routines, params=params,
+                       request_id=next(self._requests_ids))
+        request = EventRequest(self.get_event_flows(event), timeout)
+
+        if not request.future.done():
+            if self.replies_thread is None:
+                raise PipeNotBuilt(f"Can't request the event '{event_name}' before the pipe is built")
+
+            with self._requests_lock:
+                self._requests[event.request_id] = request
+
+            # Wake the collector so it waits until the new deadline at the latest.
+            self.replies_queue.put(None)
+
+        self.new_events_queue.put(event)
+
+        return request.future
+
+    def schedule_event(self, event_name: str, delay: float, interval: float = None,
+                       specific_flow_routines: dict = defaultdict(list), **params) -> int:
+        """Schedule an event to be notified after a delay, and optionally every interval after that.
+        Events scheduled before the board is built are notified once it is built.
+
+        Args:
+            event_name: The name of the event.
+            delay: The seconds until the event is notified.
+            interval: The seconds between the notifications of a periodic event, None for notifying it once.
+            specific_flow_routines: The flows and routines to notify the event to, all of them if empty.
+            params: The parameters of the event's callbacks.
+
+        Returns:
+            The id of the scheduled event, for cancelling it.
+
+        """
+
+        event = Method(event_name=event_name, specific_flow_routines=specific_flow_routines, params=params)
+
+        with self._scheduler_condition:
+            timer_id = self.timer_wheel.add(monotonic() + delay, event, interval)
+            self._scheduler_condition.notify()
+
+        return timer_id
+
+    def cancel_scheduled_event(self, timer_id: int) -> bool:
+        """Cancel a scheduled event.
+
+        Args:
+            timer_id: The id returned when the event was scheduled.
+
+        Returns:
+            True if the event was cancelled, False if it was already notified or cancelled.
+
+        """
+
+        with self._scheduler_condition:
+            return self.timer_wheel.cancel(timer_id)
+
+    def scheduler_loop(self):
+        """Notify the scheduled events when they are due.
+        The loop sleeps until the next deadline of the timer wheel, so an event is notified at most a tick of the
+        wheel after its deadline, in addition to the time the thread takes to wake up.
+
+        """
+
+        with self._scheduler_condition:
+            while self._scheduler_running:
+                now = monotonic()
+
+                for event, deadline in self.timer_wheel.advance(now):
+                    self.scheduling_jitter.record(now - deadline)
+                    self.new_events_queue.put(event)
+
+                next_deadline = self.timer_wheel.next_deadline()
+                self._scheduler_condition.wait(None if next_deadline is None else max(next_deadline - monotonic(), 0))
+
+    def collect_replies(self):
+        """Collect the replies of the flows into the pending requests, and complete the requests that timed out.
+
+        """
+
+        while True:
+            with self._requests_lock:
+                deadline = min((request.deadline for request in self._requests.values()), default=None)
+
+            try:
+                reply = self.replies_queue.get(timeout=None if deadline is None else max(deadline - monotonic(), 0))
+            except Empty:
+                reply = None
+
+            if reply == STOP_COLLECTING_REPLIES:
+                break
+
+            with self._requests_lock:
+                if reply is not None:
+                    request_id, flow_name, results = reply
+                    request = self._requests.get(request_id)
+
+                    if request is not None:
+                        request.add_reply(flow_name, results)
+
+                now = monotonic()
+
+                for request_id, request in list(self._requests.items()):
+                    if request.future.done() or request.deadline <= now:
+                        request.complete()
+                        del self._requests[request_id]
+
     def join(self):
         self.event_board_thread.join()
+
+        with self._scheduler_condition:
+            self._scheduler_running = False
+            self._scheduler_condition.notify()
+
+        self.scheduler_thread.join()
+        self.replies_queue.put(STOP_COLLECTING_REPLIES)
+        self.replies_thread.join()
+
+
+def _is_targeted(event: Method) -> bool:
+    return event.specific_flow_routines is not None and any(event.specific_flow_routines)
@@ -1,9 +1,11 @@
-from typing import Tuple
+from typing import Tuple, Dict
 from abc import ABC, abstractmethod
 from collections import defaultdict
 from pipert2.core.base.routine import Routine
 from pipert2.core.base.data_transmitter import DataTransmitter
 from pipert2.core.handlers.message_handler import MessageHandler
+from pipert2.utils.overflow_policies import OverflowPolicy
+from pipert2.utils.shared_counter import SharedCounter
 
 
 class Network(ABC):
@@ -29,14 +31,43 @@ class Network(ABC):
 
         raise NotImplementedError
 
+    def get_remote_message_handler(self, routine_name: str) -> MessageHandler:
+        """Generate a message handler for a routine that runs on another host, so local routines can send to it.
+
+        Args:
+            routine_name: The name of the remote routine.
+
+        Returns:
+            The message handler for the remote routine.
+
+        Raises:
+            NotImplementedError: If the network can't reach routines outside of the pipe.
+
+        """
+
+        raise NotImplementedError(f"{self.__class__.__name__} doesn't support remote routines")
+
     @abstractmethod
-    def link(self, source: Routine, destinations: Tuple[Routine], data_transmitter: DataTransmitter):
+    def link(self, source: Routine, destinations: Tuple[Routine], data_transmitter: DataTransmitter, weight: int = 1,
+             overflow_policy: OverflowPolicy = None, max_queue_size: int = None,
+             max_queue_bytes: int = None, append: bool = False) -> Dict[str, SharedCounter]:
         """Rewire the destinations of a given routine.
 
         Args:
             source: The source routine to be linked.
             destinations: A list of all of the destination routines.
             data_transmitter: The DataTransmitter object that provides the methods to move data between routines.
+            weight: The weight of the source's messages in the destinations' input scheduling.
+            overflow_policy: What to do when a destination can't receive more messages, network's default if None.
+            max_queue_size: The maximum amount of the source's messages waiting in each destination,
+                            network's default if None.
+            max_queue_bytes: The maximum total size of the source's messages waiting in each destination,
+                             unlimited if None.
+            append: Add the destinations after the source's current outputs instead of replacing them, used for
+                    linking several wires of the same source.
+
+        Returns:
+            The counters of the messages dropped on their way to each destination, mapped by the destinations names.
 
         """
 
@@ -1 +1,3 @@
 from .queue_network import QueueNetwork as QueueNetwork
+from .socket_network import SocketNetwork as SocketNetwork
+from .tcp_network import TcpNetwork as TcpNetwork
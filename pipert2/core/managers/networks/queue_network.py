@@ -1,21 +1,32 @@
-from typing import Tuple
+from typing import Tuple, Callable, Dict
 from pipert2.core.base.routine import Routine
 from pipert2.core.managers.network import Network
 from pipert2.core.base.data_transmitter import DataTransmitter
 from pipert2.core.handlers.message_handlers.queue_handler import QueueHandler
 from pipert2.utils.publish_queue import PublishQueue
+from pipert2.utils.input_schedulers import InputScheduler, RoundRobinScheduler
+from pipert2.utils.overflow_policies import OverflowPolicy
+from pipert2.utils.shared_counter import SharedCounter
 
 
 class QueueNetwork(Network):
     """The queue network generates queue handlers to manage communication using multiprocessing queues within the pipe.
 
+    Args:
+        max_queue_sizes: The size of each input queue of the routines.
+        block: If the queues will behave as blocking behavior or not.
+        timeout: How long the queues will wait in seconds if blocking is true.
+        input_scheduler: Creates the scheduler that picks the input each routine reads its next message from.
+
     """
 
-    def __init__(self, max_queue_sizes=1, block=False, timeout=1):
+    def __init__(self, max_queue_sizes=1, block=False, timeout=1,
+                 input_scheduler: Callable[[], InputScheduler] = RoundRobinScheduler):
         super().__init__()
         self.max_queue_sizes = max_queue_sizes
         self.block = block
         self.timeout = timeout
+        self.input_scheduler = input_scheduler
 
     def get_message_handler(self, routine_name: str) -> QueueHandler:
         """Generate/Retrieve a queue handler.
@@ -32,30 +43,49 @@ class QueueNetwork(Network):
             message_handler = self.message_handlers[routine_name]
         else:
             message_handler = QueueHandler(routine_name, max_queue_len=self.max_queue_sizes, block=self.block,
-                                           timeout=self.timeout)
+                                           timeout=self.timeout, input_scheduler=self.input_scheduler())
             self.message_handlers[routine_name] = message_handler
 
         return message_handler
 
-    def link(self, source: Routine, destinations: Tuple[Routine], data_transmitter: DataTransmitter):
+    def link(self, source: Routine, destinations: Tuple[Routine], data_transmitter: DataTransmitter, weight: int = 1,
+             overflow_policy: OverflowPolicy = None, max_queue_size: int = None,
+             max_queue_bytes: int = None, append: bool = False) -> Dict[str, SharedCounter]:
         """Links between two QueueHandlers of the given routines.
+        Each destination gets a separate input queue for the source's messages.
 
         Args:
             source: The source routine that generates data.
             destinations: Destination routines that receive the data.
             data_transmitter: The data transmitter that indicates how to transfer the data.
+            weight: The weight of the source's messages in the destinations' input scheduling.
+            overflow_policy: What to do when a destination's queue is full, decided by `block` if None.
+            max_queue_size: The size of the source's queue in each destination, `max_queue_sizes` if None.
+            max_queue_bytes: The maximum total size of the messages in the source's queue in each destination,
+                             unlimited if None.
+            append: Register the destinations' queues after the source's current ones instead of replacing them.
+
+        Returns:
+            The drop counters of the destinations' input queues, mapped by the destinations names.
 
         """
 
-        publish_queue = PublishQueue()
+        publish_queue = source.message_handler.output_queue if append else PublishQueue()
+        drop_counters = {}
 
         for destination_routine in destinations:
-            if source.flow_name == destination_routine.flow_name:
-                publish_queue.register(destination_routine.message_handler.input_queue.get_queue(process_safe=False))
-            else:
-                publish_queue.register(destination_routine.message_handler.input_queue.get_queue(process_safe=True))
+            process_safe = source.flow_name != destination_routine.flow_name
+            input_queue = destination_routine.message_handler.input_queue.get_queue(process_safe=process_safe,
+                                                                                    input_name=source.name,
+                                                                                    weight=weight,
+                                                                                    max_size=max_queue_size,
+                                                                                    max_bytes=max_queue_bytes)
+            publish_queue.register(input_queue, overflow_policy=overflow_policy)
+            drop_counters[destination_routine.name] = input_queue.drops
 
             destination_routine.message_handler.receive = data_transmitter.receive()
 
         source.message_handler.output_queue = publish_queue
         source.message_handler.transmit = data_transmitter.transmit()
+
+        return drop_counters
@@ -0,0 +1,127 @@
+import os
+import socket
+import shutil
+import tempfile
+from typing import Tuple, Dict
+from multiprocessing.util import Finalize
+from pipert2.core.base.routine import Routine
+from pipert2.core.managers.network import Network
+from pipert2.core.base.data_transmitter import DataTransmitter
+from pipert2.core.handlers.message_handlers.socket_handler import SocketHandler
+from pipert2.utils.overflow_policies import OverflowPolicy
+from pipert2.utils.shared_counter import SharedCounter
+from pipert2.utils.socket_frames import FrameSender, DEFAULT_MAX_PENDING_BYTES
+
+
+class SocketNetwork(Network):
+    """The socket network generates socket handlers that pass the messages over Unix domain sockets.
+    Each routine listens on a socket file named after it, so flows that run as independently managed processes can
+    be linked to each other by using the same socket directory.
+
+    Args:
+        socket_dir: The directory of the socket files, a temporary directory that is removed on exit if None.
+        block: If the sockets will behave as blocking behavior or not.
+        timeout: How long the sockets will wait in seconds if blocking is true.
+        max_pending_bytes: The default size of the backlog of frames waiting to be sent to each destination.
+
+    """
+
+    family = socket.AF_UNIX
+
+    def __init__(self, socket_dir: str = None, block=False, timeout=1, max_pending_bytes=DEFAULT_MAX_PENDING_BYTES):
+        super().__init__()
+        self.socket_dir = socket_dir
+        self.block = block
+        self.timeout = timeout
+        self.max_pending_bytes = max_pending_bytes
+
+    def get_message_handler(self, routine_name: str) -> SocketHandler:
+        """Generate/Retrieve a socket handler.
+
+        Args:
+            routine_name: The name of the routine to retrieve the socket handler for.
+
+        Returns:
+            A SocketHandler object relevant to the routine.
+
+        """
+
+        if routine_name in self.message_handlers:
+            message_handler = self.message_handlers[routine_name]
+        else:
+            message_handler = SocketHandler(routine_name, address=self._get_address(routine_name), family=self.family,
+                                            block=self.block, timeout=self.timeout)
+            self.message_handlers[routine_name] = message_handler
+
+        return message_handler
+
+    def get_remote_message_handler(self, routine_name: str) -> SocketHandler:
+        """Generate/Retrieve the socket handler of a routine that is run by another pipe.
+        The routine is expected to listen on its address by itself.
+
+        Args:
+            routine_name: The name of the remote routine.
+
+        Returns:
+            A SocketHandler object relevant to the routine.
+
+        """
+
+        message_handler = self.get_message_handler(routine_name)
+        message_handler.remote = True
+
+        return message_handler
+
+    def link(self, source: Routine, destinations: Tuple[Routine], data_transmitter: DataTransmitter, weight: int = 1,
+             overflow_policy: OverflowPolicy = None, max_queue_size: int = None,
+             max_queue_bytes: int = None, append: bool = False) -> Dict[str, SharedCounter]:
+        """Connect the source's socket handler to the sockets of the destinations.
+        The frames that can't be sent right away wait in a backlog of `max_queue_bytes` bytes, newer frames that don't
+        fit in it are dropped. The weight, overflow policy and queue size of the wire don't apply to sockets.
+
+        Args:
+            source: The source routine that generates data.
+            destinations: Destination routines that receive the data.
+            data_transmitter: The data transmitter that indicates how to transfer the data.
+            weight: Not used by the socket network.
+            overflow_policy: Not used by the socket network.
+            max_queue_size: Not used by the socket network.
+            max_queue_bytes: The size of the backlog for each destination, `max_pending_bytes` if None.
+            append: Add the senders after the source's current ones instead of replacing them.
+
+        Returns:
+            The drop counters of the senders to each destination, mapped by the destinations names.
+
+        """
+
+        senders = list(source.message_handler.senders) if append else []
+        drop_counters = {}
+        max_pending_bytes = max_queue_bytes if max_queue_bytes is not None else self.max_pending_bytes
+
+        for destination_routine in destinations:
+            destination_routine.message_handler.listen()
+
+            sender = self._create_sender(destination_routine.message_handler.address, max_pending_bytes)
+            senders.append(sender)
+            drop_counters[destination_routine.name] = sender.drops
+
+            destination_routine.message_handler.receive = data_transmitter.receive()
+
+        source.message_handler.senders = senders
+        source.message_handler.transmit = data_transmitter.transmit()
+
+        return drop_counters
+
+    def _get_address(self, routine_name: str):
+        """Get the address a routine listens on, a socket file in the socket directory.
+
+        """
+
+        if self.socket_dir is None:
+            self.socket_dir = tempfile.mkdtemp(prefix="pipert_")
+            Finalize(self, shutil.rmtree, args=(self.socket_dir, True), exitpriority=0)
+
+        return os.path.join(self.socket_dir, f"{routine_name}.sock")
+
+    def _create_sender(self, address, max_pending_bytes: int) -> FrameSender:
+        return FrameSender(address, family=self.family, max_pending_bytes=max_pending_bytes)
@@ -0,0 +1,65 @@
+import socket
+from typing import Dict, Tuple
+from pipert2.core.base.routine import Routine
+from pipert2.core.base.data_transmitter import DataTransmitter
+from pipert2.core.managers.networks.socket_network import SocketNetwork
+from pipert2.utils.overflow_policies import OverflowPolicy
+from pipert2.utils.shared_counter import SharedCounter
+from pipert2.utils.exceptions import UnknownRoutineAddress
+from pipert2.utils.socket_frames import FrameSender, TcpFrameSender, DEFAULT_MAX_PENDING_BYTES
+
+
+class TcpNetwork(SocketNetwork):
+    """The TCP network generates socket handlers that pass the messages over TCP connections, so a pipe can span
+    multiple hosts.
+    Every sender keeps a persistent connection to its destination with Nagle's algorithm disabled, batches the frames
+    that wait for the socket into a single write and reconnects with a backoff when the connection breaks.
+
+    The routines that run on other hosts are added to the pipe as remote flows, and the addresses of those that
+    receive messages from local routines must be given.
+    The local routines listen on the given address, or on a free port of the host if they have none.
+
+    Args:
+        host: The host the local routines without an address listen on.
+        addresses: The (host, port) addresses of the routines, mapped by the routines names.
+        block: If the sockets will behave as blocking behavior or not.
+        timeout: How long the sockets will wait in seconds if blocking is true.
+        max_pending_bytes: The default size of the backlog of frames waiting to be sent to each destination.
+
+    """
+
+    family = socket.AF_INET
+
+    def __init__(self, host: str = "127.0.0.1", addresses: Dict[str, Tuple[str, int]] = None, block=False, timeout=1,
+                 max_pending_bytes=DEFAULT_MAX_PENDING_BYTES):
+        super().__init__(block=block, timeout=timeout, max_pending_bytes=max_pending_bytes)
+        self.host = host
+        self.addresses = addresses if addresses is not None else {}
+
+    def link(self, source: Routine, destinations: Tuple[Routine], data_transmitter: DataTransmitter, weight: int = 1,
+             overflow_policy: OverflowPolicy = None, max_queue_size: int = None,
+             max_queue_bytes: int = None, append: bool = False) -> Dict[str, SharedCounter]:
+        """Connect the source's socket handler to the destinations, see `SocketNetwork.link`.
+
+        Raises:
+            UnknownRoutineAddress: If one of the destinations is remote and its address wasn't given.
+
+        """
+
+        for destination_routine in destinations:
+            if destination_routine.message_handler.remote and destination_routine.name not in self.addresses:
+                raise UnknownRoutineAddress(f"The address of the remote routine {destination_routine.name} "
+                                            f"wasn't given.")
+
+        return super().link(source, destinations, data_transmitter, weight=weight, overflow_policy=overflow_policy,
+                            max_queue_size=max_queue_size, max_queue_bytes=max_queue_bytes, append=append)
+
+    def _get_address(self, routine_name: str) -> Tuple[str, int]:
+        """Get the address a routine listens on, port 0 picks a free port once the routine starts listening.
+
+        """
+
+        return self.addresses.get(routine_name, (self.host, 0))
+
+    def _create_sender(self, address, max_pending_bytes: int) -> FrameSender:
+        return TcpFrameSender(address, family=self.family, max_pending_bytes=max_pending_bytes)
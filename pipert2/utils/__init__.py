@@ -1 +1,2 @@
-from .consts.event_names import START_EVENT_NAME, STOP_EVENT_NAME, KILL_EVENT_NAME
+from .consts.event_names import START_EVENT_NAME, STOP_EVENT_NAME, KILL_EVENT_NAME, UPDATE_PARAMS_EVENT_NAME, \
+    PROFILE_EVENT_NAME
@@ -0,0 +1,251 @@
+import queue
+import logging
+import threading
+from time import monotonic
+from multiprocessing.util import register_after_fork, Finalize
+
+DEFAULT_MAX_QUEUE_SIZE = 10000
+DEFAULT_REPEAT_INTERVAL = 1
+STOP_TIMEOUT = 1
+
+_SENTINEL = object()
+_EXCEPTION_FORMATTER = logging.Formatter()
+
+
+class RepeatWindow:
+    """The repetitions of a single message within the current window of the rate limit.
+
+    Attributes:
+        start: The monotonic time the window started at.
+        suppressed: The amount of repetitions that weren't emitted.
+        last_record: The last repetition that wasn't emitted.
+        last_message: The message of the last repetition, with its arguments merged when it was logged.
+
+    """
+
+    __slots__ = ("start", "suppressed", "last_record", "last_message")
+
+    def __init__(self, start: float):
+        self.start = start
+        self.suppressed = 0
+        self.last_record = None
+        self.last_message = None
+
+
+class AsyncLogHandler(logging.Handler):
+    """Hands the records over to a background thread that emits them through the target handlers, so logging never
+    waits for a slow stream. The thread is started on the first record of every process.
+
+    A message repeated within `repeat_interval` seconds is emitted only the first time, and once the interval ends a
+    single record tells how many repetitions were suppressed. Records that don't fit in the queue are dropped, and the
+    amount of dropped records is logged once there's room again.
+
+    Attributes:
+        handlers: The handlers that emit the records.
+        max_queue_size: The maximum amount of records waiting to be emitted.
+        repeat_interval: The seconds within which an identical message is suppressed, 0 disables the rate limit.
+        dropped: The amount of records that were dropped because the queue was full.
+
+    """
+
+    def __init__(self, *handlers: logging.Handler, max_queue_size: int = DEFAULT_MAX_QUEUE_SIZE,
+                 repeat_interval: float = DEFAULT_REPEAT_INTERVAL):
+        super().__init__()
+        self.handlers = handlers
+        self.max_queue_size = max_queue_size
+        self.repeat_interval = repeat_interval
+        self._reset()
+        register_after_fork(self, AsyncLogHandler._reset)
+
+    def _reset(self):
+        """Reset the listener state, the listener thread doesn't survive a fork.
+
+        """
+
+        self.dropped = 0
+        self._reported_dropped = 0
+        self._queue = queue.Queue(self.max_queue_size)
+        self._windows = {}
+        self._listener_thread = None
+
+    def emit(self, record: logging.LogRecord):
+        """Queue a record to be emitted, unless it repeats a message that was emitted in the current interval.
+        Called with the handler's lock held.
+        The record is prepared before it's queued, so its arguments can change once the call returns. Only the message
+        of a suppressed repetition is merged, its exception isn't rendered.
+
+        """
+
+        if self._listener_thread is None:
+            self._start_listener()
+
+        if self.repeat_interval > 0:
+            key = (record.name, record.levelno, str(record.msg))
+            window = self._windows.get(key)
+            now = monotonic()
+
+            if window is not None and now - window.start < self.repeat_interval:
+                window.suppressed += 1
+                window.last_record = record
+                window.last_message = record.getMessage()
+                return
+
+            if window is not None:
+                self._enqueue_summary(window)
+
+            self._windows[key] = RepeatWindow(now)
+
+        self._enqueue(self._prepare(record))
+
+    def flush(self, timeout: float = STOP_TIMEOUT):
+        """Wait for the queued records to be emitted.
+
+        Args:
+            timeout: How long to wait in seconds.
+
+        """
+
+        deadline = monotonic() + timeout
+
+        while self._listener_thread is not None and self._queue.unfinished_tasks and monotonic() < deadline:
+            self._listener_thread.join(0.01)
+
+        for handler in self.handlers:
+            handler.flush()
+
+    def close(self):
+        """Emit the queued records and the summaries of the suppressed ones, then stop the listener.
+
+        """
+
+        self._stop_listener(self._queue, self._listener_thread)
+        self._listener_thread = None
+
+        for handler in self.handlers:
+            handler.close()
+
+        super().close()
+
+    @staticmethod
+    def _prepare(record: logging.LogRecord) -> logging.LogRecord:
+        """Merge the arguments into the message and render the exception, like `logging.handlers.QueueHandler`, so the
+        record doesn't reference objects the caller may change before it's emitted.
+
+        """
+
+        record.msg = record.getMessage()
+        record.args = None
+
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = _EXCEPTION_FORMATTER.formatException(record.exc_info)
+
+            record.exc_info = None
+
+        return record
+
+    def _enqueue(self, record):
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def _enqueue_summary(self, window: RepeatWindow):
+        """Queue a record telling how many repetitions of a message were suppressed, if there were any.
+
+        """
+
+        if window.suppressed:
+            summary = logging.makeLogRecord(window.last_record.__dict__)
+            summary.msg = f"{window.last_message} (suppressed {window.suppressed} repetitions)"
+            summary.args = None
+            summary.exc_info = None
+            summary.exc_text = None
+            self._enqueue(summary)
+
+    def _start_listener(self):
+        self._listener_thread = threading.Thread(target=self._listen, args=(self._queue,), daemon=True)
+        self._listener_thread.start()
+
+        Finalize(self, self._stop_listener, args=(self._queue, self._listener_thread), exitpriority=5)
+
+    def _listen(self, records: queue.Queue):
+        """Emit the queued records, and once every repeat interval end the windows of the rate limit that passed.
+
+        """
+
+        check_interval = self.repeat_interval if self.repeat_interval > 0 else DEFAULT_REPEAT_INTERVAL
+        next_check = monotonic() + check_interval
+
+        while True:
+            try:
+                record = records.get(timeout=max(next_check - monotonic(), 0))
+            except queue.Empty:
+                record = None
+
+            if record is _SENTINEL:
+                records.task_done()
+                return
+
+            if record is not None:
+                self._handle_record(record)
+                records.task_done()
+
+            if monotonic() >= next_check:
+                self._end_windows()
+                next_check = monotonic() + check_interval
+
+    def _handle_record(self, record):
+        for handler in self.handlers:
+            if record.levelno >= handler.level:
+                try:
+                    handler.handle(record)
+                except Exception:
+                    self.handleError(record)
+
+    def _end_windows(self):
+        """Queue the summaries of the rate limit windows that passed, and report the dropped records.
+
+        """
+
+        with self.lock:
+            now = monotonic()
+
+            for key, window in list(self._windows.items()):
+                if now - window.start >= self.repeat_interval:
+                    del self._windows[key]
+                    self._enqueue_summary(window)
+
+            if self.dropped > self._reported_dropped:
+                report = logging.makeLogRecord({"name": self.name or __name__, "levelno": logging.WARNING,
+                                                "levelname": logging.getLevelName(logging.WARNING),
+                                                "msg": f"Dropped {self.dropped - self._reported_dropped} log records, "
+                                                       f"the log queue was full"})
+
+                try:
+                    self._queue.put_nowait(report)
+                except queue.Full:
+                    return
+
+                self._reported_dropped = self.dropped
+
+    def _stop_listener(self, records: queue.Queue, listener_thread: threading.Thread):
+        """Summarize the suppressed repetitions and stop the listener once the queued records are emitted.
+
+        """
+
+        if listener_thread is None or not listener_thread.is_alive():
+            return
+
+        with self.lock:
+            for window in self._windows.values():
+                self._enqueue_summary(window)
+
+            self._windows.clear()
+
+        try:
+            records.put(_SENTINEL, timeout=STOP_TIMEOUT)
+        except queue.Full:
+            return
+
+        listener_thread.join(STOP_TIMEOUT)
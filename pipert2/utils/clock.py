@@ -0,0 +1,41 @@
+import sys
+import time
+import socket
+
+if sys.version_info.minor >= 7:
+    from time import perf_counter_ns, monotonic_ns
+else:
+    def perf_counter_ns() -> int:
+        """The `perf_counter` time in nanoseconds, `time.perf_counter_ns` exists only from python 3.7.
+
+        """
+
+        return int(time.perf_counter() * 1_000_000_000)
+
+    def monotonic_ns() -> int:
+        """The `monotonic` time in nanoseconds, `time.monotonic_ns` exists only from python 3.7.
+
+        """
+
+        return int(time.monotonic() * 1_000_000_000)
+
+BOOT_ID_PATH = "/proc/sys/kernel/random/boot_id"
+
+
+def _get_monotonic_clock_id() -> str:
+    """Identify the monotonic clock of this host, the processes of a host share it since its boot while the
+    monotonic times of different hosts are unrelated.
+
+    Returns:
+        The boot id where it is available, otherwise the host name.
+
+    """
+
+    try:
+        with open(BOOT_ID_PATH) as boot_id_file:
+            return boot_id_file.read().strip()
+    except OSError:
+        return socket.gethostname()
+
+
+MONOTONIC_CLOCK_ID = _get_monotonic_clock_id()
@@ -1,3 +1,10 @@
 START_EVENT_NAME = "start"
 STOP_EVENT_NAME = "stop"
 KILL_EVENT_NAME = "kill"
+LINK_EVENT_NAME = "link"
+UNLINK_EVENT_NAME = "unlink"
+UPDATE_PARAMS_EVENT_NAME = "update_params"
+LATENCY_EVENT_NAME = "latency"
+PROFILE_EVENT_NAME = "profile"
+SHARED_MEMORY_EVENT_NAME = "shared_memory"
+FLIGHT_RECORDER_EVENT_NAME = "flight_recorder"
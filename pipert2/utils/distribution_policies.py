@@ -0,0 +1,94 @@
+import zlib
+from abc import ABC, abstractmethod
+from typing import List, Sequence
+
+
+class DistributionPolicy(ABC):
+    """The distribution policy decides which of a wire's destinations receive each message.
+    Without a policy, every message is broadcast to all of the destinations.
+
+    """
+
+    @abstractmethod
+    def select(self, data: dict, outputs: Sequence) -> List[int]:
+        """Select the destinations of a message.
+
+        Args:
+            data: The data of the message.
+            outputs: The outputs leading to each destination, ordered like the wire's destinations. Each output has a
+                     `qsize` method returning the amount of messages waiting in it.
+
+        Returns:
+            The indices of the outputs to send the message to.
+
+        """
+
+        raise NotImplementedError
+
+
+class KeyPartition(DistributionPolicy):
+    """Send each message to exactly one destination, chosen by a stable hash of a key in its data.
+    The messages with the same key value always go to the same destination, on every process and host, so every
+    destination owns a shard of the keys. Messages without the key all go to the same destination.
+
+    """
+
+    def __init__(self, key: str):
+        """
+        Args:
+            key: The key in the message data to partition by.
+
+        """
+
+        self.key = key
+
+    def select(self, data: dict, outputs: Sequence) -> List[int]:
+        return [stable_hash(data.get(self.key)) % len(outputs)]
+
+
+class RoundRobin(DistributionPolicy):
+    """Send each message to exactly one destination, taking turns between the destinations.
+
+    """
+
+    def __init__(self):
+        self._next_output_index = 0
+
+    def select(self, data: dict, outputs: Sequence) -> List[int]:
+        output_index = self._next_output_index % len(outputs)
+        self._next_output_index = output_index + 1
+
+        return [output_index]
+
+
+class LeastQueueDepth(DistributionPolicy):
+    """Send each message to exactly one destination, the one with the least messages waiting for it.
+    Ties are broken in turns, so idle destinations share the load as well.
+
+    """
+
+    def __init__(self):
+        self._next_first_index = 0
+
+    def select(self, data: dict, outputs: Sequence) -> List[int]:
+        outputs_count = len(outputs)
+        first_index = self._next_first_index % outputs_count
+        self._next_first_index = first_index + 1
+
+        output_indices = [(first_index + offset) % outputs_count for offset in range(outputs_count)]
+
+        return [min(output_indices, key=lambda output_index: outputs[output_index].qsize())]
+
+
+def stable_hash(value) -> int:
+    """Hash a value consistently across processes and hosts, unlike the builtin `hash` of strings.
+
+    Args:
+        value: The value to hash, by its string representation.
+
+    Returns:
+        A non negative hash of the value.
+
+    """
+
+    return zlib.crc32(str(value).encode())
@@ -0,0 +1,44 @@
+from time import monotonic
+from concurrent.futures import Future
+from typing import Any, Dict, Iterable
+
+
+class EventRequest:
+    """A request event waiting for the replies of the flows it was sent to.
+    The replies are aggregated into the request's future, which is resolved once every flow replied or the timeout
+    passed, with the replies that arrived by then.
+
+    Attributes:
+        future: Resolves to the callbacks results, mapped by flow name and then by routine name.
+        pending_flows: The flows that didn't reply yet.
+        deadline: The monotonic time the request times out at.
+
+    """
+
+    def __init__(self, flows: Iterable[str], timeout: float):
+        self.future = Future()
+        self.pending_flows = set(flows)
+        self.deadline = monotonic() + timeout
+        self.replies: Dict[str, Dict[str, Any]] = {}
+
+        if not self.pending_flows:
+            self.complete()
+
+    def add_reply(self, flow_name: str, results: Dict[str, Any]):
+        """Add the reply of a flow, complete the request if it was the last one.
+
+        Args:
+            flow_name: The name of the replying flow.
+            results: The callbacks results of the flow's routines, mapped by routine name.
+
+        """
+
+        self.replies[flow_name] = results
+        self.pending_flows.discard(flow_name)
+
+        if not self.pending_flows:
+            self.complete()
+
+    def complete(self):
+        if not self.future.done():
+            self.future.set_result(self.replies)
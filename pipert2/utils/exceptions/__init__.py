@@ -2,3 +2,7 @@ from .floating_routine import FloatingRoutine
 from .queue_not_initialized import QueueNotInitialized
 from .wires_validation import WiresValidation
 from .unique_routine_name import UniqueRoutineName
+from .unknown_routine_address import UnknownRoutineAddress
+from .invalid_routine_parameter import InvalidRoutineParameter
+from .shared_memory_payload_too_large import SharedMemoryPayloadTooLarge
+from .pipe_not_built import PipeNotBuilt
@@ -0,0 +1,2 @@
+class InvalidRoutineParameter(Exception):
+    pass
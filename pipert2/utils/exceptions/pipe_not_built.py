@@ -0,0 +1,2 @@
+class PipeNotBuilt(Exception):
+    pass
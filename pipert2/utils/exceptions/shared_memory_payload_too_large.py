@@ -0,0 +1,2 @@
+class SharedMemoryPayloadTooLarge(Exception):
+    pass
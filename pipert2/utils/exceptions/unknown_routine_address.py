@@ -0,0 +1,2 @@
+class UnknownRoutineAddress(Exception):
+    pass
@@ -0,0 +1,145 @@
+import json
+import time
+import operator
+import itertools
+from typing import Callable, Dict, List, Mapping, Optional, Tuple
+from pipert2.utils.clock import monotonic_ns
+
+DEFAULT_FLIGHT_RECORDER_SIZE = 256
+
+OUTCOME_SENT = "sent"
+OUTCOME_FILTERED = "filtered"
+OUTCOME_RECEIVED = "received"
+OUTCOME_EXCEPTION = "exception"
+
+RECORD_FIELDS = ("sequence", "recorded_at", "id", "source", "history", "payload", "outcome", "error")
+
+
+def get_value_size(value) -> Optional[int]:
+    """Get the size of a payload value.
+
+    Returns:
+        The amount of bytes of buffers and arrays, the length of other sized values, None for the rest.
+
+    """
+
+    value_type = type(value)
+    get_size = _SIZE_GETTERS.get(value_type)
+
+    if get_size is None:
+        if hasattr(value_type, "nbytes"):
+            get_size = _get_nbytes
+        elif hasattr(value_type, "__len__"):
+            get_size = len
+        else:
+            get_size = _get_no_size
+
+        _SIZE_GETTERS[value_type] = get_size
+
+    return get_size(value)
+
+
+def _get_no_size(value) -> None:
+    return None
+
+
+_get_nbytes = operator.attrgetter("nbytes")
+# The function that gets the size of every type of value that was seen, to avoid checking the type again.
+_SIZE_GETTERS: Dict[type, Callable] = {}
+
+
+def summarize_payload(data) -> Dict[str, Optional[int]]:
+    """Get the sizes of the payload's values mapped by their keys, or by the payload's type if it isn't a mapping.
+
+    """
+
+    return dict(zip(*_get_payload_layout(data)))
+
+
+def _get_payload_layout(data) -> Tuple[tuple, list]:
+    """Get the keys of the payload and the sizes of their values, like `summarize_payload` without building a dict.
+
+    """
+
+    if type(data) is dict or isinstance(data, Mapping):
+        return tuple(data), [_SIZE_GETTERS.get(type(value), get_value_size)(value) for value in data.values()]
+
+    return (type(data).__name__,), [get_value_size(data)]
+
+
+class FlightRecorder:
+    """Keeps the summaries of the last messages a routine handled in a ring of a fixed size, to be dumped when something
+    goes wrong. A summary holds the message's id, source and history, the keys and sizes of its payload (not the
+    payload itself) and the outcome of handling it.
+
+    Recording replaces a single slot of the ring, so the ring can be dumped from another thread without locking. To
+    keep recording cheap it only copies the values, the summaries are built from them when the ring is read.
+
+    Attributes:
+        size: The amount of messages the ring holds.
+
+    """
+
+    def __init__(self, size: int = DEFAULT_FLIGHT_RECORDER_SIZE):
+        self.size = size
+        self._records = [None] * size
+        self._sequence = itertools.count()
+
+    def record(self, message, outcome: str, data=None, error: Exception = None):
+        """Record the outcome of handling a message.
+
+        Args:
+            message: The message, None if the routine failed before it had one.
+            outcome: One of the `OUTCOME_*` constants.
+            data: The data of the message as the routine returned it, the message's data if None. Needed once the
+                  message was sent, since sending may replace its data, for example with shared memory addresses.
+            error: The exception the routine raised, if any.
+
+        """
+
+        sequence = next(self._sequence)
+
+        if message is None:
+            summary = (sequence, monotonic_ns(), None, None, (), None, outcome, repr(error))
+        else:
+            # The history holds tuples that are replaced rather than changed, so copying its items copies the times.
+            summary = (sequence, monotonic_ns(), message.id, message.source_address, tuple(message.history.items()),
+                       _get_payload_layout(message.payload.data if data is None else data), outcome,
+                       None if error is None else repr(error))
+
+        self._records[sequence % self.size] = summary
+
+    def get_records(self) -> List[dict]:
+        """Get the recorded summaries, from the oldest to the newest.
+        The times are in monotonic nanoseconds, like the messages histories.
+
+        """
+
+        records = sorted((record for record in list(self._records) if record is not None), key=lambda record: record[0])
+        summaries = []
+
+        for record in records:
+            summary = dict(zip(RECORD_FIELDS, record))
+            summary["history"] = {routine_name: list(times) for routine_name, times in summary["history"]}
+
+            if summary["payload"] is not None:
+                summary["payload"] = {str(key): size for key, size in zip(*summary["payload"])}
+
+            summaries.append(summary)
+
+        return summaries
+
+    def dump(self, path: str, **details):
+        """Write the recorded summaries to a JSON file.
+
+        Args:
+            path: The path of the file.
+            details: Details to add to the file, like the routine's name.
+
+        Values that JSON doesn't support, like a custom message id, are written as strings.
+
+        """
+
+        with open(path, "w") as dump_file:
+            json.dump({**details, "dumped_at": time.time(), "dumped_at_monotonic_ns": monotonic_ns(),
+                       "records": self.get_records()}, dump_file, indent=4, default=str)
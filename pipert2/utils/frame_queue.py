@@ -0,0 +1,297 @@
+import threading
+import collections
+from time import monotonic
+from queue import Full, Empty
+from multiprocessing import Pipe, Lock, BoundedSemaphore, Value, Condition
+from multiprocessing.util import register_after_fork, Finalize
+from pipert2.utils.shared_counter import SharedCounter
+
+_SENTINEL = object()
+FEEDER_JOIN_TIMEOUT = 1
+
+
+class FrameQueue:
+    """A process safe queue that transfers frames which are already serialized (bytes).
+
+    Unlike `multiprocessing.Queue`, the frames are written to the pipe as is, without being pickled again.
+    That way a single encoded message can be published to many process safe queues while being serialized only once.
+    The frames are written to the pipe by a feeder thread, so putting a frame never waits for the reader.
+
+    Attributes:
+        maxsize: The maximum amount of frames the queue holds.
+        max_bytes: The maximum total size of the frames the queue holds, unlimited if None.
+            A single frame larger than the budget is still accepted into an empty queue.
+        reader: The reading end of the queue's pipe. Can be waited on with `multiprocessing.connection.wait`.
+        drops: Counts the frames that were dropped on their way into the queue, including the items that aren't
+            bytes-like, like a message that couldn't be pickled, since they can't be written to the pipe.
+
+    """
+
+    def __init__(self, maxsize=1, max_bytes=None):
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.reader, self._writer = Pipe(duplex=False)
+        self._read_lock = Lock()
+        self._write_lock = Lock()
+        self._sem = BoundedSemaphore(maxsize)
+        self._bytes = Value("Q", 0)
+        self._bytes_released = Condition(self._bytes.get_lock())
+        self.drops = SharedCounter()
+
+        self._reset()
+        register_after_fork(self, FrameQueue._reset)
+
+    def _reset(self):
+        """Reset the feeder state, the feeder thread doesn't survive a fork.
+
+        """
+
+        self._buffer = collections.deque()
+        self._not_empty = threading.Condition(threading.Lock())
+        self._feeder_thread = None
+
+    def put(self, frame: bytes, block=True, timeout=None):
+        """Put a frame into the queue.
+
+        Args:
+            frame: The serialized frame.
+            block: Whether to wait for a free slot if the queue is full.
+            timeout: How long to wait if block is true.
+
+        An item that isn't bytes-like is dropped and counted in `drops`.
+
+        Raises:
+            Full: If the queue is full.
+
+        """
+
+        try:
+            size = frame_size(frame)
+        except TypeError:
+            self.drops.increment()
+            return
+
+        deadline = None if timeout is None else monotonic() + timeout
+
+        if not self._sem.acquire(block, timeout):
+            raise Full
+
+        if not self._reserve_bytes(size, block, deadline):
+            self._sem.release()
+            raise Full
+
+        with self._not_empty:
+            if self._feeder_thread is None:
+                self._start_feeder()
+
+            self._buffer.append(frame)
+            self._not_empty.notify()
+
+    def put_nowait(self, frame: bytes):
+        self.put(frame, block=False)
+
+    def get(self, block=True, timeout=None) -> bytes:
+        """Get a frame from the queue.
+
+        Args:
+            block: Whether to wait for a frame to arrive.
+            timeout: How long to wait if block is true.
+
+        A non blocking get takes a frame that this process put and its feeder didn't write yet if the pipe is empty,
+        so the overflow policies can evict frames waiting in the feeder's buffer. Only a frame that the feeder is in the
+        middle of writing can't be evicted.
+
+        Returns:
+            The frame, exactly as it was put.
+
+        Raises:
+            Empty: If there was no frame in the queue.
+
+        """
+
+        if block and timeout is None:
+            with self._read_lock:
+                frame = self.reader.recv_bytes()
+        else:
+            if block:
+                deadline = monotonic() + timeout
+
+            if not self._read_lock.acquire(block, timeout):
+                raise Empty
+
+            try:
+                if block:
+                    timeout = deadline - monotonic()
+                    if not self.reader.poll(max(timeout, 0)):
+                        raise Empty
+
+                    frame = self.reader.recv_bytes()
+                elif self.reader.poll():
+                    frame = self.reader.recv_bytes()
+                else:
+                    frame = self._get_buffered()
+            finally:
+                self._read_lock.release()
+
+        with self._bytes_released:
+            self._bytes.value -= len(frame)
+
+            if self.max_bytes is not None:
+                self._bytes_released.notify_all()
+
+        self._sem.release()
+
+        return frame
+
+    def get_nowait(self) -> bytes:
+        return self.get(block=False)
+
+    def _get_buffered(self) -> bytes:
+        """Take the oldest frame this process put that wasn't written to the pipe yet.
+
+        Raises:
+            Empty: If there is no such frame.
+
+        """
+
+        with self._not_empty:
+            if not self._buffer or self._buffer[0] is _SENTINEL:
+                raise Empty
+
+            return self._buffer.popleft()
+
+    def qsize(self) -> int:
+        """Return the approximate amount of frames in the queue.
+
+        """
+
+        return self.maxsize - self._sem.get_value()
+
+    def qbytes(self) -> int:
+        """Return the total size of the frames in the queue.
+
+        """
+
+        return self._bytes.value
+
+    def empty(self) -> bool:
+        """Whether there are no frames in the queue, counting the frames that are still waiting in the feeders of the
+        writing processes to be written to the pipe.
+
+        """
+
+        return self.qsize() == 0
+
+    def full(self) -> bool:
+        return self.qsize() >= self.maxsize
+
+    def _reserve_bytes(self, size: int, block: bool, deadline) -> bool:
+        """Reserve room for a frame in the bytes budget of the queue.
+
+        Args:
+            size: The size of the frame.
+            block: Whether to wait for room in the budget.
+            deadline: Until when to wait if block is true, forever if None.
+
+        Returns:
+            True if the room was reserved, False otherwise.
+
+        """
+
+        with self._bytes_released:
+            if self.max_bytes is not None:
+                if not block:
+                    timeout = 0
+                elif deadline is None:
+                    timeout = None
+                else:
+                    timeout = max(deadline - monotonic(), 0)
+
+                has_room = self._bytes_released.wait_for(
+                    lambda: self._bytes.value == 0 or self._bytes.value + size <= self.max_bytes, timeout)
+
+                if not has_room:
+                    return False
+
+            self._bytes.value += size
+
+        return True
+
+    def _start_feeder(self):
+        """Start the thread that writes the buffered frames into the pipe.
+
+        """
+
+        self._feeder_thread = threading.Thread(target=FrameQueue._feed,
+                                               args=(self._buffer, self._not_empty, self._writer, self._write_lock),
+                                               daemon=True)
+        self._feeder_thread.start()
+
+        Finalize(self, FrameQueue._finalize_feeder,
+                 args=(self._buffer, self._not_empty, self._feeder_thread, self._sem, self._bytes_released, self._bytes),
+                 exitpriority=10)
+
+    @staticmethod
+    def _feed(buffer, not_empty, writer, write_lock):
+        """Write the buffered frames into the pipe until the sentinel is reached.
+
+        """
+
+        while True:
+            with not_empty:
+                while not buffer:
+                    not_empty.wait()
+                frame = buffer.popleft()
+
+            if frame is _SENTINEL:
+                return
+
+            with write_lock:
+                writer.send_bytes(frame)
+
+    @staticmethod
+    def _finalize_feeder(buffer, not_empty, feeder_thread, sem, bytes_released, queue_bytes):
+        """Flush the remaining frames and stop the feeder thread.
+        The flush is given up after `FEEDER_JOIN_TIMEOUT` seconds, since a reader that already exited would otherwise
+        keep the process from exiting. The frames that were given up are taken out of the queue's count, so a reader
+        doesn't wait for them, only the frame the feeder is in the middle of writing may still arrive.
+
+        """
+
+        with not_empty:
+            buffer.append(_SENTINEL)
+            not_empty.notify()
+
+        feeder_thread.join(FEEDER_JOIN_TIMEOUT)
+
+        if not feeder_thread.is_alive():
+            return
+
+        with not_empty:
+            abandoned_frames = [frame for frame in buffer if frame is not _SENTINEL]
+            buffer.clear()
+            buffer.append(_SENTINEL)
+
+        with bytes_released:
+            queue_bytes.value -= sum(len(frame) for frame in abandoned_frames)
+            bytes_released.notify_all()
+
+        for _ in abandoned_frames:
+            sem.release()
+
+
+def frame_size(frame) -> int:
+    """Get the size in bytes of a frame.
+
+    Args:
+        frame: A bytes-like object.
+
+    Returns:
+        The amount of bytes in the frame.
+
+    Raises:
+        TypeError: If the frame is not a bytes-like object.
+
+    """
+
+    return memoryview(frame).nbytes
@@ -0,0 +1,122 @@
+from typing import Dict, Iterable, Sequence
+
+SUB_BUCKETS_BITS = 2
+SUB_BUCKETS = 1 << SUB_BUCKETS_BITS
+MAX_VALUE_BITS = 40
+HISTOGRAM_SIZE = (MAX_VALUE_BITS - SUB_BUCKETS_BITS + 1) * SUB_BUCKETS
+DEFAULT_PERCENTILES = (50, 90, 99)
+LATENCY_PERCENTILES = (50, 99, 99.9)
+NS_IN_SECOND = 1e9
+
+
+def histogram_index(value: int) -> int:
+    """Get the bucket of a non negative integer in a log-linear histogram.
+    Every power of two is split into `SUB_BUCKETS` equal buckets, so a bucket's width is at most a quarter of its
+    values. Values of `2 ** MAX_VALUE_BITS` and above share the last bucket.
+
+    Args:
+        value: The value to count, usually a duration in nanoseconds.
+
+    Returns:
+        The index of the value's bucket.
+
+    """
+
+    bits = value.bit_length()
+
+    if bits <= SUB_BUCKETS_BITS:
+        return value
+
+    if bits > MAX_VALUE_BITS:
+        return HISTOGRAM_SIZE - 1
+
+    shift = bits - SUB_BUCKETS_BITS - 1
+
+    return ((shift + 1) << SUB_BUCKETS_BITS) | ((value >> shift) & (SUB_BUCKETS - 1))
+
+
+def histogram_upper_bound(index: int) -> int:
+    """Get the largest value counted in a bucket.
+
+    """
+
+    if index < SUB_BUCKETS:
+        return index
+
+    shift = (index >> SUB_BUCKETS_BITS) - 1
+    lower_bound = (SUB_BUCKETS | (index & (SUB_BUCKETS - 1))) << shift
+
+    return lower_bound + (1 << shift) - 1
+
+
+def histogram_percentiles(buckets: Sequence[int],
+                          percentiles: Iterable[float] = DEFAULT_PERCENTILES) -> Dict[float, int]:
+    """Estimate percentiles of the counted values by the upper bounds of their buckets.
+
+    Args:
+        buckets: The counts of the histogram's buckets.
+        percentiles: The percentiles to estimate, between 0 and 100.
+
+    Returns:
+        The estimated value of each percentile, 0 for all of them if nothing was counted.
+
+    """
+
+    total = sum(buckets)
+    results = {}
+
+    for percentile in sorted(percentiles):
+        threshold = total * percentile / 100
+        counted = 0
+        results[percentile] = 0
+
+        for index, count in enumerate(buckets):
+            counted += count
+
+            if count and counted >= threshold:
+                results[percentile] = histogram_upper_bound(index)
+                break
+
+    return results
+
+
+class Histogram:
+    """A log-linear histogram of durations in nanoseconds, along with their count, total and maximum.
+    Recording a duration costs a few list operations, and the memory is fixed no matter how many are recorded.
+
+    """
+
+    def __init__(self):
+        self.buckets = [0] * HISTOGRAM_SIZE
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def record(self, value: int):
+        """Count a duration, negative durations are counted as 0.
+
+        Args:
+            value: The duration in nanoseconds.
+
+        """
+
+        value = max(value, 0)
+        self.buckets[histogram_index(value)] += 1
+        self.count += 1
+        self.total += value
+
+        if value > self.max:
+            self.max = value
+
+    def get_stats(self, percentiles: Iterable[float] = LATENCY_PERCENTILES) -> dict:
+        """Get the count of the durations and their mean, maximum and percentiles in seconds.
+
+        """
+
+        return {
+            "count": self.count,
+            "mean": self.total / self.count / NS_IN_SECOND if self.count else 0.0,
+            "max": self.max / NS_IN_SECOND,
+            **{f"p{percentile:g}": min(value, self.max) / NS_IN_SECOND
+               for percentile, value in histogram_percentiles(self.buckets, percentiles).items()}
+        }
@@ -0,0 +1,81 @@
+from typing import List
+from abc import ABC, abstractmethod
+
+
+class InputScheduler(ABC):
+    """The input scheduler decides from which of the routine's inputs the next message is taken.
+    Each input is a `QueueInput` that has a name, a queue and a weight given by the wire that created it.
+
+    """
+
+    @abstractmethod
+    def order(self, inputs: List) -> List:
+        """Return the inputs in the order they should be checked for a message.
+
+        Args:
+            inputs: The routine's inputs.
+
+        Returns:
+            The inputs ordered by their turn.
+
+        """
+
+        raise NotImplementedError
+
+    def served(self, queue_input) -> None:
+        """Notify the scheduler a message was taken from the given input.
+
+        Args:
+            queue_input: The input that the message was taken from.
+
+        """
+
+        pass
+
+
+class RoundRobinScheduler(InputScheduler):
+    """Take the messages from the inputs in turns, ignoring their weights.
+
+    """
+
+    def __init__(self):
+        self._last_served_input = None
+
+    def order(self, inputs: List) -> List:
+        if self._last_served_input in inputs:
+            start_index = inputs.index(self._last_served_input) + 1
+        else:
+            start_index = 0
+
+        return inputs[start_index:] + inputs[:start_index]
+
+    def served(self, queue_input) -> None:
+        self._last_served_input = queue_input
+
+
+class WeightedFairScheduler(InputScheduler):
+    """Take the messages from the inputs proportionally to their weights, using stride scheduling.
+    An input that was empty for a while doesn't accumulate credit, so it can't starve the others once it fills up.
+
+    """
+
+    def __init__(self):
+        self._passes = {}
+        self._virtual_time = 0.0
+
+    def order(self, inputs: List) -> List:
+        return sorted(inputs, key=lambda queue_input: max(self._passes.get(queue_input, 0.0), self._virtual_time))
+
+    def served(self, queue_input) -> None:
+        start_time = max(self._passes.get(queue_input, 0.0), self._virtual_time)
+        self._virtual_time = start_time
+        self._passes[queue_input] = start_time + 1.0 / queue_input.weight
+
+
+class PriorityScheduler(InputScheduler):
+    """Always take the message from the input with the highest weight that has one.
+
+    """
+
+    def order(self, inputs: List) -> List:
+        return sorted(inputs, key=lambda queue_input: -queue_input.weight)
@@ -1,3 +1,4 @@
+from typing import Any
 from abc import ABC, abstractmethod
 from pipert2.utils.method_data import Method
 
@@ -5,13 +6,30 @@ from pipert2.utils.method_data import Method
 class EventExecutorInterface(ABC):  # TODO - Maybe add a logger abstract class for each class with logger.
 
     @abstractmethod
-    def execute_event(self, event: Method) -> None:
+    def execute_event(self, event: Method) -> Any:
+        """Execute the callbacks of the event.
+
+        Args:
+            event: The event to execute.
+
+        Returns:
+            The return value of the event's callback if it has a single one, the return values of all of its callbacks
+            mapped by their names if it has several, and None if it has none.
+
+        """
+
         mapped_events = self.get_events()
+        results = []
 
         if event.event_name in mapped_events:
             self._logger.plog(f"Running event '{event.event_name}'")
             for callback in mapped_events[event.event_name]:
-                callback(self, **event.params)
+                results.append((callback, callback(self, **event.params)))
+
+        if len(results) == 1:
+            return results[0][1]
+
+        return {callback.__name__: result for callback, result in results} or None
 
     @classmethod
     @abstractmethod
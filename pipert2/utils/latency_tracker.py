@@ -0,0 +1,98 @@
+from typing import Collection, Dict, Tuple
+from pipert2.utils.histogram import Histogram
+
+PATH_SEPARATOR = " -> "
+
+
+class HopLatency:
+    """The latency of a single routine along the messages paths.
+
+    Attributes:
+        queue_wait: The time from the exit of the previous routine until the message entered the routine.
+        service_time: The time from the entry of the message into the routine until its exit.
+
+    """
+
+    def __init__(self):
+        self.queue_wait = Histogram()
+        self.service_time = Histogram()
+
+    def get_stats(self) -> dict:
+        return {"queue_wait": self.queue_wait.get_stats(), "service_time": self.service_time.get_stats()}
+
+
+class LatencyTracker:
+    """Aggregates the histories of the messages that arrive at a destination routine into latency histograms, for
+    every path the messages took and for every routine (hop) along them.
+    A stage with a long service time is slow, while a stage with a long queue wait is starved by the stage after it.
+    The timestamps are compared across the processes of a host, the monotonic clocks of different hosts are unrelated
+    so the queue wait of a routine the message entered from another host isn't recorded, nor is the latency of its path.
+
+    Attributes:
+        paths: The end to end latency of the messages, mapped by the routines they passed through.
+        hops: The queue wait and service time of every routine.
+        cross_host_messages: The messages that passed between hosts, which have no end to end latency.
+
+    """
+
+    def __init__(self):
+        self.paths: Dict[Tuple[str, ...], Histogram] = {}
+        self.hops: Dict[str, HopLatency] = {}
+        self.cross_host_messages = 0
+
+    def record(self, history: dict, cross_host_routines: Collection[str] = ()):
+        """Count the latencies of a message that reached its destination.
+
+        Args:
+            history: The entry and exit times of the message in nanoseconds, mapped by the routines in order.
+            cross_host_routines: The routines the message entered from another host.
+
+        """
+
+        first_time = None
+        previous_exit = None
+
+        for routine_name, (entry_time, exit_time) in history.items():
+            hop = self.hops.get(routine_name)
+
+            if hop is None:
+                hop = self.hops[routine_name] = HopLatency()
+
+            if entry_time is not None:
+                if previous_exit is not None and routine_name not in cross_host_routines:
+                    hop.queue_wait.record(entry_time - previous_exit)
+
+                if exit_time is not None:
+                    hop.service_time.record(exit_time - entry_time)
+
+            if first_time is None:
+                first_time = entry_time if entry_time is not None else exit_time
+
+            previous_exit = exit_time
+
+        if cross_host_routines:
+            self.cross_host_messages += 1
+        elif first_time is not None and previous_exit is not None:
+            path = tuple(history)
+            path_latency = self.paths.get(path)
+
+            if path_latency is None:
+                path_latency = self.paths[path] = Histogram()
+
+            path_latency.record(previous_exit - first_time)
+
+    def get_stats(self) -> dict:
+        """Get the latency statistics in seconds, with the p50, p99 and p99.9 percentiles.
+        Safe to call from another thread while messages are recorded.
+
+        Returns:
+            The end to end latency of each path, keyed by the routines names joined by arrows, the queue wait and
+            service time of each routine and the amount of messages that passed between hosts.
+
+        """
+
+        return {
+            "paths": {PATH_SEPARATOR.join(path): histogram.get_stats() for path, histogram in dict(self.paths).items()},
+            "hops": {routine_name: hop.get_stats() for routine_name, hop in dict(self.hops).items()},
+            "cross_host_messages": self.cross_host_messages
+        }
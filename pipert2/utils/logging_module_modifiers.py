@@ -1,5 +1,6 @@
 import logging
 import sys
+from pipert2.utils.async_log_handler import AsyncLogHandler
 
 PIPE_INFRASTRUCTURE_LOG_LEVEL = 5
 PIPE_INFRASTRUCTURE_LOG_LEVEL_NAME = "PIPE_INFRASTRUCTURE"
@@ -31,10 +32,15 @@ def add_pipe_log_level():
 
 
 def get_default_print_logger(logger_name):
+    """Get a logger that prints to stdout from a background thread, so printing never blocks the routines.
+    Identical messages repeated within a second are printed once, followed by the amount of suppressed repetitions.
+
+    """
+
     logger = logging.getLogger(logger_name)
     console_handler = (logging.StreamHandler(sys.stdout))
     console_handler.setFormatter(logging.Formatter("%(asctime)s — %(name)s — %(levelname)s — %(message)s",
                                                    datefmt="%d-%m-%y %H:%M:%S"))
-    logger.addHandler(console_handler)
+    logger.addHandler(AsyncLogHandler(console_handler))
     logger.setLevel(logging.INFO)
     return logger
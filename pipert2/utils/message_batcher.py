@@ -0,0 +1,97 @@
+import threading
+from time import monotonic
+from logging import Logger
+from typing import Callable, List
+from multiprocessing.util import register_after_fork
+from pipert2.utils.dummy_object import Dummy
+
+
+class MessageBatcher:
+    """Collects messages into batches, so many small messages can be sent as a single frame.
+    A batch is flushed once it has `max_size` messages, or once its first message waited `max_delay` seconds.
+    The delay is enforced by a timer thread that starts with the first message, in the process that sends them.
+
+    Attributes:
+        flush_batch: Called with every batch that is flushed, in the order of the batches.
+        max_size: The maximum amount of messages in a batch.
+        max_delay: The maximum time in seconds a message waits in a batch.
+        get_logger: Gets the logger of the batches that the timer thread failed to flush, when one fails.
+
+    """
+
+    def __init__(self, flush_batch: Callable[[List], None], max_size: int, max_delay: float,
+                 get_logger: Callable[[], Logger] = None):
+        self.flush_batch = flush_batch
+        self.max_size = max_size
+        self.max_delay = max_delay
+        self.get_logger = get_logger if get_logger is not None else Dummy
+        self._reset()
+        register_after_fork(self, MessageBatcher._reset)
+
+    def _reset(self):
+        self._batch = []
+        self._batch_deadline = None
+        self._batch_changed = threading.Condition(threading.Lock())
+        self._timer_thread = None
+
+    def add(self, message):
+        """Add a message to the current batch, flush the batch if it is full.
+
+        Args:
+            message: The message to add.
+
+        """
+
+        with self._batch_changed:
+            if self._timer_thread is None:
+                self._start_timer()
+
+            self._batch.append(message)
+
+            if len(self._batch) >= self.max_size:
+                self._flush()
+            elif len(self._batch) == 1:
+                self._batch_deadline = monotonic() + self.max_delay
+                self._batch_changed.notify()
+
+    def flush(self):
+        """Flush the current batch, if it has any message.
+
+        """
+
+        with self._batch_changed:
+            if self._batch:
+                self._flush()
+
+    def _flush(self):
+        """Hand the current batch to the flush callback, while holding the lock to keep the batches in order.
+
+        """
+
+        batch, self._batch = self._batch, []
+        self.flush_batch(batch)
+
+    def _start_timer(self):
+        self._timer_thread = threading.Thread(target=self._run_timer, daemon=True)
+        self._timer_thread.start()
+
+    def _run_timer(self):
+        """Flush every batch that reaches its deadline before it fills up.
+        A batch that fails to flush is logged and dropped, so the following batches are still flushed in time.
+
+        """
+
+        with self._batch_changed:
+            while True:
+                while not self._batch:
+                    self._batch_changed.wait()
+
+                remaining = self._batch_deadline - monotonic()
+
+                if remaining > 0:
+                    self._batch_changed.wait(remaining)
+                else:
+                    try:
+                        self._flush()
+                    except Exception:
+                        self.get_logger().exception("Failed to flush a batch of messages, the batch was dropped")
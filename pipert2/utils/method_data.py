@@ -14,6 +14,7 @@ class Method:
     event_name: str
     specific_flow_routines: Dict[str, Optional[list]] = field(default_factory=lambda: defaultdict(list))
     params: dict = field(default_factory=lambda: {})
+    request_id: Optional[int] = None
 
     def is_applied_on_flow(self, flow_name_to_validate: str):
         """Check if current method apply on the given flow.
@@ -0,0 +1,151 @@
+from threading import Thread
+from typing import Callable, Dict, List
+from socketserver import ThreadingMixIn
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+METRICS_PATH = "/metrics"
+METRIC_PREFIX = "pipert_routine_"
+
+# The routine metrics exported as counters and gauges, by their key in the routine's metrics.
+COUNTERS = {
+    "messages_in": "Messages the routine received.",
+    "messages_out": "Messages the routine sent.",
+    "exceptions": "Runs of the routine's main logic that raised an exception.",
+    "drops": "Messages dropped on their way to the routine."
+}
+GAUGES = {
+    "queue_depth": "Messages waiting for the routine when last sampled.",
+    "max_queue_depth": "The deepest the routine's input queue was sampled."
+}
+SERVICE_TIME_HELP = "The time the routine's main logic takes."
+SERVICE_TIME_QUANTILES = {"p50": "0.5", "p90": "0.9", "p99": "0.99"}
+
+
+def format_prometheus(metrics: Dict[str, Dict[str, dict]]) -> str:
+    """Format the metrics of the routines in the Prometheus text exposition format.
+
+    Args:
+        metrics: The metrics of each routine mapped by flow name and then by routine name, as returned by
+                 `Pipe.get_metrics`.
+
+    Returns:
+        The metrics, labeled by their flow and routine.
+
+    """
+
+    routines = [(_format_labels(flow=flow_name, routine=routine_name), routine_metrics)
+                for flow_name, flow_metrics in metrics.items()
+                for routine_name, routine_metrics in flow_metrics.items()]
+    lines = []
+
+    for key, help_text in COUNTERS.items():
+        _add_metric_header(lines, f"{key}_total", "counter", help_text)
+        lines.extend(f"{METRIC_PREFIX}{key}_total{{{labels}}} {routine_metrics[key]}"
+                     for labels, routine_metrics in routines)
+
+    for key, help_text in GAUGES.items():
+        _add_metric_header(lines, key, "gauge", help_text)
+        lines.extend(f"{METRIC_PREFIX}{key}{{{labels}}} {routine_metrics[key]}" for labels, routine_metrics in routines)
+
+    name = f"{METRIC_PREFIX}service_time_seconds"
+    _add_metric_header(lines, "service_time_seconds", "summary", SERVICE_TIME_HELP)
+
+    for labels, routine_metrics in routines:
+        service_time = routine_metrics["service_time"]
+
+        for key, quantile in SERVICE_TIME_QUANTILES.items():
+            lines.append(f'{name}{{{labels},quantile="{quantile}"}} {service_time[key]!r}')
+
+        lines.append(f"{name}_sum{{{labels}}} {service_time['mean'] * service_time['count']!r}")
+        lines.append(f"{name}_count{{{labels}}} {service_time['count']}")
+
+    return "\n".join(lines) + "\n"
+
+
+def _add_metric_header(lines: List[str], name: str, metric_type: str, help_text: str):
+    lines.append(f"# HELP {METRIC_PREFIX}{name} {help_text}")
+    lines.append(f"# TYPE {METRIC_PREFIX}{name} {metric_type}")
+
+
+def _format_labels(**labels) -> str:
+    return ",".join(f'{name}="{_escape_label_value(str(value))}"' for name, value in labels.items())
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+class _ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    """An HTTP server handling every request in a thread of its own, `http.server.ThreadingHTTPServer` exists only
+    from python 3.7.
+
+    """
+
+    daemon_threads = True
+
+
+class MetricsServer:
+    """Serves the metrics of the pipe's routines over HTTP in the Prometheus text format, on a background thread.
+    The routines publish their metrics into shared memory by themselves, so a scrape only reads the latest snapshot
+    and adds no work to the routines.
+
+    Attributes:
+        address: The host and port the server listens on.
+
+    """
+
+    def __init__(self, get_metrics: Callable[[], Dict[str, Dict[str, dict]]], host: str = "127.0.0.1",
+                 port: int = 0):
+        """
+        Args:
+            get_metrics: Returns the metrics of the routines, like `Pipe.get_metrics`.
+            host: The host to listen on.
+            port: The port to listen on, a free port is chosen if 0.
+
+        """
+
+        self._server = _ThreadingHTTPServer((host, port), _create_request_handler(get_metrics))
+        self.address = self._server.server_address[:2]
+        self._thread = None
+
+    def start(self):
+        self._thread = Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+
+        self._server.server_close()
+
+
+def _create_request_handler(get_metrics: Callable[[], Dict[str, Dict[str, dict]]]):
+    """Create a request handler class that serves the given metrics.
+
+    """
+
+    class MetricsRequestHandler(BaseHTTPRequestHandler):
+
+        def do_GET(self):
+            if self.path.split("?")[0] != METRICS_PATH:
+                self.send_error(404)
+                return
+
+            try:
+                body = format_prometheus(get_metrics()).encode()
+            except Exception as error:
+                self.send_error(500, explain=str(error))
+                return
+
+            self.send_response(200)
+            self.send_header("Content-Type", PROMETHEUS_CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return MetricsRequestHandler
@@ -0,0 +1,82 @@
+from collections.abc import Mapping
+from typing import Callable, List, Optional, Sequence
+from pipert2.utils.distribution_policies import DistributionPolicy
+
+NO_DATA = object()
+
+
+class OutputRoute:
+    """The outputs of a routine that belong to a single wire, and which of the routine's messages go through them.
+
+    Attributes:
+        output_indices: The indices of the wire's outputs among all of the routine's outputs.
+        port: The named output port of the wire. If set, only the data the routine emits under this key in its
+              returned dict goes through the wire.
+        predicate: A function of the data that tells whether a message goes through the wire, all do if None.
+        distribution_policy: Which of the wire's outputs receive each message, all of them if None.
+        enabled: Whether the wire is linked, nothing goes through an unlinked wire.
+
+    """
+
+    def __init__(self, output_indices: List[int], port: str = None, predicate: Callable[[dict], bool] = None,
+                 distribution_policy: DistributionPolicy = None, enabled: bool = True):
+        self.output_indices = output_indices
+        self.port = port
+        self.predicate = predicate
+        self.distribution_policy = distribution_policy
+        self.enabled = enabled
+
+    def get_data(self, data):
+        """Get the data that goes through the wire out of the data the routine emitted.
+
+        Args:
+            data: The data the routine emitted.
+
+        Returns:
+            The data for the wire, or `NO_DATA` if nothing goes through it.
+
+        """
+
+        if not self.enabled:
+            return NO_DATA
+
+        if self.port is not None:
+            if not isinstance(data, Mapping) or self.port not in data:
+                return NO_DATA
+
+            data = data[self.port]
+
+        if self.predicate is not None and not self.predicate(data):
+            return NO_DATA
+
+        return data
+
+    def select(self, data, get_outputs: Callable[[], Sequence]) -> List[int]:
+        """Select the outputs of the wire that receive the data.
+
+        Args:
+            data: The data that goes through the wire.
+            get_outputs: Returns all of the routine's outputs, called only if there is a distribution policy.
+
+        Returns:
+            The indices of the selected outputs among all of the routine's outputs.
+
+        """
+
+        if self.distribution_policy is None:
+            return self.output_indices
+
+        outputs = get_outputs()
+        route_outputs = [outputs[output_index] for output_index in self.output_indices]
+
+        return [self.output_indices[route_output_index]
+                for route_output_index in self.distribution_policy.select(data, route_outputs)]
+
+    def is_conditional(self) -> bool:
+        """Whether the route doesn't simply pass every message to all of its outputs.
+
+        """
+
+        return self.port is not None or self.predicate is not None or self.distribution_policy is not None or \
+            not self.enabled
+
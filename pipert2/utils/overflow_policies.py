@@ -0,0 +1,152 @@
+from collections import defaultdict
+from abc import ABC, abstractmethod
+from queue import Full, Empty, Queue
+
+
+class OverflowPolicy(ABC):
+    """The overflow policy decides what happens when a message is pushed into a full queue.
+    Every message the policy throws away is counted in the queue's drop counter.
+
+    """
+
+    @abstractmethod
+    def push(self, queue: Queue, value) -> None:
+        """Push a value into the queue according to the policy.
+
+        Args:
+            queue: The queue to push the value into.
+            value: The given message to push.
+
+        """
+
+        raise NotImplementedError
+
+
+class DropOldest(OverflowPolicy):
+    """Make room for the new message by dropping the oldest message in the queue.
+
+    """
+
+    def push(self, queue: Queue, value) -> None:
+        force_push_to_queue(queue, value)
+
+
+class DropNewest(OverflowPolicy):
+    """Drop the new message if the queue is full.
+
+    """
+
+    def push(self, queue: Queue, value) -> None:
+        try:
+            queue.put(value, block=False)
+        except Full:
+            record_drop(queue)
+
+
+class BlockWithTimeout(OverflowPolicy):
+    """Wait for the queue to have room for the new message, drop the new message if the timeout passes.
+
+    """
+
+    def __init__(self, timeout: float = 1):
+        """
+        Args:
+            timeout: How long to wait in seconds for the queue to have room.
+
+        """
+
+        self.timeout = timeout
+
+    def push(self, queue: Queue, value) -> None:
+        try:
+            queue.put(value, block=True, timeout=self.timeout)
+        except Full:
+            record_drop(queue)
+
+
+class KeepLatest(OverflowPolicy):
+    """Keep only the latest message in the queue, every message that wasn't read yet is dropped.
+
+    """
+
+    def push(self, queue: Queue, value) -> None:
+        while True:
+            try:
+                queue.get(block=False)
+            except Empty:
+                break
+            else:
+                record_drop(queue)
+
+        force_push_to_queue(queue, value)
+
+
+class SampleEveryNth(OverflowPolicy):
+    """Pass only every n-th message to the queue, the other messages are counted as dropped.
+
+    """
+
+    def __init__(self, n: int, overflow_policy: OverflowPolicy = None):
+        """
+        Args:
+            n: Pass one message out of every n messages.
+            overflow_policy: The policy for pushing the sampled messages, drop oldest if None.
+
+        Raises:
+            ValueError: If n is smaller than 1.
+
+        """
+
+        if n < 1:
+            raise ValueError(f"n must be at least 1, got {n}")
+
+        self.n = n
+        self.overflow_policy = overflow_policy if overflow_policy is not None else DropOldest()
+        self._messages_counts = defaultdict(int)
+
+    def push(self, queue: Queue, value) -> None:
+        message_index = self._messages_counts[queue]
+        self._messages_counts[queue] = message_index + 1
+
+        if message_index % self.n == 0:
+            self.overflow_policy.push(queue, value)
+        else:
+            record_drop(queue)
+
+
+def force_push_to_queue(queue: Queue, value):
+    """Forcibly push a message into the queue.
+
+    Args:
+        queue: The queue to push the value into.
+        value: The given message to push.
+
+    """
+
+    try:
+        queue.put(value, block=False)
+    except Full:
+        try:
+            queue.get(block=False)
+        except Empty:
+            pass
+        else:
+            record_drop(queue)
+        try:
+            queue.put(value, block=False)
+        except Full:
+            record_drop(queue)
+
+
+def record_drop(queue: Queue):
+    """Count a dropped message on the queue, if the queue counts its drops.
+
+    Args:
+        queue: The queue the message was dropped from or was meant for.
+
+    """
+
+    drops = getattr(queue, "drops", None)
+
+    if drops is not None:
+        drops.increment()
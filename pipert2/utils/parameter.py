@@ -0,0 +1,71 @@
+from typing import Any, Callable
+from pipert2.utils.exceptions import InvalidRoutineParameter
+
+
+class Parameter:
+    """A typed routine parameter that can be changed while the pipe runs, using the 'update_params' event.
+    Declared as a class attribute of the routine, and read in the routine as a regular attribute.
+
+    Example usage:
+        .. code-block:: python
+            class Detector(MiddleRoutine):
+                threshold = Parameter(float, 0.5, validator=lambda value: 0 <= value <= 1)
+
+                def main_logic(self, data):
+                    return {"detections": detect(data, self.threshold)}
+
+            pipe.notify_event(UPDATE_PARAMS_EVENT_NAME, {"flow": ["Detector"]}, threshold=0.7)
+
+    """
+
+    def __init__(self, param_type: type, default=None, validator: Callable[[Any], bool] = None):
+        """
+        Args:
+            param_type: The type of the parameter's values. An int is accepted for a float parameter.
+            default: The value of the parameter until it is set.
+            validator: Returns whether a value of the right type is valid, every value is valid if None.
+
+        """
+
+        self.param_type = param_type
+        self.default = default
+        self.validator = validator
+        self.name = None
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+
+        return instance.__dict__.get(self.name, self.default)
+
+    def __set__(self, instance, value):
+        instance.__dict__[self.name] = self.validate(value)
+
+    def validate(self, value):
+        """Check that a value fits the parameter.
+
+        Args:
+            value: The value to check.
+
+        Returns:
+            The value, converted to a float if it is an int given to a float parameter.
+
+        Raises:
+            InvalidRoutineParameter: If the value is of the wrong type or the validator rejects it.
+
+        """
+
+        if self.param_type is float and isinstance(value, int) and not isinstance(value, bool):
+            value = float(value)
+
+        if not isinstance(value, self.param_type) or (self.param_type is int and isinstance(value, bool)):
+            raise InvalidRoutineParameter(f"The parameter '{self.name}' expects {self.param_type.__name__}, "
+                                          f"got {type(value).__name__}")
+
+        if self.validator is not None and not self.validator(value):
+            raise InvalidRoutineParameter(f"The value {value!r} is invalid for the parameter '{self.name}'")
+
+        return value
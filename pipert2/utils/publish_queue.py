@@ -1,23 +1,33 @@
-from queue import Full, Empty, Queue
+from queue import Full, Queue
+from pipert2.utils.overflow_policies import OverflowPolicy, force_push_to_queue, record_drop
 
 
 class PublishQueue(object):
     """A class that wraps multiprocessing queue to make it possible to publish a single object to multiple queues.
+    The same value object is handed to every registered queue, process safe queues (`FrameQueue`) write it to their
+    pipes as is, so an encoded message is serialized only once no matter how many destinations it has.
 
     """
 
     def __init__(self):
         self._queues = []
+        self._overflow_policies = []
 
-    def register(self, queue: Queue):
+    def register(self, queue: Queue, overflow_policy: OverflowPolicy = None):
         """Register a new queue to publish to.
 
+        Args:
+            queue: The queue to publish to.
+            overflow_policy: What to do when the queue is full, decided by the put arguments if None.
+
         """
 
         self._queues.append(queue)
+        self._overflow_policies.append(overflow_policy)
 
     def put(self, value, block=False, timeout=1):
         """Publish a value to every registered queue.
+        Queues registered with an overflow policy are pushed to by their policy and never raise.
 
         Args:
             value: The value to push to every registered queue.
@@ -26,33 +36,37 @@ class PublishQueue(object):
 
         """
 
-        for q in self._queues:
-            if not block:
-                force_push_to_queue(q, value)
-            else:
-                try:
-                    q.put(value, block, timeout)
-                except Full as e:
-                    raise e
+        for index in range(len(self._queues)):
+            self.put_to(index, value, block=block, timeout=timeout)
 
+    def put_to(self, index: int, value, block=False, timeout=1):
+        """Publish a value to a single registered queue.
 
-def force_push_to_queue(queue: Queue, value):
-    """Forcibly push a message into the queue.
+        Args:
+            index: The index of the queue, by the order of registration.
+            value: The value to push to the queue.
+            block: Whether or not to block the queue when putting a message.
+            timeout: How long to wait for the queue if block is true.
 
-    Args:
-        queue: The queue to push the value into.
-        value: The given message to push.
+        """
 
-    """
+        q = self._queues[index]
+        overflow_policy = self._overflow_policies[index]
+
+        if overflow_policy is not None:
+            overflow_policy.push(q, value)
+        elif not block:
+            force_push_to_queue(q, value)
+        else:
+            try:
+                q.put(value, block, timeout)
+            except Full as e:
+                record_drop(q)
+                raise e
+
+    def get_queues(self) -> list:
+        """Get the registered queues, by the order of registration.
+
+        """
 
-    try:
-        queue.put(value, block=False)
-    except Full:
-        try:
-            queue.get(block=False)
-        except Empty:
-            pass
-        try:
-            queue.put(value, block=False)
-        except Full:
-            pass
+        return self._queues
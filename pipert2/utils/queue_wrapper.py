@@ -1,29 +1,153 @@
-from threading import Thread
-from multiprocessing import Queue as mpQueue
-from queue import Queue as thQueue, Full, Empty
+import os
+from time import monotonic
+from typing import Dict, Optional
+from queue import Queue as thQueue, Empty, Full
+from multiprocessing.connection import wait
+from multiprocessing.util import Finalize
+from pipert2.utils.frame_queue import FrameQueue, frame_size
+from pipert2.utils.shared_counter import SharedCounter
+from pipert2.utils.flight_recorder import summarize_payload
+from pipert2.utils.input_schedulers import InputScheduler, RoundRobinScheduler
+
+DEFAULT_INPUT_NAME = "default"
+
+
+class WakeupQueue(thQueue):
+    """A threading queue that calls a wakeup callback whenever an item is put into it.
+    Used to wake a reader that waits on process safe queues as well.
+
+    Attributes:
+        max_bytes: The maximum total size of the items the queue holds, unlimited if None.
+            A single item larger than the budget is still accepted into an empty queue. The sizes of the items are
+            only counted with a budget, so a queue without one costs nothing more than a plain queue.
+        drops: Counts the messages that were dropped on their way into the queue.
+
+    """
+
+    def __init__(self, maxsize=0, wakeup=None, max_bytes=None):
+        super().__init__(maxsize=maxsize)
+        self.wakeup = wakeup
+        self.max_bytes = max_bytes
+        self.drops = SharedCounter()
+        self._bytes = 0
+
+    def put(self, item, block=True, timeout=None):
+        """Put an item into the queue, considering the bytes budget as well as the maximum size.
+
+        """
+
+        if self.max_bytes is None:
+            return super().put(item, block, timeout)
+
+        size = _item_size(item)
+
+        with self.not_full:
+            deadline = None if timeout is None else monotonic() + timeout
+
+            while self._has_no_room(size):
+                if not block:
+                    raise Full
+                elif deadline is None:
+                    self.not_full.wait()
+                else:
+                    remaining = deadline - monotonic()
+
+                    if remaining <= 0:
+                        raise Full
+
+                    self.not_full.wait(remaining)
+
+            self._put(item)
+            self.unfinished_tasks += 1
+            self.not_empty.notify()
+
+    def qbytes(self) -> int:
+        """Return the total size of the items in the queue, 0 if the queue has no bytes budget.
+
+        """
+
+        with self.mutex:
+            return self._bytes
+
+    def _has_no_room(self, size: int) -> bool:
+        queue_size = self._qsize()
+
+        return (0 < self.maxsize <= queue_size) or (queue_size > 0 and self._bytes + size > self.max_bytes)
+
+    def _put(self, item):
+        super()._put(item)
+
+        if self.max_bytes is not None:
+            self._bytes += _item_size(item)
+
+        if self.wakeup is not None:
+            self.wakeup()
+
+    def _get(self):
+        item = super()._get()
+
+        if self.max_bytes is not None:
+            self._bytes -= _item_size(item)
+
+        return item
+
+
+class QueueInput:
+    """A single input of a routine, usually created for each wire that the routine is a destination of.
+
+    Attributes:
+        name: The name of the input.
+        queue: The queue the messages of the input arrive to.
+        weight: The weight (or priority) of the input for the input scheduler.
+        process_safe: Whether the queue is a process safe queue or a threading queue.
+
+    """
+
+    def __init__(self, name: str, queue, weight: int = 1, process_safe: bool = False):
+        self.name = name
+        self.queue = queue
+        self.weight = weight
+        self.process_safe = process_safe
+
+    def get_stats(self) -> dict:
+        """Get the current depth and size in bytes of the input's queue and how many messages were dropped on their
+        way to it. The size of a threading queue is counted only if it has a bytes budget.
+
+        """
+
+        return {
+            "depth": self.queue.qsize(),
+            "bytes": self.queue.qbytes(),
+            "drops": self.queue.drops.value
+        }
 
 
 class QueueWrapper:
     """The `QueueWrapper` is a class that enables the usage of both multiprocessing queue and threading queue with the
     `PublishQueue` class.
-    It listens to both of its queues with thread and push to a designated out_queue all of the messages received in both
-    queues.
+    Every input of the routine has its own queue, and an `InputScheduler` decides which of them the next message is
+    taken from. When there is no message, the reader waits on all of the inputs at once using
+    `multiprocessing.connection.wait`, without relaying through a worker thread.
 
     Attributes:
-        mp_queue: A multiprocessing queue. Will be initiated once necessary.
-        out_queue: Either a multiprocessing or a multithreading queue according to which queues exist.
-        multiprocess_thread: A thread listening to the multiprocessing queue if it exists.
+        max_queue_size: The size of each input queue.
+        scheduler: The scheduler that picks the input to read from.
+        inputs: The inputs of the routine mapped by their name and whether they are process safe.
 
     """
 
-    def __init__(self, max_queue_size=1):
-        self.mp_queue = None
+    def __init__(self, max_queue_size=1, scheduler: Optional[InputScheduler] = None):
         self.max_queue_size = max_queue_size
-        self.out_queue = thQueue(maxsize=max_queue_size)
-        self.multiprocess_thread = Thread()
+        self.scheduler = scheduler if scheduler is not None else RoundRobinScheduler()
+        self.inputs: Dict[tuple, QueueInput] = {}
+        self._inputs_list = []
+        self._waiting = False
+        self._wakeup_reader = None
+        self._wakeup_writer = None
+        self._wakeup_finalizer = None
 
     def get(self, block: bool, timeout: int):
-        """Return whatever is in the out_queue.
+        """Return a message from the input chosen by the scheduler.
 
         Args:
             block: Whether to wait for the queue to have something in it or not.
@@ -32,76 +156,190 @@ class QueueWrapper:
         Returns:
             A message passed through the queue.
 
+        Raises:
+            Empty: If no message arrived.
+
         """
 
-        if self.mp_queue is not None:
-            if not self.multiprocess_thread.is_alive():
-                self.restart_queue_worker()
+        if len(self._inputs_list) == 1 and not self._inputs_list[0].process_safe:
+            return self._inputs_list[0].queue.get(block=block, timeout=timeout)
 
-        try:
-            message = self.out_queue.get(block=block, timeout=timeout)
-        except Empty:
-            raise Empty
+        deadline = None if timeout is None else monotonic() + timeout
+
+        while True:
+            try:
+                return self._get_nowait()
+            except Empty:
+                if not block:
+                    raise
+
+            remaining = None if deadline is None else deadline - monotonic()
 
-        return message
+            if remaining is not None and remaining <= 0:
+                raise Empty
 
-    def get_queue(self, process_safe: bool):
-        """Get a queue according to necessity.
+            self._wait(remaining)
+
+    def get_queue(self, process_safe: bool, input_name: str = DEFAULT_INPUT_NAME, weight: int = 1,
+                  max_size: int = None, max_bytes: int = None):
+        """Get the queue of an input, create the input if it doesn't exist yet.
 
         Args:
             process_safe: Indicate if the queue needs to be process safe or not.
+            input_name: The name of the input, usually the name of the routine sending to it.
+            weight: The weight of the input for the input scheduler.
+            max_size: The maximum amount of messages in the input's queue, the wrapper's max_queue_size if None.
+            max_bytes: The maximum total size of the messages in the input's queue, unlimited if None.
 
         Returns:
-            If process_safe is true, return a multiprocessing queue, otherwise return a multithreading queue.
+            If process_safe is true, return a process safe frame queue, otherwise return a multithreading queue.
 
         """
 
-        if process_safe:
-            in_queue = self._get_mp_queue()
-        else:
-            in_queue = self.out_queue
+        key = (input_name, process_safe)
+
+        if key not in self.inputs:
+            max_size = max_size if max_size is not None else self.max_queue_size
+
+            if process_safe:
+                in_queue = FrameQueue(maxsize=max_size, max_bytes=max_bytes)
+            else:
+                in_queue = WakeupQueue(maxsize=max_size, wakeup=self._wakeup, max_bytes=max_bytes)
+
+            queue_input = QueueInput(input_name, in_queue, weight=weight, process_safe=process_safe)
+            self.inputs[key] = queue_input
+            self._inputs_list.append(queue_input)
+
+        return self.inputs[key].queue
+
+    def qsize(self) -> int:
+        """Get the amount of messages in all of the inputs.
 
-        return in_queue
+        """
+
+        return sum(queue_input.queue.qsize() for queue_input in self._inputs_list)
 
-    def _get_mp_queue(self):
-        """Start listening to the multiprocessing queue and change the out_queue to work with multiprocessing.
+    def get_inputs_stats(self) -> Dict[str, dict]:
+        """Get the depth, size in bytes and drops of every input.
 
         Returns:
-            A multiprocessing queue.
+            Dictionary mapping each input name to its stats.
 
         """
 
-        if self.mp_queue is None:
-            self.mp_queue = mpQueue(maxsize=self.max_queue_size)
+        return {queue_input.name: queue_input.get_stats() for queue_input in self._inputs_list}
 
-        return self.mp_queue
+    def _get_nowait(self):
+        """Get a message from the first non empty input by the scheduler's order.
 
-    def queue_worker(self):
-        """A worker that pushes messages forward to the out_queue.
-        If the input queue (`self.mp_queue`) receives None, exit the loop.
+        Raises:
+            Empty: If all of the inputs are empty.
 
         """
 
-        for item in iter(self.mp_queue.get, None):
+        for queue_input in self.scheduler.order(self._inputs_list):
             try:
-                self.out_queue.put(item)
-            except Full:
-                pass
+                message = queue_input.queue.get(block=False)
+            except Empty:
+                continue
+
+            self.scheduler.served(queue_input)
+
+            return message
+
+        raise Empty
 
-    def restart_queue_worker(self):
-        """Restarts the queue worker.
+    def _wait(self, timeout):
+        """Block until one of the inputs may have a message or the timeout passes.
+
+        Args:
+            timeout: How long to wait, None for waiting forever.
 
         """
 
-        self.multiprocess_thread = Thread(target=self.queue_worker)
-        self.multiprocess_thread.start()
+        waitables = [queue_input.queue.reader for queue_input in self._inputs_list if queue_input.process_safe]
+
+        if len(waitables) < len(self._inputs_list):
+            if self._wakeup_reader is None:
+                self._create_wakeup_pipe()
 
-    def kill_queue_worker(self):
-        """Kills the queue worker.
+            waitables.append(self._wakeup_reader)
+
+        # Announce the waiting before checking the queues again, so a message put in between will wake us.
+        self._waiting = True
+
+        try:
+            if all(queue_input.queue.empty() for queue_input in self._inputs_list):
+                ready = wait(waitables, timeout)
+
+                if self._wakeup_reader in ready:
+                    self._drain_wakeup_pipe()
+        finally:
+            self._waiting = False
+
+    def close(self):
+        """Close the pipe used for waking the reader, it is created again if the wrapper is read from later.
 
         """
 
-        if self.mp_queue is not None:
-            while self.multiprocess_thread.is_alive():
-                self.mp_queue.put(None)
-                self.multiprocess_thread.join(timeout=0.1)
+        if self._wakeup_reader is not None:
+            self._wakeup_finalizer()
+            self._wakeup_reader = self._wakeup_writer = None
+
+    def _wakeup(self):
+        """Wake the reader if it waits for messages.
+
+        """
+
+        if self._waiting:
+            try:
+                os.write(self._wakeup_writer, b"\0")
+            except BlockingIOError:
+                pass
+
+    def _create_wakeup_pipe(self):
+        """Create the pipe used for waking the reader when a message is put in a threading queue.
+        The pipe is created in the reading process only and is kept until the wrapper is closed or collected.
+
+        """
+
+        self._wakeup_reader, self._wakeup_writer = os.pipe()
+        os.set_blocking(self._wakeup_reader, False)
+        os.set_blocking(self._wakeup_writer, False)
+        self._wakeup_finalizer = Finalize(self, _close_pipe, args=(self._wakeup_reader, self._wakeup_writer))
+
+    def _drain_wakeup_pipe(self):
+        try:
+            while os.read(self._wakeup_reader, 4096):
+                pass
+        except BlockingIOError:
+            pass
+
+
+def _close_pipe(reader: int, writer: int):
+    os.close(reader)
+    os.close(writer)
+
+
+def _item_size(item) -> int:
+    """Get the size of an item, either a bytes-like frame or a message (or a batch of messages) that couldn't be
+    pickled and is passed as is. Such a message is measured by the sizes of its payload's values, other objects are
+    not counted.
+
+    """
+
+    try:
+        return frame_size(item)
+    except TypeError:
+        messages = item if isinstance(item, list) else [item]
+
+        return sum(_message_size(message) for message in messages)
+
+
+def _message_size(message) -> int:
+    payload = getattr(message, "payload", None)
+
+    if payload is None:
+        return 0
+
+    return sum(size or 0 for size in summarize_payload(payload.data).values())
@@ -0,0 +1,137 @@
+from pipert2.utils.clock import perf_counter_ns
+from typing import Callable, Optional
+from multiprocessing import RawArray
+from pipert2.utils.histogram import HISTOGRAM_SIZE, NS_IN_SECOND, histogram_index, histogram_percentiles
+
+MESSAGES_IN = 0
+MESSAGES_OUT = 1
+EXCEPTIONS = 2
+SERVICE_TIME_COUNT = 3
+SERVICE_TIME_TOTAL = 4
+SERVICE_TIME_MAX = 5
+QUEUE_DEPTH = 6
+MAX_QUEUE_DEPTH = 7
+SERVICE_TIME_HISTOGRAM = 8
+METRICS_SIZE = SERVICE_TIME_HISTOGRAM + HISTOGRAM_SIZE
+
+PUBLISH_EVERY_RECORDS = 64
+PUBLISH_EVERY_NS = 100_000_000
+
+
+class RoutineMetrics:
+    """Counts the messages a routine processes, the service time of its main logic and the depth of its input queue.
+    The routine's thread is the only writer. It counts into a plain list and publishes the list into shared memory
+    every `PUBLISH_EVERY_RECORDS` records, every `PUBLISH_EVERY_NS` nanoseconds, and whenever the routine is idle,
+    so counting a message costs a few list operations. The input queue depth is sampled when publishing.
+    The metrics must be created before the flow process is forked, to be readable from the pipe's process.
+
+    Attributes:
+        queue_depth_getter: Returns the amount of messages waiting for the routine, sampled when publishing.
+
+    """
+
+    def __init__(self):
+        self.queue_depth_getter: Optional[Callable[[], int]] = None
+        self._shared = RawArray("Q", METRICS_SIZE)
+        self._local = [0] * METRICS_SIZE
+        self._unpublished = 0
+        self._published_at = 0
+
+    def record(self, start_time: int, sent: int, received: int = 1):
+        """Count a single successful run of the main logic.
+
+        Args:
+            start_time: The `perf_counter_ns` time the main logic started at.
+            sent: The amount of messages the run sent.
+            received: The amount of messages the run received.
+
+        """
+
+        now = perf_counter_ns()
+        service_time = now - start_time
+        local = self._local
+
+        local[MESSAGES_IN] += received
+        local[MESSAGES_OUT] += sent
+        local[SERVICE_TIME_COUNT] += 1
+        local[SERVICE_TIME_TOTAL] += service_time
+        local[SERVICE_TIME_HISTOGRAM + histogram_index(service_time)] += 1
+
+        if service_time > local[SERVICE_TIME_MAX]:
+            local[SERVICE_TIME_MAX] = service_time
+
+        self._count_record(now)
+
+    def record_exception(self, received: int = 1):
+        """Count a run of the main logic that raised an exception.
+
+        Args:
+            received: The amount of messages the run received.
+
+        """
+
+        self._local[MESSAGES_IN] += received
+        self._local[EXCEPTIONS] += 1
+        self._count_record(perf_counter_ns())
+
+    def _count_record(self, now: int):
+        """Publish the counts if enough records or time passed since they were last published.
+
+        """
+
+        self._unpublished += 1
+
+        if self._unpublished >= PUBLISH_EVERY_RECORDS or now - self._published_at >= PUBLISH_EVERY_NS:
+            self.publish(now)
+
+    def flush(self):
+        """Publish the counts that weren't published yet, called when the routine is idle.
+
+        """
+
+        if self._unpublished:
+            self.publish(perf_counter_ns())
+
+    def publish(self, now: int):
+        """Sample the input queue depth and publish the counts into the shared memory.
+
+        Args:
+            now: The current `perf_counter_ns` time.
+
+        """
+
+        if self.queue_depth_getter is not None:
+            queue_depth = self.queue_depth_getter()
+            self._local[QUEUE_DEPTH] = queue_depth
+            self._local[MAX_QUEUE_DEPTH] = max(self._local[MAX_QUEUE_DEPTH], queue_depth)
+
+        self._shared[:] = self._local
+        self._unpublished = 0
+        self._published_at = now
+
+    def get_stats(self) -> dict:
+        """Get the published metrics, can be called from any process.
+
+        Returns:
+            The messages in and out, the exceptions, the input queue depth and the service time statistics in seconds.
+
+        """
+
+        values = self._shared[:]
+        service_count = values[SERVICE_TIME_COUNT]
+        percentiles = histogram_percentiles(values[SERVICE_TIME_HISTOGRAM:])
+
+        return {
+            "messages_in": values[MESSAGES_IN],
+            "messages_out": values[MESSAGES_OUT],
+            "exceptions": values[EXCEPTIONS],
+            "queue_depth": values[QUEUE_DEPTH],
+            "max_queue_depth": values[MAX_QUEUE_DEPTH],
+            "service_time": {
+                "count": service_count,
+                "mean": values[SERVICE_TIME_TOTAL] / service_count / NS_IN_SECOND if service_count else 0.0,
+                "max": values[SERVICE_TIME_MAX] / NS_IN_SECOND,
+                **{f"p{percentile}": min(value, values[SERVICE_TIME_MAX]) / NS_IN_SECOND
+                   for percentile, value in percentiles.items()}
+            }
+        }
@@ -0,0 +1,26 @@
+from multiprocessing import Value
+
+
+class SharedCounter:
+    """A counter that can be incremented and read atomically from multiple processes.
+    The counter must be created before the processes that use it are forked.
+
+    """
+
+    def __init__(self, initial_value: int = 0):
+        self._value = Value("Q", initial_value)
+
+    def increment(self, amount: int = 1):
+        """Increment the counter atomically.
+
+        Args:
+            amount: The amount to add to the counter.
+
+        """
+
+        with self._value.get_lock():
+            self._value.value += amount
+
+    @property
+    def value(self) -> int:
+        return self._value.value
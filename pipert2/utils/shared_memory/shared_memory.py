@@ -1,11 +1,19 @@
 import sys
+import struct
 # if sys.version_info.minor <= 7:
 import posix_ipc
 import mmap
 
+# Every segment starts with a header telling whether its data was read since it was written.
+SEGMENT_HEADER = struct.Struct("Q")
+READ = 0
+UNREAD = 1
+
 
 class SharedMemory:
     """A wrapper for posix_ipc.SharedMemory, posix_ipc.Semaphore and the correlating mapfile to simplify usage.
+    The data is stored after a `SEGMENT_HEADER`, which marks whether it was read, so a writer can tell when it
+    overwrites data that no one read yet.
 
     """
 
@@ -20,20 +28,35 @@ class SharedMemory:
     def acquire_semaphore(self):
         self.semaphore.acquire()
 
-    def write_to_memory(self, byte_code: bytes):
+    @property
+    def capacity(self) -> int:
+        """The maximum amount of bytes the memory holds.
+
+        """
+
+        return len(self.mapfile) - SEGMENT_HEADER.size
+
+    def write_to_memory(self, byte_code: bytes) -> bool:
         """Writes a given byte code to the shared memory.
 
         Args:
             byte_code: A byte string that's to be written to the shared memory.
 
+        Returns:
+            True if the memory held data that wasn't read yet, which is now lost.
+
         """
 
+        state, = SEGMENT_HEADER.unpack_from(self.mapfile)
         self.mapfile.flush()
         self.mapfile.seek(0)
+        self.mapfile.write(SEGMENT_HEADER.pack(UNREAD))
         self.mapfile.write(byte_code)
 
+        return state == UNREAD
+
     def read_from_memory(self, size: int = 0) -> bytes:
-        """Reads a segment from the shared memory according to size.
+        """Reads a segment from the shared memory according to size, and marks it as read.
 
         Args:
             size: The amount of bytes that are to be read.
@@ -43,11 +66,21 @@ class SharedMemory:
 
         """
 
-        self.mapfile.seek(0)
+        self.mapfile.seek(SEGMENT_HEADER.size)
         file_content = self.mapfile.read(size)
+        SEGMENT_HEADER.pack_into(self.mapfile, 0, READ)
 
         return file_content
 
+    def is_unread(self) -> bool:
+        """Check whether the data in the memory was written and not read yet.
+
+        """
+
+        state, = SEGMENT_HEADER.unpack_from(self.mapfile)
+
+        return state == UNREAD
+
     def free_memory(self):
         """Cleans what is on the memory and deletes it.
 
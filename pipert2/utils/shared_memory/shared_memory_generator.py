@@ -2,7 +2,7 @@ import os
 import mmap
 import posix_ipc
 from typing import Optional
-from pipert2.utils.shared_memory.shared_memory import SharedMemory
+from pipert2.utils.shared_memory.shared_memory import SharedMemory, SEGMENT_HEADER
 from pipert2.utils.shared_memory.memory_id_iterator import MemoryIdIterator
 
 
@@ -29,7 +29,7 @@ def get_shared_memory_object(name: str) -> Optional[SharedMemory]:
 
 class SharedMemoryGenerator:
     """Generates a set 'max_segment_count' amount of shared memories with each being as large as 'segment_size' to be
-    used.
+    used. Every memory is allocated with room for its header on top of 'segment_size'.
 
     """
 
@@ -47,7 +47,7 @@ class SharedMemoryGenerator:
         for _ in range(self.max_segment_count):
             next_name = self.memory_id_gen.get_next()
             memory = posix_ipc.SharedMemory(next_name, posix_ipc.O_CREAT,
-                                            size=self.segment_size)
+                                            size=self.segment_size + SEGMENT_HEADER.size)
             semaphore = posix_ipc.Semaphore(next_name, posix_ipc.O_CREAT)
             mapfile = mmap.mmap(memory.fd, memory.size)
             memory.close_fd()
@@ -1,10 +1,21 @@
+import threading
+from typing import Iterable
 from pipert2.utils.singleton import Singleton
+from pipert2.utils.exceptions import SharedMemoryPayloadTooLarge
 # if sys.version_info.minor <= 7:
 from pipert2.utils.shared_memory.shared_memory_generator import SharedMemoryGenerator, get_shared_memory_object
 
+# The statistics summed when aggregated over processes, the rest are aggregated by their maximum.
+SUMMED_STATS = ("segments_allocated", "segments_in_use", "writes", "bytes_written", "reads", "bytes_read",
+                "overwrites", "oversize_failures")
+MAX_STATS = ("segment_size", "largest_write", "largest_oversize")
+
 
 class SharedMemoryManager(metaclass=Singleton):
     """The shared memory manager interacts with an implementation of a shared memory library, and simplifies user usage.
+    It counts the writes and reads of the process, the writes that overwrote data that was never read and the data
+    that was too large for a segment, to help size the segments pool. The routines of the process share the manager,
+    so the statistics are updated under a lock.
 
     """
 
@@ -12,6 +23,9 @@ class SharedMemoryManager(metaclass=Singleton):
         self.shared_memory_generator = SharedMemoryGenerator(max_segment_count=max_segment_count,
                                                              segment_size=segment_size)
         self.shared_memory_generator.create_memories()
+        self.stats = dict.fromkeys(SUMMED_STATS + MAX_STATS, 0)
+        self.stats["segment_size"] = segment_size
+        self._stats_lock = threading.Lock()
 
     def write_to_mem(self, data: bytes) -> str:
         """Writes given bytes to the shared memory.
@@ -22,16 +36,33 @@ class SharedMemoryManager(metaclass=Singleton):
         Returns:
             The name of the shared memory segment written to.
 
+        Raises:
+            SharedMemoryPayloadTooLarge: If the data doesn't fit in a segment.
+
         """
 
+        if len(data) > self.shared_memory_generator.segment_size:
+            with self._stats_lock:
+                self.stats["oversize_failures"] += 1
+                self.stats["largest_oversize"] = max(self.stats["largest_oversize"], len(data))
+
+            raise SharedMemoryPayloadTooLarge(f"Can't write {len(data)} bytes to a shared memory segment of "
+                                              f"{self.shared_memory_generator.segment_size} bytes")
+
         memory_name = self.shared_memory_generator.get_next_shared_memory_name()
         memory = get_shared_memory_object(memory_name)
 
         if memory:
             memory.acquire_semaphore()
-            memory.write_to_memory(data)
+            overwritten = memory.write_to_memory(data)
             memory.release_semaphore()
 
+            with self._stats_lock:
+                self.stats["writes"] += 1
+                self.stats["bytes_written"] += len(data)
+                self.stats["overwrites"] += overwritten
+                self.stats["largest_write"] = max(self.stats["largest_write"], len(data))
+
         return memory_name
 
     def read_from_mem(self, mem_name: str, bytes_to_read: int) -> [bytes, None]:
@@ -52,10 +83,68 @@ class SharedMemoryManager(metaclass=Singleton):
             memory.acquire_semaphore()
             data = memory.read_from_memory(size=bytes_to_read)
             memory.release_semaphore()
+
+            with self._stats_lock:
+                self.stats["reads"] += 1
+                self.stats["bytes_read"] += len(data)
         else:
             data = None
 
         return data
 
+    def get_stats(self) -> dict:
+        """Get the shared memory statistics of this process.
+
+        Returns:
+            The counts of the allocated segments and of the segments holding data that wasn't read yet, the writes and
+            reads and their bytes, the writes that overwrote unread data and the writes that were too large, along with
+            the segment size and the sizes of the largest write and the largest data that didn't fit.
+
+        """
+
+        shared_memories = self.shared_memory_generator.shared_memories
+
+        with self._stats_lock:
+            stats = dict(self.stats)
+
+        return {
+            **stats,
+            "segments_allocated": len(shared_memories),
+            "segments_in_use": sum(memory.is_unread() for memory in shared_memories.values())
+        }
+
     def cleanup_memory(self):
         self.shared_memory_generator.cleanup()
+
+
+def get_shared_memory_stats() -> dict:
+    """Get the shared memory statistics of this process, without allocating the segments if it didn't use them.
+
+    """
+
+    manager = Singleton._instances.get(SharedMemoryManager)
+
+    if manager is None:
+        return dict.fromkeys(SUMMED_STATS + MAX_STATS, 0)
+
+    return manager.get_stats()
+
+
+def aggregate_shared_memory_stats(processes_stats: Iterable[dict]) -> dict:
+    """Aggregate the shared memory statistics of several processes.
+
+    Returns:
+        The sum of the counts and the maximum of the sizes.
+
+    """
+
+    aggregated = dict.fromkeys(SUMMED_STATS + MAX_STATS, 0)
+
+    for stats in processes_stats:
+        for key in SUMMED_STATS:
+            aggregated[key] += stats[key]
+
+        for key in MAX_STATS:
+            aggregated[key] = max(aggregated[key], stats[key])
+
+    return aggregated
@@ -0,0 +1,360 @@
+import socket
+import struct
+import itertools
+import selectors
+import collections
+from time import monotonic
+from multiprocessing.util import register_after_fork
+from pipert2.utils.shared_counter import SharedCounter
+
+FRAME_HEADER = struct.Struct("!I")
+RECEIVE_SIZE = 1 << 16
+MAX_BUFFERS_PER_SEND = 512
+RECONNECT_INTERVAL = 0.1
+MAX_RECONNECT_INTERVAL = 5
+CONNECT_TIMEOUT = 1
+DEFAULT_MAX_PENDING_BYTES = 1 << 20
+
+
+class FrameReader:
+    """Reads length-prefixed frames from a connected stream socket.
+    Small frames are read many at a time into a shared buffer, while a large frame is received directly into its
+    own buffer without being copied again.
+
+    """
+
+    def __init__(self, connection: socket.socket):
+        self.connection = connection
+        self._buffer = bytearray()
+        self._large_frame = None
+        self._large_frame_filled = 0
+
+    def read(self, frames: collections.deque) -> bool:
+        """Read whatever is available on the socket and append the completed frames.
+
+        Args:
+            frames: The frames that were completely read are appended to it.
+
+        Returns:
+            False if the other side closed the connection, True otherwise.
+
+        """
+
+        try:
+            if self._large_frame is not None:
+                received = self.connection.recv_into(memoryview(self._large_frame)[self._large_frame_filled:])
+            else:
+                chunk = self.connection.recv(RECEIVE_SIZE)
+                received = len(chunk)
+                self._buffer += chunk
+        except BlockingIOError:
+            return True
+        except ConnectionError:
+            return False
+
+        if received == 0:
+            return False
+
+        if self._large_frame is not None:
+            self._large_frame_filled += received
+
+            if self._large_frame_filled == len(self._large_frame):
+                frames.append(self._large_frame)
+                self._large_frame = None
+        else:
+            self._parse_buffer(frames)
+
+        return True
+
+    def _parse_buffer(self, frames: collections.deque):
+        """Cut the complete frames out of the buffer.
+        A frame that is larger than what's left in the buffer continues in its own buffer.
+
+        """
+
+        while len(self._buffer) >= FRAME_HEADER.size:
+            frame_size, = FRAME_HEADER.unpack_from(self._buffer)
+            frame_end = FRAME_HEADER.size + frame_size
+
+            if len(self._buffer) >= frame_end:
+                frames.append(bytes(self._buffer[FRAME_HEADER.size:frame_end]))
+                del self._buffer[:frame_end]
+            else:
+                if frame_size > RECEIVE_SIZE:
+                    self._large_frame = bytearray(frame_size)
+                    self._large_frame_filled = len(self._buffer) - FRAME_HEADER.size
+                    self._large_frame[:self._large_frame_filled] = self._buffer[FRAME_HEADER.size:]
+                    self._buffer.clear()
+
+                break
+
+
+class FrameReceiver:
+    """Accepts connections on a listening socket and receives the frames sent over all of them.
+
+    Attributes:
+        listener: The listening socket.
+
+    """
+
+    def __init__(self, listener: socket.socket):
+        self.listener = listener
+        self._reset()
+        register_after_fork(self, FrameReceiver._reset)
+
+    def _reset(self):
+        self._selector = None
+        self._frames = collections.deque()
+
+    def receive(self, timeout=None):
+        """Return a received frame, wait for one up to the timeout if there isn't any.
+
+        Args:
+            timeout: How long to wait in seconds, forever if None.
+
+        Returns:
+            A frame, or None if no frame arrived.
+
+        """
+
+        if self._frames:
+            return self._frames.popleft()
+
+        if self._selector is None:
+            self._selector = selectors.DefaultSelector()
+            self.listener.setblocking(False)
+            self._selector.register(self.listener, selectors.EVENT_READ)
+
+        deadline = None if timeout is None else monotonic() + timeout
+
+        while not self._frames:
+            remaining = None if deadline is None else max(deadline - monotonic(), 0)
+
+            for key, _ in self._selector.select(remaining):
+                if key.fileobj is self.listener:
+                    self._accept()
+                elif not key.data.read(self._frames):
+                    self._selector.unregister(key.fileobj)
+                    key.fileobj.close()
+
+            if deadline is not None and monotonic() >= deadline:
+                break
+
+        return self._frames.popleft() if self._frames else None
+
+    def qsize(self) -> int:
+        """Return the amount of frames that were received and not returned yet.
+
+        """
+
+        return len(self._frames)
+
+    def _accept(self):
+        try:
+            connection, _ = self.listener.accept()
+        except BlockingIOError:
+            return
+
+        connection.setblocking(False)
+        self._selector.register(connection, selectors.EVENT_READ, data=FrameReader(connection))
+
+
+class FrameSender:
+    """Sends length-prefixed frames over a stream socket to a single address.
+    The header and the frame are sent together with `sendmsg` without concatenating them. When the socket is busy,
+    the frames wait in a bounded backlog and are later coalesced into a single `sendmsg` call.
+    A frame that doesn't fit in the backlog is dropped and counted, like a frame that isn't bytes, for example a
+    message that couldn't be pickled.
+
+    Attributes:
+        address: The address of the receiving side.
+        family: The address family of the socket.
+        max_pending_bytes: The size of the backlog. A frame is always accepted into an empty backlog.
+        drops: Counts the frames that were dropped.
+
+    """
+
+    def __init__(self, address, family=socket.AF_UNIX, max_pending_bytes=DEFAULT_MAX_PENDING_BYTES):
+        self.address = address
+        self.family = family
+        self.max_pending_bytes = max_pending_bytes
+        self.drops = SharedCounter()
+        self._reset()
+        register_after_fork(self, FrameSender._reset)
+
+    def _reset(self):
+        self._connection = None
+        self._pending = collections.deque()
+        self._pending_bytes = 0
+        self._pending_frames = 0
+        self._next_connect_time = 0
+        self._reconnect_interval = RECONNECT_INTERVAL
+
+    def send(self, frame: bytes, block=False, timeout=1) -> bool:
+        """Send a frame, or keep it in the backlog if the socket is busy.
+
+        Args:
+            frame: The frame to send.
+            block: Whether to wait for room in the backlog.
+            timeout: How long to wait if block is true.
+
+        Returns:
+            True if the frame was sent or kept, False if it was dropped.
+
+        """
+
+        if not isinstance(frame, (bytes, bytearray)):
+            self.drops.increment()
+            return False
+
+        if self._connection is None and not self._connect():
+            self.drops.increment()
+            return False
+
+        payload = memoryview(frame).cast("B")
+        header = FRAME_HEADER.pack(payload.nbytes)
+
+        if self._pending:
+            self._flush()
+
+            if block and not self._has_room(payload.nbytes):
+                self.flush(timeout)
+
+            if not self._has_room(payload.nbytes):
+                self.drops.increment()
+                return False
+
+        self._pending.append((memoryview(header), False))
+        self._pending.append((payload, True))
+        self._pending_bytes += len(header) + payload.nbytes
+        self._pending_frames += 1
+        self._flush()
+
+        return True
+
+    def flush(self, timeout=1):
+        """Wait for the frames in the backlog to be sent.
+
+        Args:
+            timeout: How long to wait.
+
+        """
+
+        deadline = monotonic() + timeout
+
+        while self._pending and monotonic() < deadline:
+            self._wait_writable(deadline - monotonic())
+            self._flush()
+
+    def qsize(self) -> int:
+        """Return the amount of frames in the backlog.
+
+        """
+
+        return self._pending_frames
+
+    def close(self):
+        if self._connection is not None:
+            self._connection.close()
+
+        self._reset()
+
+    def _has_room(self, size: int) -> bool:
+        return not self._pending or self._pending_bytes + FRAME_HEADER.size + size <= self.max_pending_bytes
+
+    def _connect(self) -> bool:
+        """Connect to the receiving side.
+        After a failed attempt, the next one is made only after a backoff that starts at `RECONNECT_INTERVAL` and
+        doubles on every failure up to `MAX_RECONNECT_INTERVAL`.
+
+        Returns:
+            True if connected, False otherwise.
+
+        """
+
+        if monotonic() < self._next_connect_time:
+            return False
+
+        connection = socket.socket(self.family, socket.SOCK_STREAM)
+
+        try:
+            connection.settimeout(CONNECT_TIMEOUT)
+            connection.connect(self.address)
+        except OSError:
+            connection.close()
+            self._next_connect_time = monotonic() + self._reconnect_interval
+            self._reconnect_interval = min(self._reconnect_interval * 2, MAX_RECONNECT_INTERVAL)
+            return False
+
+        self._configure(connection)
+        connection.setblocking(False)
+        self._connection = connection
+        self._reconnect_interval = RECONNECT_INTERVAL
+
+        return True
+
+    def _configure(self, connection: socket.socket):
+        """Set socket options for a new connection, used by subclasses.
+
+        """
+
+        pass
+
+    def _flush(self):
+        """Send as much as possible of the backlog without waiting.
+
+        """
+
+        while self._pending and self._connection is not None:
+            buffers = [buffer for buffer, _ in itertools.islice(self._pending, MAX_BUFFERS_PER_SEND)]
+
+            try:
+                sent = self._connection.sendmsg(buffers)
+            except BlockingIOError:
+                return
+            except OSError:
+                self.drops.increment(self._pending_frames)
+                self.close()
+                return
+
+            self._consume(sent)
+
+    def _consume(self, sent: int):
+        """Remove the sent bytes from the backlog.
+
+        """
+
+        self._pending_bytes -= sent
+
+        while sent:
+            buffer, ends_frame = self._pending[0]
+
+            if len(buffer) <= sent:
+                sent -= len(buffer)
+                self._pending.popleft()
+
+                if ends_frame:
+                    self._pending_frames -= 1
+            else:
+                self._pending[0] = (buffer[sent:], ends_frame)
+                sent = 0
+
+    def _wait_writable(self, timeout):
+        if self._connection is not None:
+            with selectors.DefaultSelector() as selector:
+                selector.register(self._connection, selectors.EVENT_WRITE)
+                selector.select(timeout)
+
+
+class TcpFrameSender(FrameSender):
+    """Sends length-prefixed frames over a TCP connection.
+    Nagle's algorithm is disabled, since the frames are already batched by the sender's backlog.
+
+    """
+
+    def __init__(self, address, family=socket.AF_INET, max_pending_bytes=DEFAULT_MAX_PENDING_BYTES):
+        super().__init__(address, family=family, max_pending_bytes=max_pending_bytes)
+
+    def _configure(self, connection: socket.socket):
+        connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        connection.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
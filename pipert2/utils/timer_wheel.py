@@ -0,0 +1,279 @@
+import math
+import itertools
+from time import monotonic
+from typing import Any, Dict, List, Optional, Tuple
+
+DEFAULT_RESOLUTION = 0.001
+DEFAULT_SLOT_BITS = 8
+DEFAULT_LEVELS = 4
+
+
+class Timer:
+    """A single timer of the timer wheel.
+
+    Attributes:
+        timer_id: The id returned when the timer was added.
+        deadline_tick: The tick the timer expires at.
+        interval_ticks: The ticks between the expirations of a periodic timer, None for a one-shot timer.
+        data: The object returned when the timer expires.
+        level: The level of the wheel the timer is placed in.
+        cancelled: Whether the timer was cancelled, cancelled timers are removed from their slot lazily.
+
+    """
+
+    __slots__ = ("timer_id", "deadline_tick", "interval_ticks", "data", "level", "cancelled")
+
+    def __init__(self, timer_id: int, deadline_tick: int, interval_ticks: Optional[int], data):
+        self.timer_id = timer_id
+        self.deadline_tick = deadline_tick
+        self.interval_ticks = interval_ticks
+        self.data = data
+        self.level = 0
+        self.cancelled = False
+
+
+class TimerWheel:
+    """A hierarchical timer wheel, holding any amount of one-shot and periodic timers.
+    Time is divided into ticks of `resolution` seconds. Each level of the wheel has `2 ** slot_bits` slots, a slot in
+    the first level spans a single tick and a slot in every next level spans a whole lap of the previous level.
+    A timer is placed in the lowest level that reaches its deadline, and is moved down (cascaded) whenever the wheel
+    reaches its slot. Adding and cancelling a timer take constant time, and advancing the wheel skips the ticks in
+    which no timer can expire.
+
+    The wheel is not thread safe.
+
+    Attributes:
+        resolution: The length of a tick in seconds. A timer never expires before its deadline, and expires at most a
+                    single tick after it.
+        start: The monotonic time of the wheel's first tick.
+        current_tick: The last tick the wheel was advanced to.
+
+    """
+
+    def __init__(self, resolution: float = DEFAULT_RESOLUTION, slot_bits: int = DEFAULT_SLOT_BITS,
+                 levels: int = DEFAULT_LEVELS, start: float = None):
+        self.resolution = resolution
+        self.start = start if start is not None else monotonic()
+        self.current_tick = 0
+        self._slot_bits = slot_bits
+        self._slots_mask = (1 << slot_bits) - 1
+        self._max_delta = (1 << (slot_bits * levels)) - 1
+        self._levels = [[[] for _ in range(1 << slot_bits)] for _ in range(levels)]
+        self._levels_counts = [0] * levels
+        self._timers: Dict[int, Timer] = {}
+        self._timers_ids = itertools.count()
+
+    def __len__(self):
+        return len(self._timers)
+
+    def add(self, deadline: float, data, interval: float = None) -> int:
+        """Add a timer to the wheel.
+
+        Args:
+            deadline: The monotonic time the timer expires at. A deadline that already passed expires on the next tick.
+            data: The object to return when the timer expires.
+            interval: The seconds between the expirations of a periodic timer, None for a one-shot timer.
+
+        Returns:
+            The id of the timer, for cancelling it.
+
+        """
+
+        interval_ticks = None if interval is None else max(round(interval / self.resolution), 1)
+        timer = Timer(next(self._timers_ids), self._get_tick(deadline), interval_ticks, data)
+        self._timers[timer.timer_id] = timer
+        self._place(timer, self.current_tick + 1)
+
+        return timer.timer_id
+
+    def cancel(self, timer_id: int) -> bool:
+        """Cancel a timer.
+
+        Args:
+            timer_id: The id of the timer.
+
+        Returns:
+            True if the timer was cancelled, False if it doesn't exist or a one-shot timer already expired.
+
+        """
+
+        timer = self._timers.pop(timer_id, None)
+
+        if timer is None:
+            return False
+
+        timer.cancelled = True
+        self._levels_counts[timer.level] -= 1
+
+        return True
+
+    def advance(self, now: float) -> List[Tuple[Any, float]]:
+        """Advance the wheel up to the given time and collect the timers that expired.
+
+        Args:
+            now: The current monotonic time.
+
+        Returns:
+            The data of the expired timers with the time each one was due, by the order of their deadlines.
+            A periodic timer that was late for several expirations is returned once.
+
+        """
+
+        target_tick = math.floor((now - self.start) / self.resolution)
+        expired = []
+
+        while self.current_tick < target_tick:
+            lowest_level = self._get_lowest_level()
+
+            if lowest_level is None:
+                self.current_tick = target_tick
+                break
+
+            if lowest_level > 0:
+                # No timer can expire before the wheel reaches the next slot of the lowest occupied level.
+                next_slot_tick = self._get_next_slot_tick(lowest_level)
+
+                if next_slot_tick > target_tick:
+                    self.current_tick = target_tick
+                    break
+
+                self.current_tick = next_slot_tick - 1
+
+            self.current_tick += 1
+            self._cascade()
+            self._expire(expired, target_tick)
+
+        return expired
+
+    def next_deadline(self) -> Optional[float]:
+        """Get the time the wheel should be advanced at next.
+
+        Returns:
+            The deadline of the next expiring timer, or the time timers need to be cascaded at if it comes earlier.
+            None if there are no timers.
+
+        """
+
+        lowest_level = self._get_lowest_level()
+
+        if lowest_level is None:
+            return None
+
+        if lowest_level == 0:
+            for tick in range(self.current_tick + 1, self.current_tick + self._slots_mask + 2):
+                if any(not timer.cancelled for timer in self._levels[0][tick & self._slots_mask]):
+                    return self._get_time(tick)
+
+        return self._get_time(self._get_next_slot_tick(max(lowest_level, 1)))
+
+    def _place(self, timer: Timer, earliest_tick: int):
+        """Place a timer in the slot matching its deadline.
+
+        Args:
+            timer: The timer to place.
+            earliest_tick: A timer with an earlier deadline is placed as if it expires at this tick.
+
+        """
+
+        tick = max(timer.deadline_tick, earliest_tick)
+        delta = min(tick - self.current_tick, self._max_delta)
+        level = 0
+
+        while delta >> (self._slot_bits * (level + 1)):
+            level += 1
+
+        slot_index = ((self.current_tick + delta) >> (self._slot_bits * level)) & self._slots_mask
+        self._levels[level][slot_index].append(timer)
+        self._levels_counts[level] += 1
+        timer.level = level
+
+    def _cascade(self):
+        """Move the timers of the slots the wheel reached in the higher levels to the lower levels.
+
+        """
+
+        for level in range(len(self._levels) - 1, 0, -1):
+            shift = self._slot_bits * level
+
+            if self.current_tick & ((1 << shift) - 1) == 0:
+                slot_index = (self.current_tick >> shift) & self._slots_mask
+                timers = self._levels[level][slot_index]
+                self._levels[level][slot_index] = []
+
+                for timer in timers:
+                    if not timer.cancelled:
+                        self._levels_counts[level] -= 1
+                        self._place(timer, self.current_tick)
+
+    def _expire(self, expired: list, target_tick: int):
+        """Collect the timers of the current tick, and place the periodic ones again for their next expiration.
+        A periodic timer is placed after the target tick, so it doesn't expire again in the same advance.
+
+        """
+
+        slot_index = self.current_tick & self._slots_mask
+        timers = self._levels[0][slot_index]
+        self._levels[0][slot_index] = []
+
+        for timer in timers:
+            if timer.cancelled:
+                continue
+
+            self._levels_counts[0] -= 1
+            expired.append((timer.data, self._get_time(timer.deadline_tick)))
+
+            if timer.interval_ticks is None:
+                del self._timers[timer.timer_id]
+            else:
+                timer.deadline_tick += timer.interval_ticks
+
+                if timer.deadline_tick <= target_tick:
+                    missed_ticks = target_tick - timer.deadline_tick
+                    timer.deadline_tick += (missed_ticks // timer.interval_ticks + 1) * timer.interval_ticks
+
+                self._place(timer, self.current_tick + 1)
+
+    def _get_lowest_level(self) -> Optional[int]:
+        for level, count in enumerate(self._levels_counts):
+            if count:
+                return level
+
+        return None
+
+    def _get_next_slot_tick(self, level: int) -> int:
+        slot_ticks = 1 << (self._slot_bits * level)
+
+        return (self.current_tick // slot_ticks + 1) * slot_ticks
+
+    def _get_tick(self, time: float) -> int:
+        return math.ceil((time - self.start) / self.resolution)
+
+    def _get_time(self, tick: int) -> float:
+        return self.start + tick * self.resolution
+
+
+class JitterStats:
+    """Measures how late the timers fire compared to their deadlines.
+
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, jitter: float):
+        self.count += 1
+        self.total += jitter
+        self.max = max(self.max, jitter)
+
+    def get_stats(self) -> dict:
+        """Get the amount of fired timers and their mean and maximal lateness in seconds.
+
+        """
+
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else 0.0,
+            "max": self.max
+        }
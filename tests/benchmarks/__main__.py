@@ -0,0 +1,58 @@
+"""Run the pipe benchmarks and compare them to the stored baseline.
+
+    python -m tests.benchmarks [--results PATH] [--tolerance 0.3] [--latency-tolerance 1] [--update-baseline]
+
+"""
+
+import os
+import sys
+import argparse
+from tests.benchmarks.pipe_benchmark import DEFAULT_DURATION, DEFAULT_LATENCY_TOLERANCE, DEFAULT_TOLERANCE, \
+    DEFAULT_WARMUP, compare_to_baseline, load_results, run_benchmarks, save_results
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Measure the throughput and latency of pipes.")
+    parser.add_argument("--results", default="benchmark_results.json", help="Where to write the results JSON.")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="The results JSON to compare to.")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="The allowed relative drop in throughput.")
+    parser.add_argument("--latency-tolerance", type=float, default=DEFAULT_LATENCY_TOLERANCE,
+                        help="The allowed relative growth in latency.")
+    parser.add_argument("--warmup", type=float, default=DEFAULT_WARMUP, help="Seconds to run before measuring.")
+    parser.add_argument("--duration", type=float, default=DEFAULT_DURATION, help="Seconds to measure every case.")
+    parser.add_argument("--update-baseline", action="store_true", help="Store the results as the new baseline.")
+    args = parser.parse_args()
+
+    results = run_benchmarks(warmup=args.warmup, duration=args.duration)
+
+    for name, result in results.items():
+        latency = ", ".join(f"{percentile} {value * 1000:.3f} ms" for percentile, value in result["latency"].items()
+                            if value is not None)
+        print(f"{name}: {result['messages_per_second']:.1f} msgs/s, {latency}")
+
+    save_results(results, args.results)
+
+    if args.update_baseline:
+        save_results(results, args.baseline)
+        return 0
+
+    baseline = load_results(args.baseline)
+
+    if baseline is None:
+        print(f"No baseline at {args.baseline}")
+        return 0
+
+    regressions = compare_to_baseline(results, baseline, tolerance=args.tolerance,
+                                      latency_tolerance=args.latency_tolerance)
+
+    for regression in regressions:
+        print(f"Regression: {regression}")
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
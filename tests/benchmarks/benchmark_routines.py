@@ -0,0 +1,59 @@
+from pipert2 import SourceRoutine, MiddleRoutine, DestinationRoutine
+
+PAYLOAD_KEY = "payload"
+
+
+class PayloadSourceRoutine(SourceRoutine):
+    """Sends the same payload of a fixed size as fast as the wires let it.
+
+    """
+
+    def __init__(self, payload_size: int, name="benchmark_source"):
+        super().__init__(name=name)
+        self.payload_size = payload_size
+        self.payload = None
+
+    def main_logic(self) -> dict:
+        return {PAYLOAD_KEY: self.payload}
+
+    def setup(self) -> None:
+        self.payload = bytes(self.payload_size)
+
+    def cleanup(self) -> None:
+        self.payload = None
+
+
+class PassThroughRoutine(MiddleRoutine):
+    """Sends on whatever it receives.
+
+    """
+
+    def __init__(self, name="benchmark_middle"):
+        super().__init__(name=name)
+
+    def main_logic(self, data) -> dict:
+        return data
+
+    def setup(self) -> None:
+        pass
+
+    def cleanup(self) -> None:
+        pass
+
+
+class SinkRoutine(DestinationRoutine):
+    """Drops whatever it receives, its messages are counted by the routine metrics.
+
+    """
+
+    def __init__(self, name="benchmark_destination"):
+        super().__init__(name=name)
+
+    def main_logic(self, data) -> None:
+        pass
+
+    def setup(self) -> None:
+        pass
+
+    def cleanup(self) -> None:
+        pass
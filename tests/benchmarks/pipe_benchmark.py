@@ -0,0 +1,217 @@
+import sys
+import json
+import time
+from typing import Dict, List, Optional
+
+from pipert2 import Pipe, Wire, QueueNetwork, SocketNetwork, BasicTransmitter, SharedMemoryTransmitter, START_EVENT_NAME
+from pipert2.utils.dummy_object import Dummy
+from tests.benchmarks.benchmark_routines import PayloadSourceRoutine, PassThroughRoutine, SinkRoutine
+
+if sys.version_info.minor >= 7:
+    from dataclasses import dataclass, asdict
+else:
+    from pipert2.utils.data_class.dataclasses import dataclass, asdict
+
+QUEUE_NETWORK = "queue"
+SOCKET_NETWORK = "socket"
+NETWORKS = (QUEUE_NETWORK, SOCKET_NETWORK)
+
+BASIC_TRANSMITTER = "basic"
+SHARED_MEMORY_TRANSMITTER = "shared_memory"
+TRANSMITTERS = {
+    BASIC_TRANSMITTER: BasicTransmitter,
+    SHARED_MEMORY_TRANSMITTER: SharedMemoryTransmitter
+}
+
+DEFAULT_WARMUP = 1
+DEFAULT_DURATION = 3
+DEFAULT_TOLERANCE = 0.3
+# The latency percentiles are estimated by histogram buckets a quarter apart, so they move in coarse steps.
+DEFAULT_LATENCY_TOLERANCE = 1
+LATENCY_PERCENTILES = ("p50", "p99")
+PAYLOAD_SIZES = (100, 10_000, 1_000_000, 25_000_000)
+# The shared memory manager writes every value to a single segment of 5MB by default.
+MAX_SHARED_MEMORY_PAYLOAD_SIZE = 5_000_000
+
+
+@dataclass
+class BenchmarkCase:
+    """A pipe of a source, a middle routine and `fan_out` destinations, all connected by wires of a single transmitter.
+
+    Attributes:
+        network: The name of the network the routines send the messages through, one of `NETWORKS`.
+        transmitter: The name of the data transmitter of the wires, one of `TRANSMITTERS`.
+        payload_size: The size in bytes of the payload of each message.
+        cross_flow: Whether every routine runs in its own flow, otherwise they all run in a single flow.
+        fan_out: The amount of destinations the middle routine sends every message to.
+        queue_size: The maximum amount of messages waiting in each routine's input queue, of the queue network only.
+
+    """
+
+    network: str = QUEUE_NETWORK
+    transmitter: str = BASIC_TRANSMITTER
+    payload_size: int = 100
+    cross_flow: bool = False
+    fan_out: int = 1
+    queue_size: int = 16
+
+    @property
+    def name(self) -> str:
+        return f"{self.network}-{self.transmitter}-{self.payload_size}B-{'cross' if self.cross_flow else 'intra'}_flow-" \
+               f"fan_out_{self.fan_out}-queue_{self.queue_size}"
+
+
+def _get_default_cases() -> List[BenchmarkCase]:
+    """Vary a single dimension of the default case at a time, except for the payload sizes that are measured for every
+    transmitter and network. Payloads that don't fit in a shared memory segment are measured only with the basic
+    transmitter.
+
+    """
+
+    cases = [BenchmarkCase(network=network, transmitter=transmitter, payload_size=payload_size)
+             for network in NETWORKS
+             for transmitter in TRANSMITTERS
+             for payload_size in PAYLOAD_SIZES
+             if transmitter != SHARED_MEMORY_TRANSMITTER or payload_size <= MAX_SHARED_MEMORY_PAYLOAD_SIZE]
+    cases += [BenchmarkCase(network=network, transmitter=transmitter, payload_size=10_000, cross_flow=True)
+              for network in NETWORKS
+              for transmitter in TRANSMITTERS]
+    cases += [BenchmarkCase(fan_out=fan_out) for fan_out in (2, 4)]
+    cases += [BenchmarkCase(queue_size=queue_size) for queue_size in (1, 64)]
+
+    return cases
+
+
+BENCHMARK_CASES = _get_default_cases()
+
+
+def run_benchmark(case: BenchmarkCase, warmup: float = DEFAULT_WARMUP, duration: float = DEFAULT_DURATION) -> dict:
+    """Run a pipe of the case and measure it with the pipe's own metrics and latency tracking.
+
+    Args:
+        case: The pipe to run.
+        warmup: Seconds to let the pipe run before measuring.
+        duration: Seconds to measure the throughput for.
+
+    Returns:
+        The messages and bytes each destination received per second, and the p50 and p99 end to end latency in
+        seconds of the slowest destination.
+
+    """
+
+    if case.network == SOCKET_NETWORK:
+        network = SocketNetwork(block=True)
+    else:
+        network = QueueNetwork(max_queue_sizes=case.queue_size, block=True)
+
+    pipe = Pipe(network=network, logger=Dummy(), data_transmitter=TRANSMITTERS[case.transmitter]())
+
+    source = PayloadSourceRoutine(case.payload_size)
+    middle = PassThroughRoutine()
+    destinations = tuple(SinkRoutine(name=f"benchmark_destination_{index}") for index in range(case.fan_out))
+
+    if case.cross_flow:
+        pipe.create_flow("source_flow", False, source)
+        pipe.create_flow("middle_flow", False, middle)
+
+        for destination in destinations:
+            pipe.create_flow(f"{destination.name}_flow", False, destination)
+    else:
+        pipe.create_flow("benchmark_flow", False, source, middle, *destinations)
+
+    pipe.link(Wire(source=source, destinations=(middle,)), Wire(source=middle, destinations=destinations))
+    pipe.build()
+
+    try:
+        pipe.notify_event(START_EVENT_NAME)
+        time.sleep(warmup)
+
+        start_count, start_time = _count_received(pipe, destinations), time.monotonic()
+        time.sleep(duration)
+        end_count, end_time = _count_received(pipe, destinations), time.monotonic()
+
+        latency = pipe.get_latency(timeout=5)
+    finally:
+        pipe.join(to_kill=True)
+
+    messages_per_second = (end_count - start_count) / case.fan_out / (end_time - start_time)
+    paths = [path for destination in destinations for path in latency.get(destination.name, {}).get("paths", {}).values()]
+
+    return {
+        "case": asdict(case),
+        "messages_per_second": messages_per_second,
+        "bytes_per_second": messages_per_second * case.payload_size,
+        "latency": {percentile: max((path[percentile] for path in paths), default=None)
+                    for percentile in LATENCY_PERCENTILES}
+    }
+
+
+def _count_received(pipe: Pipe, destinations) -> int:
+    metrics = pipe.get_metrics()
+
+    return sum(flow_metrics[destination.name]["messages_in"]
+               for flow_metrics in metrics.values()
+               for destination in destinations if destination.name in flow_metrics)
+
+
+def run_benchmarks(cases: List[BenchmarkCase] = None, warmup: float = DEFAULT_WARMUP,
+                   duration: float = DEFAULT_DURATION) -> Dict[str, dict]:
+    """Run the benchmark of every case.
+
+    Returns:
+        The result of every case mapped by the case's name.
+
+    """
+
+    cases = BENCHMARK_CASES if cases is None else cases
+
+    return {case.name: run_benchmark(case, warmup=warmup, duration=duration) for case in cases}
+
+
+def compare_to_baseline(results: Dict[str, dict], baseline: Dict[str, dict], tolerance: float = DEFAULT_TOLERANCE,
+                        latency_tolerance: float = DEFAULT_LATENCY_TOLERANCE) -> List[str]:
+    """Find the cases whose throughput dropped, or whose latency grew, by more than the tolerance.
+    Cases that are missing from either the results or the baseline are ignored.
+
+    Args:
+        results: The results of the current run, as returned by `run_benchmarks`.
+        baseline: The results of a previous run to compare to.
+        tolerance: The allowed relative drop in throughput, 0.3 allows a throughput 30% lower.
+        latency_tolerance: The allowed relative growth in latency, 1 allows a latency twice as high.
+
+    Returns:
+        A description of every regression.
+
+    """
+
+    regressions = []
+
+    for name in results.keys() & baseline.keys():
+        result, expected = results[name], baseline[name]
+
+        if result["messages_per_second"] < expected["messages_per_second"] * (1 - tolerance):
+            regressions.append(f"{name}: {result['messages_per_second']:.1f} msgs/s, "
+                               f"baseline {expected['messages_per_second']:.1f} msgs/s")
+
+        for percentile in LATENCY_PERCENTILES:
+            latency = result["latency"].get(percentile)
+            expected_latency = expected["latency"].get(percentile)
+
+            if latency is not None and expected_latency is not None and latency > expected_latency * (1 + latency_tolerance):
+                regressions.append(f"{name}: {percentile} latency {latency * 1000:.3f} ms, "
+                                   f"baseline {expected_latency * 1000:.3f} ms")
+
+    return sorted(regressions)
+
+
+def load_results(path: str) -> Optional[Dict[str, dict]]:
+    try:
+        with open(path) as results_file:
+            return json.load(results_file)
+    except FileNotFoundError:
+        return None
+
+
+def save_results(results: Dict[str, dict], path: str):
+    with open(path, "w") as results_file:
+        json.dump(results, results_file, indent=4, sort_keys=True)
@@ -0,0 +1,71 @@
+import os
+import pytest
+from tests.benchmarks.pipe_benchmark import BENCHMARK_CASES, DEFAULT_LATENCY_TOLERANCE, DEFAULT_TOLERANCE, BenchmarkCase, \
+    compare_to_baseline, load_results, run_benchmark, save_results
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+RUN_BENCHMARKS = bool(os.environ.get("PIPERT_BENCHMARKS"))
+RESULTS_PATH = os.environ.get("PIPERT_BENCHMARKS_RESULTS", "benchmark_results.json")
+TOLERANCE = float(os.environ.get("PIPERT_BENCHMARKS_TOLERANCE", DEFAULT_TOLERANCE))
+LATENCY_TOLERANCE = float(os.environ.get("PIPERT_BENCHMARKS_LATENCY_TOLERANCE", DEFAULT_LATENCY_TOLERANCE))
+
+
+def get_result(messages_per_second, p50, p99):
+    return {"messages_per_second": messages_per_second, "latency": {"p50": p50, "p99": p99}}
+
+
+@pytest.fixture(scope="module")
+def benchmark_results():
+    results = {}
+
+    yield results
+
+    if results:
+        save_results(results, RESULTS_PATH)
+
+
+def test_compare_to_baseline_within_tolerance_expecting_no_regressions():
+    baseline = {"case": get_result(1000, 0.01, 0.02)}
+    results = {"case": get_result(800, 0.012, 0.025)}
+
+    assert compare_to_baseline(results, baseline, tolerance=0.3, latency_tolerance=0.3) == []
+
+
+def test_compare_to_baseline_with_lower_throughput_and_higher_latency_expecting_regressions():
+    baseline = {"case": get_result(1000, 0.01, 0.02)}
+    results = {"case": get_result(600, 0.01, 0.03)}
+
+    regressions = compare_to_baseline(results, baseline, tolerance=0.3, latency_tolerance=0.3)
+
+    assert len(regressions) == 2
+    assert "msgs/s" in regressions[0] and "p99" in regressions[1]
+
+
+def test_compare_to_baseline_with_new_and_missing_cases_expecting_them_to_be_ignored():
+    baseline = {"old_case": get_result(1000, 0.01, 0.02)}
+    results = {"new_case": get_result(1, 1, 1)}
+
+    assert compare_to_baseline(results, baseline) == []
+
+
+def test_benchmark_case_name_describes_every_dimension():
+    case = BenchmarkCase(network="socket", transmitter="shared_memory", payload_size=10_000, cross_flow=True, fan_out=2,
+                         queue_size=64)
+
+    assert case.name == "socket-shared_memory-10000B-cross_flow-fan_out_2-queue_64"
+
+
+@pytest.mark.skipif(not RUN_BENCHMARKS, reason="Set PIPERT_BENCHMARKS=1 to run the benchmarks")
+@pytest.mark.timeout(60)
+@pytest.mark.parametrize("case", BENCHMARK_CASES, ids=lambda case: case.name)
+def test_pipe_benchmark_expecting_no_regression_from_baseline(case, benchmark_results):
+    result = run_benchmark(case)
+    benchmark_results[case.name] = result
+
+    assert result["messages_per_second"] > 0, f"No messages reached the destinations of {case.name}"
+
+    baseline = load_results(BASELINE_PATH) or {}
+    regressions = compare_to_baseline({case.name: result}, baseline, tolerance=TOLERANCE,
+                                      latency_tolerance=LATENCY_TOLERANCE)
+
+    assert not regressions, "\n".join(regressions)
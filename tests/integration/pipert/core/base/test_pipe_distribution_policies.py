@@ -0,0 +1,71 @@
+import pytest
+from pytest_mock import MockerFixture
+from pipert2 import Pipe, QueueNetwork, Wire
+from pipert2.core.base.flow import Flow
+from pipert2.core.base.message import Message
+from pipert2.utils.distribution_policies import RoundRobin, LeastQueueDepth
+from tests.unit.pipert.core.utils.dummy_routines.dummy_source_routine import DummySourceRoutine
+from tests.unit.pipert.core.utils.dummy_routines.dummy_destination_routine import DummyDestinationRoutine
+
+
+@pytest.fixture()
+def distributing_pipe_factory(mocker: MockerFixture):
+    """Build a pipe with a source distributing to two destinations, without starting the flows, so the messages are put
+    and read through the routines' message handlers in the test's process.
+
+    """
+
+    mocker.patch.object(Flow, "build")
+
+    def create(distribution_policy):
+        pipe = Pipe(network=QueueNetwork(max_queue_sizes=10), logger=mocker.MagicMock())
+        source = DummySourceRoutine()
+        destinations = (DummyDestinationRoutine(name="first_destination"),
+                        DummyDestinationRoutine(name="second_destination"))
+
+        pipe.create_flow("flow", False, source, *destinations)
+        pipe.link(Wire(source=source, destinations=destinations, distribution_policy=distribution_policy))
+        pipe.event_board = mocker.MagicMock()
+        pipe.build()
+
+        return source, destinations
+
+    return create
+
+
+def get_received_indices(destination) -> list:
+    indices = []
+
+    while True:
+        message = destination.message_handler.get()
+
+        if message is None:
+            return indices
+
+        indices.append(message.get_data()["index"])
+
+
+def test_round_robin_splits_the_messages_evenly(distributing_pipe_factory):
+    source, (first_destination, second_destination) = distributing_pipe_factory(RoundRobin())
+
+    for index in range(6):
+        source.message_handler.put(Message({"index": index}, source.name))
+
+    assert get_received_indices(first_destination) == [0, 2, 4]
+    assert get_received_indices(second_destination) == [1, 3, 5]
+
+
+def test_least_queue_depth_sends_to_the_destination_with_fewer_waiting_messages(distributing_pipe_factory):
+    source, (first_destination, second_destination) = distributing_pipe_factory(LeastQueueDepth())
+
+    source.message_handler.put(Message({"index": 0}, source.name))
+    source.message_handler.put(Message({"index": 1}, source.name))
+
+    # Only the second destination reads its message, so the first one stays deeper from now on.
+    assert get_received_indices(second_destination) == [1]
+
+    for index in range(2, 5):
+        source.message_handler.put(Message({"index": index}, source.name))
+        assert get_received_indices(second_destination) == [index]
+
+    assert get_received_indices(first_destination) == [0]
@@ -0,0 +1,37 @@
+import pytest
+from pytest_mock import MockerFixture
+from pipert2 import Pipe, QueueNetwork, Wire
+from pipert2.core.base.flow import Flow
+from pipert2.core.base.message import Message
+from tests.unit.pipert.core.utils.dummy_routines.dummy_source_routine import DummySourceRoutine
+from tests.unit.pipert.core.utils.dummy_routines.dummy_destination_routine import DummyDestinationRoutine
+
+
+@pytest.fixture()
+def dummy_predicate_pipe(mocker: MockerFixture):
+    """Build a pipe with a source whose single wire filters by a predicate, without starting the flows.
+
+    """
+
+    mocker.patch.object(Flow, "build")
+
+    pipe = Pipe(network=QueueNetwork(max_queue_sizes=10), logger=mocker.MagicMock())
+    source = DummySourceRoutine()
+    destination = DummyDestinationRoutine()
+
+    pipe.create_flow("flow", False, source, destination)
+    pipe.link(Wire(source=source, destinations=(destination,), predicate=lambda data: data["night"]))
+    pipe.event_board = mocker.MagicMock()
+    pipe.build()
+
+    return source, destination
+
+
+def test_raising_predicate_is_logged_by_the_routine_logger(dummy_predicate_pipe):
+    source, destination = dummy_predicate_pipe
+
+    source.message_handler.put(Message({"size": 20}, source.name))
+
+    assert source.message_handler.logger is source._logger
+    source._logger.exception.assert_called_once()
+    assert destination.message_handler.get() is None
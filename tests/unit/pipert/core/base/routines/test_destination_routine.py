@@ -1,6 +1,8 @@
 import pytest
 from pytest_mock import MockerFixture
+from pipert2.core.base.message import Message
 from pipert2.utils.dummy_object import Dummy
+from pipert2.utils.consts.event_names import LATENCY_EVENT_NAME
 from tests.unit.pipert.core.utils.dummy_routines.dummy_destination_routine import DummyDestinationRoutine
 
 MAX_TIMEOUT_WAITING = 3
@@ -10,6 +12,7 @@ MAX_TIMEOUT_WAITING = 3
 def dummy_routine(mocker: MockerFixture):
     dummy_routine = DummyDestinationRoutine()
     mock_message_handler = mocker.MagicMock()
+    mock_message_handler.get_input_depth.return_value = 0
     dummy_routine.initialize(mock_message_handler, event_notifier=Dummy())
     return dummy_routine
 
@@ -29,3 +32,19 @@ def test_routine_execution(dummy_routine):
 
     assert message_handler.get.call_count == number_of_main_logic_calls
     assert message_handler.put.call_count == 0
+
+
+def test_routine_records_the_latency_of_messages(dummy_routine):
+    message = Message({"value": 1}, source_address="source")
+    message.record_exit("source")
+    message.record_entry(dummy_routine.name)
+    dummy_routine.message_handler.get.return_value = message
+
+    dummy_routine._extended_run()
+
+    latency = dummy_routine.get_latency()
+
+    assert latency["paths"][f"source -> {dummy_routine.name}"]["count"] == 1
+    assert latency["hops"][dummy_routine.name]["queue_wait"]["count"] == 1
+    assert latency["hops"][dummy_routine.name]["service_time"]["count"] == 1
+    assert LATENCY_EVENT_NAME in dummy_routine.get_events()
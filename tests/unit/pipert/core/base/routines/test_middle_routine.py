@@ -1,9 +1,13 @@
+import time
 import pytest
 from functools import partial
 from pytest_mock import MockerFixture
 from pipert2.utils.dummy_object import Dummy
+from pipert2.utils.method_data import Method
+import pstats
+from pipert2.utils.consts import UPDATE_PARAMS_EVENT_NAME, PROFILE_EVENT_NAME
 from tests.unit.pipert.core.utils.dummy_routines.dummy_middle_routine import DummyMiddleRoutine, DUMMY_ROUTINE_EVENT, \
-    DummyMiddleRoutineException
+    DummyMiddleRoutineException, DUMMY_MAILBOX_EVENT, DummyMiddleRoutineStatus, DUMMY_STATUS_EVENT
 from tests.unit.pipert.core.utils.functions_test_utils import timeout_wrapper
 
 MAX_TIMEOUT_WAITING = 3
@@ -13,6 +17,7 @@ MAX_TIMEOUT_WAITING = 3
 def dummy_routine(mocker: MockerFixture):
     dummy_routine = DummyMiddleRoutine()
     mock_message_handler = mocker.MagicMock()
+    mock_message_handler.get_input_depth.return_value = 0
     dummy_routine.initialize(mock_message_handler, event_notifier=Dummy())
     return dummy_routine
 
@@ -22,10 +27,116 @@ def test_event_execution(dummy_routine):
     assert not dummy_routine.inc
 
 
+def test_event_execution_returns_the_results_of_all_callbacks(mocker: MockerFixture):
+    dummy_routine = DummyMiddleRoutineStatus(counter=3)
+    dummy_routine.initialize(mocker.MagicMock(), event_notifier=Dummy())
+
+    assert dummy_routine.execute_event(DUMMY_STATUS_EVENT) == {"get_counter": 3, "get_direction": True}
+
+
 def test_routine_has_registered_events(dummy_routine):
     assert DUMMY_ROUTINE_EVENT.event_name in dummy_routine.get_events()
 
 
+def test_mailbox_event_is_executed_right_away_while_stopped(dummy_routine):
+    dummy_routine.counter = 5
+    dummy_routine.execute_event(DUMMY_MAILBOX_EVENT)
+
+    assert dummy_routine.counter == 0
+    assert not dummy_routine.mailbox
+    assert dummy_routine.listens_to(DUMMY_MAILBOX_EVENT.event_name)
+
+
+def test_mailbox_event_is_executed_on_the_routine_thread(dummy_routine):
+    dummy_routine.start()
+    dummy_routine.execute_event(DUMMY_MAILBOX_EVENT)
+
+    assert timeout_wrapper(func=lambda: getattr(dummy_routine, "reset_thread", None),
+                           expected_value=dummy_routine.runner,
+                           timeout_duration=MAX_TIMEOUT_WAITING)
+
+    dummy_routine.stop()
+
+    assert not dummy_routine.mailbox
+
+
+def test_update_params(dummy_routine):
+    assert dummy_routine.get_params() == {"step": 1}
+
+    update_event = Method(UPDATE_PARAMS_EVENT_NAME, params={"step": 3})
+
+    assert dummy_routine.execute_event(update_event) is None
+    assert dummy_routine.step == 3
+    assert dummy_routine.params_version == 1
+
+
+@pytest.mark.parametrize("params", [{"step": 0}, {"step": 2, "unknown": 1}])
+def test_invalid_update_params_is_not_applied(dummy_routine, params):
+    update_event = Method(UPDATE_PARAMS_EVENT_NAME, params=params)
+
+    assert dummy_routine.execute_event(update_event) is not None
+    assert dummy_routine.step == 1
+    assert dummy_routine.params_version == 0
+
+
+def test_update_params_while_running(dummy_routine):
+    dummy_routine.start()
+    dummy_routine.execute_event(Method(UPDATE_PARAMS_EVENT_NAME, params={"step": 5}))
+
+    assert timeout_wrapper(func=lambda: dummy_routine.params_version, expected_value=1,
+                           timeout_duration=MAX_TIMEOUT_WAITING)
+
+    dummy_routine.stop()
+
+    assert dummy_routine.step == 5
+
+
+def test_profile_routine_thread(dummy_routine, tmp_path):
+    dummy_routine.start()
+    dummy_routine.execute_event(Method(PROFILE_EVENT_NAME, params={"duration": 0.1, "output_dir": str(tmp_path)}))
+
+    assert timeout_wrapper(func=lambda: len(list(tmp_path.glob("*.pstats"))), expected_value=1,
+                           timeout_duration=MAX_TIMEOUT_WAITING)
+
+    dummy_routine.stop()
+
+    profile_path, = tmp_path.glob("*.pstats")
+    profile_stats = pstats.Stats(str(profile_path))
+
+    assert any(function_name == "main_logic" for _, _, function_name in profile_stats.stats)
+
+
+def test_profile_is_ignored_while_stopped(dummy_routine, tmp_path):
+    dummy_routine.execute_event(Method(PROFILE_EVENT_NAME, params={"duration": 0.1, "output_dir": str(tmp_path)}))
+
+    assert dummy_routine._profiler is None
+    assert not list(tmp_path.glob("*.pstats"))
+
+
+def test_profile_one_routine_of_the_process_at_a_time(mocker: MockerFixture, dummy_routine, tmp_path):
+    other_routine = DummyMiddleRoutine(name="other_routine")
+    mock_message_handler = mocker.MagicMock()
+    mock_message_handler.get_input_depth.return_value = 0
+    other_routine.initialize(mock_message_handler, event_notifier=Dummy())
+    other_routine.set_logger(mocker.MagicMock())
+    dummy_routine.start()
+    other_routine.start()
+
+    dummy_routine.execute_event(Method(PROFILE_EVENT_NAME, params={"duration": 60, "output_dir": str(tmp_path)}))
+    assert timeout_wrapper(func=lambda: dummy_routine._profiler is not None, expected_value=True,
+                           timeout_duration=MAX_TIMEOUT_WAITING)
+
+    other_routine.execute_event(Method(PROFILE_EVENT_NAME, params={"duration": 60, "output_dir": str(tmp_path)}))
+    assert timeout_wrapper(func=lambda: other_routine._logger.warning.called, expected_value=True,
+                           timeout_duration=MAX_TIMEOUT_WAITING)
+
+    dummy_routine.stop()
+    other_routine.stop()
+
+    assert other_routine._profiler is None
+    assert len(list(tmp_path.glob("*.pstats"))) == 1
+
+
 def test_routine_execution(mocker, dummy_routine):
     main_logic_spy = mocker.spy(dummy_routine, "main_logic")
 
@@ -59,6 +170,7 @@ def test_routine_execution_catch_exception(mocker, dummy_routine):
 
     dummy_routine = DummyMiddleRoutineException()
     mock_message_handler = mocker.MagicMock()
+    mock_message_handler.get_input_depth.return_value = 0
     dummy_routine.initialize(mock_message_handler, event_notifier=Dummy())
 
     assert dummy_routine.stop_event.is_set()
@@ -74,3 +186,31 @@ def test_routine_execution_catch_exception(mocker, dummy_routine):
     message_handler = dummy_routine.message_handler
 
     assert message_handler.put.call_count == 0
+
+
+def test_exception_dumps_flight_recorder_once_within_interval(mocker, tmp_path):
+    mocker.patch("pipert2.core.base.routine.tempfile.gettempdir", return_value=str(tmp_path))
+    dummy_routine = DummyMiddleRoutineException()
+    dummy_routine.initialize(mocker.MagicMock(), event_notifier=Dummy())
+
+    dummy_routine._record_crash(ValueError("first"))
+    dummy_routine._record_crash(ValueError("second"))
+
+    dumps = list(tmp_path.glob("*.flight.json"))
+    assert len(dumps) == 1
+    assert len(dummy_routine.flight_recorder.get_records()) == 2
+
+
+def test_dump_flight_recorder_event(dummy_routine, tmp_path):
+    path = dummy_routine.dump_flight_recorder(output_dir=str(tmp_path))
+
+    assert path.startswith(str(tmp_path))
+    assert path.endswith(".flight.json")
+
+
+def test_dumps_of_the_same_second_are_kept_apart(dummy_routine, tmp_path):
+    first_path = dummy_routine.dump_flight_recorder(output_dir=str(tmp_path))
+    time.sleep(0.002)
+    second_path = dummy_routine.dump_flight_recorder(output_dir=str(tmp_path))
+
+    assert first_path != second_path
@@ -8,6 +8,7 @@ MAX_TIMEOUT_WAITING = 3
 def test_routine_execution(mocker: MockerFixture):
     dummy_routine = DummySourceRoutine()
     mock_message_handler = mocker.MagicMock()
+    mock_message_handler.get_input_depth.return_value = 0
     dummy_routine.initialize(mock_message_handler, event_notifier=Dummy())
 
     dummy_routine.start()
@@ -28,6 +29,7 @@ def test_routine_execution(mocker: MockerFixture):
 def test_throws_exception(mocker: MockerFixture):
     dummy_routine = DummySourceRoutineException()
     mock_message_handler = mocker.MagicMock()
+    mock_message_handler.get_input_depth.return_value = 0
     mock_message_handler.get.get_data.side_effect = Exception()
     dummy_routine.initialize(mock_message_handler, event_notifier=Dummy())
 
@@ -29,6 +29,15 @@ def test_shared_memory_transmit_receive(dummy_shared_memory_transmitter):
         assert data == receive_func(return_data)
 
 
+def test_shared_memory_transmit_keeps_data_too_large_for_a_segment(dummy_shared_memory_transmitter):
+    from pipert2.utils.shared_memory_manager import SharedMemoryManager
+
+    transmit_func = dummy_shared_memory_transmitter.transmit()
+    data = {"data": bytes(SharedMemoryManager().shared_memory_generator.segment_size + 1)}
+
+    assert transmit_func(data) == data
+
+
 def test_basic_transmit_receive(dummy_basic_data_transmitter):
     transmit_func = dummy_basic_data_transmitter.transmit()
     receive_func = dummy_basic_data_transmitter.receive()
@@ -72,6 +72,26 @@ def test_run(mocker, dummy_flow_with_two_routines: Flow):
     stop_event_callback_mock.assert_called_once()
 
 
+def test_run_replies_to_request_events(mocker, dummy_flow_with_two_routines: Flow):
+    request_event = Method(event_name=EVENT1.event_name, request_id=7)
+    dummy_flow_with_two_routines.event_handler.wait.side_effect = [request_event, KILL_EVENT]
+
+    for routine in dummy_flow_with_two_routines.routines.values():
+        routine.listens_to.return_value = True
+        routine.execute_event.return_value = routine.name
+
+    dummy_flow_with_two_routines.run()
+
+    dummy_flow_with_two_routines.event_handler.reply.assert_called_once_with(
+        request_event, {FIRST_ROUTINE_NAME: FIRST_ROUTINE_NAME, SECOND_ROUTINE_NAME: SECOND_ROUTINE_NAME})
+
+
+def test_run_does_not_reply_to_notified_events(dummy_flow_with_two_routines: Flow):
+    dummy_flow_with_two_routines.run()
+
+    assert not dummy_flow_with_two_routines.event_handler.reply.called
+
+
 def test_execute_event(dummy_flow_with_two_routines: Flow, dummy_method_without_specific_flow: Method):
 
     dummy_flow_with_two_routines.execute_event(dummy_method_without_specific_flow)
@@ -36,6 +36,28 @@ def test_record_entry(dummy_message: Message):
                for entry_name, history_entry_name in zip(ENTRY_LIST, dummy_message.history.keys()))
 
 
+def test_record_exit(dummy_message: Message):
+    dummy_message.record_exit("source")
+    dummy_message.record_entry("destination")
+    dummy_message.record_exit("destination")
+
+    source_entry, source_exit = dummy_message.history["source"]
+    destination_entry, destination_exit = dummy_message.history["destination"]
+
+    assert source_entry is None
+    assert source_exit <= destination_entry <= destination_exit
+
+
+def test_record_entry_from_another_host(dummy_message: Message):
+    dummy_message.record_exit("source")
+    dummy_message.record_entry("middle")
+    dummy_message.record_exit("middle")
+    dummy_message.clock_id = "another host"
+    dummy_message.record_entry("destination")
+
+    assert dummy_message.cross_host_routines == {"destination"}
+
+
 def test_encode_message(mocker: MockerFixture, dummy_message: Message):
     mocker.patch("pickle.dumps")
     payload_mock = dummy_message.payload
@@ -65,3 +87,20 @@ def test_decode_message():
     decoded_message:Message = Message.decode(encoded_message, lazy=False)
 
     assert decoded_message.__str__() == message.__str__()
+
+
+def test_encode_and_decode_batch():
+    messages = [Message({"index": index}, "R1") for index in range(3)]
+
+    decoded_messages = Message.decode_batch(Message.encode_batch(messages))
+
+    assert [message.get_data() for message in decoded_messages] == [{"index": index} for index in range(3)]
+
+
+def test_decode_batch_of_single_message():
+    message = Message(MESSAGE_DATA, "R1")
+
+    decoded_messages = Message.decode_batch(Message.encode(message))
+
+    assert len(decoded_messages) == 1
+    assert decoded_messages[0].get_data() == MESSAGE_DATA
@@ -1,10 +1,13 @@
 import pytest
+from urllib.request import urlopen
 from mock import patch, Mock
 from collections import defaultdict
 from pytest_mock import MockerFixture
 from pipert2 import Wire
 from pipert2.core.base.pipe import Pipe
-from pipert2.utils.exceptions import FloatingRoutine
+from pipert2.utils.exceptions import FloatingRoutine, WiresValidation
+from pipert2.utils.shared_counter import SharedCounter
+from pipert2.utils.consts.event_names import LINK_EVENT_NAME, UNLINK_EVENT_NAME
 from pipert2 import MiddleRoutine, DestinationRoutine, SourceRoutine
 
 
@@ -109,3 +112,172 @@ def test_join(dummy_pipe_with_flows):
     dummy_pipe_object, flow_names = dummy_pipe_with_flows
     dummy_pipe_object.join()
     assert dummy_pipe_object.flows[flow_names[0]].join.call_count == 3
+
+
+def test_create_remote_flow_is_not_built(dummy_pipe: Pipe):
+    FLOW_NAME = "remote"
+    routine_mock = Mock()
+    dummy_pipe.create_flow(FLOW_NAME, False, routine_mock, remote=True)
+
+    dummy_pipe.network.get_remote_message_handler.assert_called_once_with(routine_mock.name)
+    assert routine_mock.flow_name == FLOW_NAME
+    assert FLOW_NAME not in dummy_pipe.flows
+    assert dummy_pipe.remote_flows[FLOW_NAME] == [routine_mock]
+
+
+def test_link_wires_with_ports_of_same_source(dummy_pipe: Pipe, mocker: MockerFixture):
+    source_routine = mocker.MagicMock(spec=SourceRoutine)
+    source_routine.name = "source"
+    source_routine.flow_name = "Flow"
+    night_routine = mocker.MagicMock(spec=DestinationRoutine)
+    night_routine.name = "night"
+    day_routine = mocker.MagicMock(spec=DestinationRoutine)
+    day_routine.name = "day"
+
+    dummy_pipe.link(Wire(source_routine, (night_routine,), port="night"),
+                    Wire(source_routine, (day_routine,), port="day"))
+
+    assert len(dummy_pipe.wires) == 2
+
+
+def test_build_sets_routes_for_wires_with_ports(dummy_pipe: Pipe):
+    source_routine = Mock(spec=SourceRoutine)
+    source_routine.name = "source"
+    source_routine.flow_name = "Flow"
+    source_routine.message_handler = Mock()
+    night_routine = Mock(spec=DestinationRoutine)
+    night_routine.name = "night"
+    day_routine = Mock(spec=DestinationRoutine)
+    day_routine.name = "day"
+    dummy_pipe.link(Wire(source_routine, (night_routine,), port="night"),
+                    Wire(source_routine, (day_routine,), port="day"))
+
+    dummy_pipe.build()
+
+    routes = source_routine.message_handler.routes
+    assert [(route.port, route.output_indices) for route in routes] == [("night", [0]), ("day", [1])]
+    assert [call.kwargs["append"] for call in dummy_pipe.network.link.call_args_list] == [False, True]
+
+
+def test_unlink_before_build_removes_wire(dummy_pipe: Pipe, mocker: MockerFixture):
+    source_routine = mocker.MagicMock(spec=SourceRoutine)
+    source_routine.name = "source"
+    source_routine.flow_name = "Flow"
+    wire = Wire(source_routine, (mocker.MagicMock(spec=DestinationRoutine),))
+    dummy_pipe.link(wire)
+
+    dummy_pipe.unlink(wire)
+
+    assert dummy_pipe.wires == {}
+
+
+def test_link_and_unlink_after_build_notify_source(dummy_pipe: Pipe):
+    source_routine = Mock(spec=SourceRoutine)
+    source_routine.name = "source"
+    source_routine.flow_name = "Flow"
+    source_routine.message_handler = Mock()
+    destination_routine = Mock(spec=DestinationRoutine)
+    destination_routine.name = "destination"
+    tap_routine = Mock(spec=DestinationRoutine)
+    tap_routine.name = "tap"
+    tap_wire = Wire(source_routine, (tap_routine,), enabled=False)
+    dummy_pipe.link(Wire(source_routine, (destination_routine,)), tap_wire)
+    dummy_pipe.build()
+
+    dummy_pipe.link(tap_wire)
+    dummy_pipe.event_board.notify_event.assert_called_with(LINK_EVENT_NAME, {"Flow": ["source"]}, route_index=1)
+    assert tap_wire.enabled
+
+    dummy_pipe.unlink(tap_wire)
+    dummy_pipe.event_board.notify_event.assert_called_with(UNLINK_EVENT_NAME, {"Flow": ["source"]}, route_index=1)
+    assert not tap_wire.enabled
+
+
+def test_link_new_wire_of_standby_wire_after_build_enables_it(dummy_pipe: Pipe):
+    source_routine = Mock(spec=SourceRoutine)
+    source_routine.name = "source"
+    source_routine.flow_name = "Flow"
+    source_routine.message_handler = Mock()
+    destination_routine = Mock(spec=DestinationRoutine)
+    destination_routine.name = "destination"
+    tap_routine = Mock(spec=DestinationRoutine)
+    tap_routine.name = "tap"
+    tap_wire = Wire(source_routine, (tap_routine,), enabled=False)
+    dummy_pipe.link(Wire(source_routine, (destination_routine,)), tap_wire)
+    dummy_pipe.build()
+
+    dummy_pipe.link(Wire(source_routine, (tap_routine,)))
+
+    dummy_pipe.event_board.notify_event.assert_called_with(LINK_EVENT_NAME, {"Flow": ["source"]}, route_index=1)
+    assert tap_wire.enabled
+
+
+def test_link_unknown_wire_after_build_raises(dummy_pipe: Pipe):
+    source_routine = Mock(spec=SourceRoutine)
+    source_routine.name = "source"
+    source_routine.flow_name = "Flow"
+    dummy_pipe.built = True
+
+    with pytest.raises(WiresValidation):
+        dummy_pipe.link(Wire(source_routine, (Mock(spec=DestinationRoutine),)))
+
+
+def test_get_metrics_adds_the_drops_of_the_wires(dummy_pipe: Pipe):
+    source_routine = Mock(spec=SourceRoutine)
+    source_routine.name = "source"
+    source_routine.flow_name = "flow"
+    source_routine.metrics = Mock()
+    source_routine.metrics.get_stats.return_value = {"messages_out": 5}
+    destination_routine = Mock(spec=DestinationRoutine)
+    destination_routine.name = "destination"
+    destination_routine.metrics = Mock()
+    destination_routine.metrics.get_stats.return_value = {"messages_in": 3}
+    dummy_pipe.flows = {"flow": Mock(routines={"source": source_routine, "destination": destination_routine})}
+
+    wire = Wire(source_routine, (destination_routine,))
+    wire.drop_counters = {"destination": SharedCounter(2)}
+    dummy_pipe.link(wire)
+
+    assert dummy_pipe.get_metrics() == {
+        "flow": {
+            "source": {"messages_out": 5, "drops": 0},
+            "destination": {"messages_in": 3, "drops": 2}
+        }
+    }
+
+
+def test_get_shared_memory_stats_aggregates_the_flows(dummy_pipe: Pipe):
+    flow_stats = {"segments_allocated": 50, "segments_in_use": 2, "writes": 10, "bytes_written": 100, "reads": 8,
+                  "bytes_read": 80, "overwrites": 1, "oversize_failures": 0, "segment_size": 5000000,
+                  "largest_write": 10, "largest_oversize": 0}
+    future = Mock()
+    future.result.return_value = {"f1": {"r1": flow_stats, "r2": flow_stats}, "f2": {"r3": flow_stats}, "f3": {}}
+    dummy_pipe.event_board.request_event.return_value = future
+
+    stats = dummy_pipe.get_shared_memory_stats()
+
+    assert stats["flows"] == {"f1": flow_stats, "f2": flow_stats}
+    assert stats["total"]["writes"] == 20
+    assert stats["total"]["segments_allocated"] == 100
+    assert stats["total"]["segment_size"] == 5000000
+
+
+def test_build_serves_metrics(dummy_pipe_with_flows):
+    dummy_pipe_object, _ = dummy_pipe_with_flows
+    dummy_pipe_object.network.link.return_value = {}
+    dummy_pipe_object.build(metrics_port=0)
+
+    host, port = dummy_pipe_object.metrics_server.address
+
+    with urlopen(f"http://{host}:{port}/metrics") as response:
+        assert b"# TYPE pipert_routine_messages_in_total counter" in response.read()
+
+    dummy_pipe_object.join()
+
+
+def test_dump_flight_recorders_flattens_the_flows(dummy_pipe: Pipe):
+    future = Mock()
+    future.result.return_value = {"f1": {"r1": "/tmp/r1.flight.json", "r2": None}, "f2": {"r3": "/tmp/r3.flight.json"}}
+    dummy_pipe.event_board.request_event.return_value = future
+
+    assert dummy_pipe.dump_flight_recorders() == {"r1": "/tmp/r1.flight.json", "r2": None, "r3": "/tmp/r3.flight.json"}
@@ -152,3 +152,51 @@ def test_validate_middle_routines_without_consuming_middle_routine_routine_raise
 
 def test_validate_wires_valid_wires(valid_wires):
     wires_validator.validate_wires(valid_wires)
+
+
+def test_validate_sources_batching_different_batch_sizes_raises_error(mocker: MockerFixture):
+    source_routine = mocker.MagicMock(spec=SourceRoutine)
+    source_routine.name = "source"
+
+    destination1_routine = mocker.MagicMock(spec=DestinationRoutine)
+    destination1_routine.name = "destination1"
+
+    destination2_routine = mocker.MagicMock(spec=DestinationRoutine)
+    destination2_routine.name = "destination2"
+
+    wires = [
+        Wire(source=source_routine, destinations=(destination1_routine,), port="first", max_batch_size=8),
+        Wire(source=source_routine, destinations=(destination2_routine,), port="second"),
+    ]
+
+    with pytest.raises(WiresValidation):
+        wires_validator.validate_sources_batching(wires)
+
+
+def test_validate_sources_batching_same_batching_valid_wires(mocker: MockerFixture):
+    source_routine = mocker.MagicMock(spec=SourceRoutine)
+    source_routine.name = "source"
+
+    destination_routine = mocker.MagicMock(spec=DestinationRoutine)
+    destination_routine.name = "destination"
+
+    wires = [
+        Wire(source=source_routine, destinations=(destination_routine,), port="first", max_batch_size=8),
+        Wire(source=source_routine, destinations=(destination_routine,), port="second", max_batch_size=8),
+    ]
+
+    wires_validator.validate_sources_batching(wires)
+
+
+@pytest.mark.parametrize("weight", [0, -1])
+def test_validate_wires_weights_not_positive_weight_raises_error(mocker: MockerFixture, weight):
+    source_routine = mocker.MagicMock(spec=SourceRoutine)
+    source_routine.name = "source"
+
+    destination_routine = mocker.MagicMock(spec=DestinationRoutine)
+    destination_routine.name = "destination"
+
+    wires = [Wire(source=source_routine, destinations=(destination_routine,), weight=weight)]
+
+    with pytest.raises(WiresValidation):
+        wires_validator.validate_wires_weights(wires)
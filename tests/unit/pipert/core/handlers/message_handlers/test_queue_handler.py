@@ -1,9 +1,13 @@
 import pytest
 import collections
+from queue import Queue
 from multiprocessing import Manager
 from pipert2.core.base.message import Message
 from pipert2.core.base.transmitters import BasicTransmitter
 from pipert2.core.handlers.message_handlers import QueueHandler
+from pipert2.utils.publish_queue import PublishQueue
+from pipert2.utils.output_route import OutputRoute
+from pipert2.utils.distribution_policies import KeyPartition
 
 
 @pytest.fixture()
@@ -117,6 +121,142 @@ def test_get_no_receive_method(blocking_queue_handler, non_blocking_queue_handle
     assert non_blocking_queue_handler.get() is None
 
 
+def test_put_batch_and_get_unpacked_messages(blocking_queue_handler, output_queue, input_queue):
+    messages = [StrMessage(f"Test Message: {index}", "dummy") for index in range(3)]
+    blocking_queue_handler.set_batching(max_size=3, max_delay=60)
+
+    for message in messages:
+        blocking_queue_handler.put(message)
+
+    input_queue.put(output_queue.get())
+
+    assert [blocking_queue_handler.get() for _ in range(3)] == messages
+    assert blocking_queue_handler.get() is None
+
+
+def test_batcher_logs_with_the_logger_set_after_batching(blocking_queue_handler, mocker):
+    blocking_queue_handler.set_batching(max_size=3, max_delay=60)
+    blocking_queue_handler.logger = mocker.MagicMock()
+
+    assert blocking_queue_handler.batcher.get_logger() is blocking_queue_handler.logger
+
+
+def register_queues(queue_handler, amount):
+    queues = [Queue(maxsize=2) for _ in range(amount)]
+    queue_handler.output_queue = PublishQueue()
+    for queue in queues:
+        queue_handler.output_queue.register(queue)
+
+    return queues
+
+
+def test_put_with_key_partition_sends_to_single_queue(non_blocking_queue_handler):
+    queues = register_queues(non_blocking_queue_handler, 2)
+    non_blocking_queue_handler.routes = [OutputRoute([0, 1], distribution_policy=KeyPartition("camera_id"))]
+
+    non_blocking_queue_handler.put(Message({"camera_id": 1}, "dummy"))
+    non_blocking_queue_handler.put(Message({"camera_id": 1}, "dummy"))
+
+    assert sorted(queue.qsize() for queue in queues) == [0, 2]
+
+
+def test_put_to_ports_sends_port_data(non_blocking_queue_handler):
+    night_queue, day_queue = register_queues(non_blocking_queue_handler, 2)
+    non_blocking_queue_handler.routes = [OutputRoute([0], port="night"), OutputRoute([1], port="day")]
+
+    non_blocking_queue_handler.put(Message({"night": {"frame": 1}}, "dummy"))
+
+    assert Message.decode(night_queue.get()).get_data() == {"frame": 1}
+    assert day_queue.empty()
+
+
+def test_put_with_predicates_filters_messages(non_blocking_queue_handler):
+    small_queue, large_queue = register_queues(non_blocking_queue_handler, 2)
+    non_blocking_queue_handler.routes = [OutputRoute([0], predicate=lambda data: data["size"] < 10),
+                                         OutputRoute([1], predicate=lambda data: data["size"] >= 10)]
+
+    non_blocking_queue_handler.put(Message({"size": 20}, "dummy"))
+
+    assert small_queue.empty()
+    assert Message.decode(large_queue.get()).get_data() == {"size": 20}
+
+
+def test_put_with_raising_predicate_skips_its_route(non_blocking_queue_handler, mocker):
+    night_queue, all_queue = register_queues(non_blocking_queue_handler, 2)
+    non_blocking_queue_handler.logger = mocker.MagicMock()
+    non_blocking_queue_handler.routes = [OutputRoute([0], predicate=lambda data: data["night"]), OutputRoute([1])]
+
+    non_blocking_queue_handler.put(Message({"size": 20}, "dummy"))
+
+    assert night_queue.empty()
+    assert Message.decode(all_queue.get()).get_data() == {"size": 20}
+    non_blocking_queue_handler.logger.exception.assert_called_once()
+
+
+def test_put_with_key_partition_of_data_without_keys_skips_its_route(non_blocking_queue_handler, mocker):
+    first_queue, second_queue, all_queue = register_queues(non_blocking_queue_handler, 3)
+    non_blocking_queue_handler.logger = mocker.MagicMock()
+    non_blocking_queue_handler.routes = [OutputRoute([0, 1], distribution_policy=KeyPartition("camera_id")),
+                                         OutputRoute([2])]
+
+    non_blocking_queue_handler.put(Message(b"frame", "dummy"))
+
+    assert first_queue.empty() and second_queue.empty()
+    assert Message.decode(all_queue.get()).get_data() == b"frame"
+    non_blocking_queue_handler.logger.exception.assert_called_once()
+
+
+def test_put_batch_to_ports(blocking_queue_handler):
+    night_queue, day_queue = register_queues(blocking_queue_handler, 2)
+    blocking_queue_handler.routes = [OutputRoute([0], port="night"), OutputRoute([1], port="day")]
+    blocking_queue_handler.set_batching(max_size=3, max_delay=60)
+
+    for port in ["night", "day", "night"]:
+        blocking_queue_handler.put(Message({port: {"port": port}}, "dummy"))
+
+    assert [message.get_data() for message in Message.decode_batch(night_queue.get())] == [{"port": "night"}] * 2
+    assert [message.get_data() for message in Message.decode_batch(day_queue.get())] == [{"port": "day"}]
+
+
+def test_unlinked_route_gets_no_messages(non_blocking_queue_handler):
+    first_queue, second_queue = register_queues(non_blocking_queue_handler, 2)
+
+    non_blocking_queue_handler.set_route_enabled(0, False)
+    non_blocking_queue_handler.put(Message({"dummy": 1}, "dummy"))
+
+    assert first_queue.empty() and second_queue.empty()
+
+    non_blocking_queue_handler.set_route_enabled(0, True)
+    non_blocking_queue_handler.put(Message({"dummy": 1}, "dummy"))
+
+    assert first_queue.qsize() == second_queue.qsize() == 1
+
+
+def test_unlink_batched_wire_mid_stream(blocking_queue_handler):
+    first_queue, second_queue = register_queues(blocking_queue_handler, 2)
+    blocking_queue_handler.set_batching(max_size=3, max_delay=60)
+
+    for index in range(2):
+        blocking_queue_handler.put(Message({"index": index}, "dummy"))
+
+    blocking_queue_handler.set_route_enabled(0, False)
+    blocking_queue_handler.put(Message({"index": 2}, "dummy"))
+    blocking_queue_handler.flush()
+
+    for queue in (first_queue, second_queue):
+        assert [message.get_data() for message in Message.decode_batch(queue.get())] == [{"index": 0}, {"index": 1}]
+        assert queue.empty()
+
+
+def test_put_batch_sends_messages_batched_before_routes_to_all_outputs(blocking_queue_handler):
+    first_queue, second_queue = register_queues(blocking_queue_handler, 2)
+    blocking_queue_handler.routes = [OutputRoute([0]), OutputRoute([1])]
+
+    blocking_queue_handler._put_batch([(Message({"index": 0}, "dummy"), None)])
+
+    assert first_queue.qsize() == second_queue.qsize() == 1
+
+
 class StrMessage(Message):
     def __init__(self, data: collections.Mapping, source_address: str):
         super().__init__(data, source_address)
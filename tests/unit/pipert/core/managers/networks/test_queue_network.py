@@ -2,6 +2,7 @@ import pytest
 from mock import Mock
 from pipert2.utils.publish_queue import PublishQueue
 from pipert2.utils.queue_wrapper import QueueWrapper
+from pipert2.utils.overflow_policies import DropNewest
 from pipert2.core.managers.networks.queue_network import QueueNetwork
 
 
@@ -108,3 +109,56 @@ def test_link_process_safe_multiple_destinations(dummy_queue_network):
 
     for index, routine in enumerate(destination_routines):
         assert source_routine.message_handler.output_queue._queues[index] == routine.message_handler.input_queue.get_queue(False)
+
+
+def test_link_multiple_sources_creates_input_for_each_source(dummy_queue_network):
+    source_routine1 = Mock()
+    source_routine1.name = "source1"
+    source_routine2 = Mock()
+    source_routine2.name = "source2"
+    destination_routine = Mock()
+    destination_routine.message_handler.input_queue = QueueWrapper()
+    data_transmitter = Mock()
+
+    dummy_queue_network.link(source_routine1, (destination_routine,), data_transmitter, weight=2)
+    dummy_queue_network.link(source_routine2, (destination_routine,), data_transmitter)
+
+    input_queue = destination_routine.message_handler.input_queue
+
+    assert source_routine1.message_handler.output_queue._queues[0] is not \
+           source_routine2.message_handler.output_queue._queues[0]
+    assert [queue_input.weight for queue_input in input_queue.inputs.values()] == [2, 1]
+    assert set(input_queue.get_inputs_stats().keys()) == {"source1", "source2"}
+
+
+def test_link_with_overflow_policy_returns_destinations_drop_counters(dummy_queue_network):
+    source_routine = Mock()
+    source_routine.flow_name = "dummy"
+    destination_routine = Mock()
+    destination_routine.name = "destination"
+    destination_routine.flow_name = "dummy"
+    destination_routine.message_handler.input_queue = QueueWrapper(max_queue_size=1)
+
+    drop_counters = dummy_queue_network.link(source_routine, (destination_routine,), Mock(),
+                                             overflow_policy=DropNewest())
+
+    source_routine.message_handler.output_queue.put("1")
+    source_routine.message_handler.output_queue.put("2", block=True)
+
+    assert drop_counters["destination"].value == 1
+
+
+def test_link_with_append_keeps_previous_destinations(dummy_queue_network):
+    source_routine = Mock()
+    source_routine.flow_name = "dummy"
+    first_destination, second_destination = Mock(), Mock()
+    for destination_routine in (first_destination, second_destination):
+        destination_routine.flow_name = "dummy"
+        destination_routine.message_handler.input_queue = QueueWrapper()
+
+    dummy_queue_network.link(source_routine, (first_destination,), Mock())
+    dummy_queue_network.link(source_routine, (second_destination,), Mock(), append=True)
+
+    assert source_routine.message_handler.output_queue.get_queues() == [
+        first_destination.message_handler.input_queue.get_queue(False, input_name=source_routine.name),
+        second_destination.message_handler.input_queue.get_queue(False, input_name=source_routine.name)]
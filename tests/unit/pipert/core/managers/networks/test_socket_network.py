@@ -0,0 +1,69 @@
+import pytest
+import threading
+from mock import Mock
+from pipert2.core.base.message import Message
+from pipert2.core.base.transmitters import BasicTransmitter
+from pipert2.utils.socket_frames import FrameSender
+from pipert2.core.managers.networks.socket_network import SocketNetwork
+
+
+@pytest.fixture
+def dummy_socket_network(tmp_path):
+    dummy_socket_network = SocketNetwork(socket_dir=str(tmp_path), block=True, timeout=1)
+
+    return dummy_socket_network
+
+
+def dummy_routine(network, name):
+    routine = Mock()
+    routine.name = name
+    routine.message_handler = network.get_message_handler(name)
+
+    return routine
+
+
+def test_get_message_handler(dummy_socket_network):
+    message_handler = dummy_socket_network.get_message_handler("dummy")
+
+    assert message_handler.routine_name == "dummy"
+    assert message_handler.address.endswith("dummy.sock")
+
+    assert message_handler == dummy_socket_network.get_message_handler("dummy")
+
+
+def test_link_creates_sender_for_each_destination(dummy_socket_network):
+    source_routine = dummy_routine(dummy_socket_network, "source")
+    destination_routines = (dummy_routine(dummy_socket_network, "dst1"),
+                            dummy_routine(dummy_socket_network, "dst2"))
+
+    drop_counters = dummy_socket_network.link(source_routine, destination_routines, Mock())
+
+    senders = source_routine.message_handler.senders
+    assert all(type(sender) == FrameSender for sender in senders)
+    assert [sender.address for sender in senders] == \
+           [destination.message_handler.address for destination in destination_routines]
+    assert drop_counters == {"dst1": senders[0].drops, "dst2": senders[1].drops}
+
+
+def test_linked_routines_pass_frames(dummy_socket_network):
+    source_routine = dummy_routine(dummy_socket_network, "source")
+    destination_routines = (dummy_routine(dummy_socket_network, "dst1"),
+                            dummy_routine(dummy_socket_network, "dst2"))
+
+    dummy_socket_network.link(source_routine, destination_routines, Mock())
+
+    source_routine.message_handler._put(b"dummy")
+
+    for destination_routine in destination_routines:
+        assert destination_routine.message_handler._get() == b"dummy"
+
+
+def test_message_that_cant_be_pickled_is_dropped(dummy_socket_network):
+    source_routine = dummy_routine(dummy_socket_network, "source")
+    destination_routine = dummy_routine(dummy_socket_network, "dst")
+
+    drop_counters = dummy_socket_network.link(source_routine, (destination_routine,), BasicTransmitter())
+
+    source_routine.message_handler.put(Message({"lock": threading.Lock()}, "source"))
+
+    assert drop_counters["dst"].value == 1
@@ -0,0 +1,84 @@
+import pytest
+from mock import Mock
+from multiprocessing import Process
+from pipert2.utils.exceptions import UnknownRoutineAddress
+from pipert2.utils.socket_frames import TcpFrameSender
+from pipert2.core.managers.networks.tcp_network import TcpNetwork
+
+
+@pytest.fixture
+def dummy_tcp_network():
+    dummy_tcp_network = TcpNetwork(block=True, timeout=1)
+
+    return dummy_tcp_network
+
+
+def dummy_routine(network, name):
+    routine = Mock()
+    routine.name = name
+    routine.message_handler = network.get_message_handler(name)
+
+    return routine
+
+
+def put_messages(message_handler, amount):
+    for index in range(amount):
+        message_handler._put(f"message {index}".encode())
+
+    message_handler.teardown()
+
+
+def test_get_message_handler_listens_on_free_port(dummy_tcp_network):
+    message_handler = dummy_tcp_network.get_message_handler("dummy")
+
+    assert message_handler.address == ("127.0.0.1", 0)
+
+    message_handler.listen()
+
+    assert message_handler.address[1] != 0
+
+
+def test_link_to_remote_routine_without_address_raises(dummy_tcp_network):
+    source_routine = dummy_routine(dummy_tcp_network, "source")
+    destination_routine = Mock()
+    destination_routine.name = "remote"
+    destination_routine.message_handler = dummy_tcp_network.get_remote_message_handler("remote")
+
+    with pytest.raises(UnknownRoutineAddress):
+        dummy_tcp_network.link(source_routine, (destination_routine,), Mock())
+
+
+def test_remote_message_handler_does_not_listen():
+    dummy_tcp_network = TcpNetwork(addresses={"remote": ("127.0.0.1", 1)})
+    message_handler = dummy_tcp_network.get_remote_message_handler("remote")
+
+    message_handler.listen()
+
+    assert message_handler.receiver is None
+    assert message_handler.address == ("127.0.0.1", 1)
+
+
+def test_link_creates_tcp_senders(dummy_tcp_network):
+    source_routine = dummy_routine(dummy_tcp_network, "source")
+    destination_routines = (dummy_routine(dummy_tcp_network, "destination"),)
+
+    drop_counters = dummy_tcp_network.link(source_routine, destination_routines, Mock())
+
+    sender = source_routine.message_handler.senders[0]
+    assert type(sender) == TcpFrameSender
+    assert sender.address == destination_routines[0].message_handler.address
+    assert drop_counters == {"destination": sender.drops}
+
+
+def test_linked_routines_pass_frames_between_processes(dummy_tcp_network):
+    source_routine = dummy_routine(dummy_tcp_network, "source")
+    destination_routines = (dummy_routine(dummy_tcp_network, "destination"),)
+    dummy_tcp_network.link(source_routine, destination_routines, Mock())
+
+    source_process = Process(target=put_messages, args=(source_routine.message_handler, 10))
+    source_process.start()
+
+    for index in range(10):
+        assert destination_routines[0].message_handler._get() == f"message {index}".encode()
+
+    source_process.join()
@@ -1,7 +1,9 @@
 import pytest
 from mock import patch
 from pipert2.utils.dummy_object import Dummy
+from pipert2.utils.method_data import Method
 from pipert2.core.managers.event_board import EventBoard
+from pipert2.utils.exceptions import PipeNotBuilt
 from tests.unit.pipert.core.utils.events_utils import EVENT1, START_EVENT, KILL_EVENT, STOP_EVENT
 
 EVENTS = [START_EVENT, EVENT1, STOP_EVENT, KILL_EVENT]
@@ -50,3 +52,113 @@ def test_event_loop(dummy_event_board: EventBoard):
         assert executed_event == event
 
     dummy_event_board.join()
+
+
+def test_event_for_specific_routine_is_sent_only_to_its_flow(dummy_event_board_no_thread: EventBoard):
+    dummy_event_board_no_thread.get_event_handler([EVENT1.event_name], flow_name="flow1",
+                                                  routines_events={"routine1": [EVENT1.event_name]})
+    dummy_event_board_no_thread.get_event_handler([EVENT1.event_name], flow_name="flow2",
+                                                  routines_events={"routine2": [EVENT1.event_name]})
+
+    event = Method(EVENT1.event_name, specific_flow_routines={"flow1": ["routine1"], "flow2": ["other"]})
+
+    assert dummy_event_board_no_thread.get_event_pipes(event) == [dummy_event_board_no_thread.flows_pipes["flow1"]]
+
+
+def test_event_for_flow_is_sent_to_flow_subscribers(dummy_event_board_no_thread: EventBoard):
+    dummy_event_board_no_thread.get_event_handler([], flow_name="flow1", routines_events={"routine1": []})
+    dummy_event_board_no_thread.get_event_handler([], flow_name="flow2", routines_events={"routine2": []})
+
+    start_event = Method(START_EVENT.event_name, specific_flow_routines={"flow2": ["routine2"]})
+    unknown_event = Method(EVENT1.event_name, specific_flow_routines={"flow2": []})
+
+    assert dummy_event_board_no_thread.get_event_pipes(start_event) == [dummy_event_board_no_thread.flows_pipes["flow2"]]
+    assert dummy_event_board_no_thread.get_event_pipes(unknown_event) == []
+
+
+def test_event_for_specific_routines_is_sent_to_anonymous_handlers(dummy_event_board_no_thread: EventBoard):
+    dummy_event_board_no_thread.get_event_handler([EVENT1.event_name])
+
+    event = Method(EVENT1.event_name, specific_flow_routines={"flow1": ["routine1"]})
+
+    assert dummy_event_board_no_thread.get_event_pipes(event) == dummy_event_board_no_thread.events_pipes[EVENT1.event_name]
+
+
+def test_request_event_collects_the_replies_of_the_flows(dummy_event_board: EventBoard):
+    first_handler = dummy_event_board.get_event_handler([EVENT1.event_name], flow_name="flow1",
+                                                        routines_events={"routine1": [EVENT1.event_name]})
+    second_handler = dummy_event_board.get_event_handler([EVENT1.event_name], flow_name="flow2",
+                                                         routines_events={"routine2": [EVENT1.event_name]})
+
+    dummy_event_board.build()
+    future = dummy_event_board.request_event(EVENT1.event_name, timeout=5, value=1)
+
+    for handler, routine_name in ((first_handler, "routine1"), (second_handler, "routine2")):
+        event = handler.wait()
+        assert event.request_id is not None
+        assert event.params == {"value": 1}
+        handler.reply(event, {routine_name: event.params["value"] + 1})
+
+    assert future.result(timeout=5) == {"flow1": {"routine1": 2}, "flow2": {"routine2": 2}}
+
+    dummy_event_board.notify_event(KILL_EVENT.event_name)
+    dummy_event_board.join()
+
+
+def test_request_event_returns_partial_replies_after_timeout(dummy_event_board: EventBoard):
+    first_handler = dummy_event_board.get_event_handler([EVENT1.event_name], flow_name="flow1",
+                                                        routines_events={"routine1": [EVENT1.event_name]})
+    second_handler = dummy_event_board.get_event_handler([EVENT1.event_name], flow_name="flow2",
+                                                         routines_events={"routine2": [EVENT1.event_name]})
+
+    dummy_event_board.build()
+    future = dummy_event_board.request_event(EVENT1.event_name, timeout=0.2)
+
+    event = first_handler.wait()
+    first_handler.reply(event, {"routine1": "reply"})
+
+    assert future.result(timeout=5) == {"flow1": {"routine1": "reply"}}
+    assert second_handler.wait().request_id == event.request_id
+
+    dummy_event_board.notify_event(KILL_EVENT.event_name)
+    dummy_event_board.join()
+
+
+def test_request_event_without_subscribers_is_resolved_immediately(dummy_event_board_no_thread: EventBoard):
+    dummy_event_board_no_thread.get_event_handler([], flow_name="flow1", routines_events={"routine1": []})
+
+    future = dummy_event_board_no_thread.request_event(EVENT1.event_name)
+
+    assert future.done()
+    assert future.result() == {}
+
+
+def test_request_event_before_build_raises(dummy_event_board_no_thread: EventBoard):
+    dummy_event_board_no_thread.get_event_handler([EVENT1.event_name], flow_name="flow1",
+                                                  routines_events={"routine1": [EVENT1.event_name]})
+
+    with pytest.raises(PipeNotBuilt):
+        dummy_event_board_no_thread.request_event(EVENT1.event_name)
+
+
+def test_scheduled_events(dummy_event_board: EventBoard):
+    event_handler = dummy_event_board.get_event_handler([EVENT1.event_name])
+    dummy_event_board.build()
+
+    dummy_event_board.schedule_event(EVENT1.event_name, delay=0.05, value=1)
+    periodic_id = dummy_event_board.schedule_event(STOP_EVENT.event_name, delay=0.01, interval=0.01)
+
+    for _ in range(3):
+        assert event_handler.wait() == STOP_EVENT
+
+    assert dummy_event_board.cancel_scheduled_event(periodic_id)
+
+    event = event_handler.wait()
+    while event == STOP_EVENT:
+        event = event_handler.wait()
+
+    assert event == Method(EVENT1.event_name, params={"value": 1})
+    assert dummy_event_board.scheduling_jitter.get_stats()["count"] >= 4
+
+    dummy_event_board.notify_event(KILL_EVENT.event_name)
+    dummy_event_board.join()
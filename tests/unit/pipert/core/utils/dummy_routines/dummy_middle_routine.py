@@ -1,10 +1,15 @@
+import threading
 from pipert2.core.base.routines import MiddleRoutine
 from pipert2.utils.method_data import Method
+from pipert2.utils.parameter import Parameter
 
 DUMMY_ROUTINE_EVENT = Method("Change")
+DUMMY_MAILBOX_EVENT = Method("Reset", params={"counter": 0})
+DUMMY_STATUS_EVENT = Method("Status")
 
 
 class DummyMiddleRoutine(MiddleRoutine):
+    step = Parameter(int, 1, validator=lambda value: value > 0)
 
     def __init__(self, counter=0, **kwargs):
         super().__init__(**kwargs)
@@ -13,9 +18,9 @@ class DummyMiddleRoutine(MiddleRoutine):
 
     def main_logic(self, data):
         if self.inc:
-            self.counter += 1
+            self.counter += self.step
         else:
-            self.counter -= 1
+            self.counter -= self.step
 
         return {"value": self.counter}
 
@@ -29,6 +34,22 @@ class DummyMiddleRoutine(MiddleRoutine):
     def change_logic(self):
         self.inc = not self.inc
 
+    @MiddleRoutine.mailbox_events(DUMMY_MAILBOX_EVENT.event_name)
+    def reset_counter(self, counter):
+        self.counter = counter
+        self.reset_thread = threading.current_thread()
+
+
+class DummyMiddleRoutineStatus(DummyMiddleRoutine):
+
+    @MiddleRoutine.events(DUMMY_STATUS_EVENT.event_name)
+    def get_counter(self):
+        return self.counter
+
+    @MiddleRoutine.events(DUMMY_STATUS_EVENT.event_name)
+    def get_direction(self):
+        return self.inc
+
 
 class DummyMiddleRoutineException(MiddleRoutine):
 
@@ -0,0 +1,170 @@
+import sys
+import time
+import logging
+import threading
+import pytest
+from pipert2.utils import async_log_handler
+from pipert2.utils.async_log_handler import AsyncLogHandler
+
+
+class RecordingHandler(logging.Handler):
+
+    def __init__(self, delay=0):
+        super().__init__()
+        self.delay = delay
+        self.records = []
+        self.threads = set()
+        self.unblocked = threading.Event()
+        self.unblocked.set()
+
+    def emit(self, record):
+        self.unblocked.wait()
+        time.sleep(self.delay)
+        self.records.append(record)
+        self.threads.add(threading.current_thread())
+
+    def get_messages(self):
+        return [record.getMessage() for record in self.records]
+
+
+@pytest.fixture
+def dummy_recording_handler():
+    return RecordingHandler()
+
+
+@pytest.fixture
+def dummy_logger(request):
+    logger = logging.getLogger(f"test_async_log_handler.{request.node.name}")
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    handlers = []
+
+    def add_handler(handler: AsyncLogHandler):
+        handlers.append(handler)
+        logger.addHandler(handler)
+        return logger
+
+    yield add_handler
+
+    for handler in handlers:
+        logger.removeHandler(handler)
+        handler.close()
+
+
+def test_records_are_emitted_by_the_listener_thread(dummy_logger, dummy_recording_handler):
+    handler = AsyncLogHandler(dummy_recording_handler)
+    logger = dummy_logger(handler)
+
+    logger.info("first %s", 1)
+    logger.warning("second")
+    handler.flush()
+
+    assert dummy_recording_handler.get_messages() == ["first 1", "second"]
+    assert dummy_recording_handler.threads == {handler._listener_thread}
+
+
+def test_records_are_prepared_before_they_are_queued(dummy_logger, dummy_recording_handler):
+    handler = AsyncLogHandler(dummy_recording_handler)
+    logger = dummy_logger(handler)
+    dummy_recording_handler.unblocked.clear()
+    frame_ids = [1]
+
+    logger.info("frames %s", frame_ids)
+
+    try:
+        raise ValueError("failed")
+    except ValueError:
+        logger.exception("crashed")
+
+    frame_ids.append(2)
+    dummy_recording_handler.unblocked.set()
+    handler.flush()
+
+    assert dummy_recording_handler.get_messages() == ["frames [1]", "crashed"]
+    assert dummy_recording_handler.records[1].exc_info is None
+    assert "ValueError: failed" in dummy_recording_handler.records[1].exc_text
+
+
+def test_repeated_message_is_suppressed_and_summarized(dummy_logger, dummy_recording_handler):
+    handler = AsyncLogHandler(dummy_recording_handler, repeat_interval=0.1)
+    logger = dummy_logger(handler)
+
+    for _ in range(10):
+        logger.error("The routine has crashed")
+
+    logger.error("Another error")
+    time.sleep(0.3)
+    handler.flush()
+
+    assert dummy_recording_handler.get_messages() == ["The routine has crashed", "Another error",
+                                                      "The routine has crashed (suppressed 9 repetitions)"]
+
+
+def test_exceptions_of_suppressed_repetitions_are_not_formatted(mocker, dummy_recording_handler):
+    format_exception = mocker.patch.object(async_log_handler._EXCEPTION_FORMATTER, "formatException",
+                                           return_value="Traceback")
+    handler = AsyncLogHandler(dummy_recording_handler, repeat_interval=100)
+
+    for _ in range(5):
+        try:
+            raise ValueError("failed")
+        except ValueError:
+            handler.handle(logging.makeLogRecord({"name": "routine", "levelno": logging.ERROR,
+                                                  "msg": "The routine has crashed", "exc_info": sys.exc_info()}))
+
+    handler.close()
+
+    format_exception.assert_called_once()
+    assert dummy_recording_handler.get_messages() == ["The routine has crashed",
+                                                      "The routine has crashed (suppressed 4 repetitions)"]
+
+
+def test_repetitions_are_summarized_when_closed(dummy_recording_handler):
+    handler = AsyncLogHandler(dummy_recording_handler, repeat_interval=60)
+    logger = logging.getLogger("test_async_log_handler.closed")
+    logger.propagate = False
+    logger.addHandler(handler)
+
+    for _ in range(3):
+        logger.error("The queue is full!")
+
+    logger.removeHandler(handler)
+    handler.close()
+
+    assert dummy_recording_handler.get_messages() == ["The queue is full!",
+                                                      "The queue is full! (suppressed 2 repetitions)"]
+
+
+def test_logging_does_not_wait_for_a_slow_handler(dummy_logger):
+    slow_handler = RecordingHandler(delay=0.1)
+    handler = AsyncLogHandler(slow_handler)
+    logger = dummy_logger(handler)
+
+    start = time.monotonic()
+
+    for index in range(5):
+        logger.info(f"message {index}")
+
+    assert time.monotonic() - start < 0.1
+
+    handler.flush(timeout=2)
+
+    assert len(slow_handler.records) == 5
+
+
+def test_records_beyond_the_queue_size_are_dropped_and_reported(dummy_logger, dummy_recording_handler):
+    handler = AsyncLogHandler(dummy_recording_handler, max_queue_size=2, repeat_interval=0.05)
+    logger = dummy_logger(handler)
+    dummy_recording_handler.unblocked.clear()
+
+    for index in range(10):
+        logger.info(f"message {index}")
+
+    dummy_recording_handler.unblocked.set()
+    time.sleep(0.2)
+    handler.flush()
+
+    messages = dummy_recording_handler.get_messages()
+    assert handler.dropped >= 7
+    assert len(messages) - 1 + handler.dropped == 10
+    assert messages[-1] == f"Dropped {handler.dropped} log records, the log queue was full"
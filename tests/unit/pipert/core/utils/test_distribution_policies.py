@@ -0,0 +1,58 @@
+from queue import Queue
+from pipert2.utils.distribution_policies import KeyPartition, RoundRobin, LeastQueueDepth, stable_hash
+
+
+def test_key_partition_sends_same_key_to_same_output():
+    outputs = [Queue(), Queue(), Queue()]
+    key_partition = KeyPartition("camera_id")
+
+    for camera_id in range(10):
+        selected = key_partition.select({"camera_id": camera_id}, outputs)
+
+        assert len(selected) == 1
+        assert selected == key_partition.select({"camera_id": camera_id, "frame": 1}, outputs)
+        assert selected[0] == stable_hash(camera_id) % len(outputs)
+
+
+def test_key_partition_spreads_keys_across_outputs():
+    outputs = [Queue(), Queue(), Queue()]
+    key_partition = KeyPartition("camera_id")
+
+    selected_outputs = {key_partition.select({"camera_id": f"camera-{index}"}, outputs)[0] for index in range(30)}
+
+    assert selected_outputs == {0, 1, 2}
+
+
+def test_key_partition_without_key_is_consistent():
+    outputs = [Queue(), Queue()]
+    key_partition = KeyPartition("camera_id")
+
+    assert key_partition.select({}, outputs) == key_partition.select({"other": 1}, outputs)
+
+
+def test_stable_hash_is_consistent():
+    assert stable_hash("camera-1") == stable_hash("camera-1")
+    assert stable_hash(7) == stable_hash("7")
+
+
+def test_round_robin_takes_turns():
+    outputs = [Queue(), Queue(), Queue()]
+    round_robin = RoundRobin()
+
+    assert [round_robin.select({}, outputs)[0] for _ in range(6)] == [0, 1, 2, 0, 1, 2]
+
+
+def test_least_queue_depth_selects_shallowest_output():
+    outputs = [Queue(), Queue(), Queue()]
+    outputs[0].put("message")
+    outputs[2].put("message")
+    least_queue_depth = LeastQueueDepth()
+
+    assert all(least_queue_depth.select({}, outputs) == [1] for _ in range(3))
+
+
+def test_least_queue_depth_breaks_ties_in_turns():
+    outputs = [Queue(), Queue()]
+    least_queue_depth = LeastQueueDepth()
+
+    assert [least_queue_depth.select({}, outputs)[0] for _ in range(4)] == [0, 1, 0, 1]
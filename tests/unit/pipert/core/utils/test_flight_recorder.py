@@ -0,0 +1,72 @@
+import json
+import numpy as np
+from pipert2.core.base.message import Message
+from pipert2.utils.flight_recorder import FlightRecorder, summarize_payload, OUTCOME_SENT, OUTCOME_EXCEPTION
+
+
+def test_ring_keeps_the_last_messages_from_the_oldest():
+    recorder = FlightRecorder(size=3)
+
+    for index in range(5):
+        recorder.record(Message({"index": index}, "source"), OUTCOME_SENT)
+
+    records = recorder.get_records()
+
+    assert [record["sequence"] for record in records] == [2, 3, 4]
+    assert all(record["outcome"] == OUTCOME_SENT for record in records)
+    assert records[0]["source"] == "source"
+
+
+def test_summarize_payload_records_sizes_instead_of_values():
+    summary = summarize_payload({"frame": np.zeros((2, 3), dtype=np.uint8), "raw": b"1234", "count": 7})
+
+    assert summary == {"frame": 6, "raw": 4, "count": None}
+    assert summarize_payload(b"12") == {"bytes": 2}
+
+
+def test_record_uses_the_returned_data():
+    recorder = FlightRecorder()
+    message = Message({"frame": b"1234"}, "source")
+
+    recorder.record(message, OUTCOME_SENT, data={"address": "segment"})
+
+    assert recorder.get_records()[0]["payload"] == {"address": 7}
+
+
+def test_record_copies_the_history_times():
+    recorder = FlightRecorder()
+    message = Message({"frame": b"1234"}, "source")
+    message.record_entry("middle")
+    recorder.record(message, OUTCOME_SENT)
+
+    message.record_exit("middle")
+
+    assert recorder.get_records()[0]["history"]["middle"][1] is None
+
+
+def test_record_crash_without_message():
+    recorder = FlightRecorder()
+    recorder.record(None, OUTCOME_EXCEPTION, error=ValueError("bad"))
+
+    record = recorder.get_records()[0]
+
+    assert record["id"] is None
+    assert record["payload"] is None
+    assert record["error"] == repr(ValueError("bad"))
+
+
+def test_dump_writes_details_and_records(tmp_path):
+    recorder = FlightRecorder()
+    message = Message({"frame": b"1234"}, "source")
+    message.record_entry("middle")
+    recorder.record(message, OUTCOME_SENT)
+
+    path = tmp_path / "dump.json"
+    recorder.dump(str(path), routine="middle")
+
+    dump = json.loads(path.read_text())
+
+    assert dump["routine"] == "middle"
+    assert len(dump["records"]) == 1
+    assert dump["records"][0]["payload"] == {"frame": 4}
+    assert "middle" in dump["records"][0]["history"]
@@ -0,0 +1,116 @@
+import time
+import pytest
+from queue import Full, Empty
+from multiprocessing import Process
+from pipert2.utils.frame_queue import FrameQueue
+
+
+@pytest.fixture()
+def dummy_frame_queue():
+    dummy_frame_queue = FrameQueue(maxsize=2)
+
+    return dummy_frame_queue
+
+
+def put_frames(frame_queue: FrameQueue, frames: list):
+    for frame in frames:
+        frame_queue.put(frame)
+
+
+def test_put_and_get_returns_the_same_frame(dummy_frame_queue):
+    dummy_frame_queue.put(b"frame")
+
+    assert dummy_frame_queue.get(block=True, timeout=1) == b"frame"
+
+
+def test_get_from_empty_queue_raises_empty(dummy_frame_queue):
+    with pytest.raises(Empty):
+        dummy_frame_queue.get(block=False)
+
+    with pytest.raises(Empty):
+        dummy_frame_queue.get(block=True, timeout=0.1)
+
+
+def test_put_to_full_queue_raises_full(dummy_frame_queue):
+    dummy_frame_queue.put(b"1")
+    dummy_frame_queue.put(b"2")
+
+    assert dummy_frame_queue.full()
+
+    with pytest.raises(Full):
+        dummy_frame_queue.put(b"3", block=False)
+
+    assert dummy_frame_queue.get(timeout=1) == b"1"
+    assert dummy_frame_queue.qsize() == 1
+
+
+def test_put_not_bytes_is_dropped(dummy_frame_queue):
+    dummy_frame_queue.put("not a frame")
+
+    assert dummy_frame_queue.drops.value == 1
+    assert dummy_frame_queue.qsize() == 0
+
+
+def test_queue_with_buffered_frames_is_not_empty(dummy_frame_queue):
+    with dummy_frame_queue._write_lock:
+        dummy_frame_queue.put(b"frame")
+
+        assert not dummy_frame_queue.empty()
+
+    assert dummy_frame_queue.get(block=True, timeout=1) == b"frame"
+    assert dummy_frame_queue.empty()
+
+
+def test_frames_abandoned_by_the_feeder_are_not_counted(dummy_frame_queue, mocker):
+    mocker.patch("pipert2.utils.frame_queue.FEEDER_JOIN_TIMEOUT", 0.1)
+
+    with dummy_frame_queue._write_lock:
+        dummy_frame_queue.put(b"first")
+        dummy_frame_queue.put(b"second")
+
+        # The feeder holds the first frame while it waits to write it, the second frame is abandoned.
+        deadline = time.monotonic() + 1
+        while len(dummy_frame_queue._buffer) > 1 and time.monotonic() < deadline:
+            time.sleep(0.001)
+
+        FrameQueue._finalize_feeder(dummy_frame_queue._buffer, dummy_frame_queue._not_empty,
+                                    dummy_frame_queue._feeder_thread, dummy_frame_queue._sem,
+                                    dummy_frame_queue._bytes_released, dummy_frame_queue._bytes)
+
+        assert dummy_frame_queue.qsize() == 1
+        assert dummy_frame_queue.qbytes() == len(b"first")
+
+    assert dummy_frame_queue.get(block=True, timeout=1) == b"first"
+    assert dummy_frame_queue.empty()
+
+
+def test_frames_are_passed_between_processes(dummy_frame_queue):
+    frames = [b"a" * 100, b"b" * 1000000, b"c"]
+    producer = Process(target=put_frames, args=(dummy_frame_queue, frames))
+    producer.start()
+
+    received_frames = [dummy_frame_queue.get(timeout=3) for _ in frames]
+    producer.join()
+
+    assert received_frames == frames
+
+
+def test_bytes_budget_limits_the_queue():
+    frame_queue = FrameQueue(maxsize=10, max_bytes=10)
+    frame_queue.put(b"a" * 6)
+
+    with pytest.raises(Full):
+        frame_queue.put(b"b" * 6, block=False)
+
+    frame_queue.put(b"c" * 4, block=False)
+
+    assert frame_queue.qbytes() == 10
+    assert frame_queue.get(timeout=1) == b"a" * 6
+    assert frame_queue.qbytes() == 4
+
+
+def test_frame_larger_than_the_bytes_budget_enters_an_empty_queue():
+    frame_queue = FrameQueue(maxsize=10, max_bytes=10)
+    frame_queue.put(b"a" * 20, block=False)
+
+    assert frame_queue.get(timeout=1) == b"a" * 20
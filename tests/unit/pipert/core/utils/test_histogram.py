@@ -0,0 +1,32 @@
+import pytest
+from pipert2.utils.histogram import histogram_index, histogram_upper_bound, histogram_percentiles, HISTOGRAM_SIZE
+
+
+@pytest.mark.parametrize("value", [0, 1, 3, 4, 7, 8, 9, 100, 1023, 1024, 123456789, 2 ** 40 - 1])
+def test_value_is_within_its_bucket(value):
+    index = histogram_index(value)
+
+    assert value <= histogram_upper_bound(index)
+    assert index == 0 or histogram_upper_bound(index - 1) < value
+
+
+def test_bucket_width_is_relative_to_its_values():
+    for value in (10, 1000, 10 ** 6, 10 ** 9):
+        assert histogram_upper_bound(histogram_index(value)) <= value * 1.25
+
+
+def test_huge_values_share_the_last_bucket():
+    assert histogram_index(2 ** 50) == HISTOGRAM_SIZE - 1
+
+
+def test_histogram_percentiles():
+    buckets = [0] * HISTOGRAM_SIZE
+
+    for value in range(1, 101):
+        buckets[histogram_index(value * 1000)] += 1
+
+    percentiles = histogram_percentiles(buckets, (50, 99))
+
+    assert 50000 <= percentiles[50] <= 50000 * 1.25
+    assert 99000 <= percentiles[99] <= 99000 * 1.25
+    assert histogram_percentiles([0] * HISTOGRAM_SIZE) == {50: 0, 90: 0, 99: 0}
@@ -0,0 +1,53 @@
+import pytest
+from pipert2.utils.queue_wrapper import QueueInput
+from pipert2.utils.input_schedulers import RoundRobinScheduler, WeightedFairScheduler, PriorityScheduler
+
+
+@pytest.fixture()
+def dummy_inputs():
+    return [QueueInput("heavy", queue=None, weight=3), QueueInput("light", queue=None, weight=1)]
+
+
+def serve(scheduler, inputs, times):
+    served_names = []
+
+    for _ in range(times):
+        queue_input = scheduler.order(inputs)[0]
+        scheduler.served(queue_input)
+        served_names.append(queue_input.name)
+
+    return served_names
+
+
+def test_round_robin_serves_the_inputs_in_turns(dummy_inputs):
+    assert serve(RoundRobinScheduler(), dummy_inputs, 4) == ["heavy", "light", "heavy", "light"]
+
+
+def test_round_robin_continues_after_the_served_input(dummy_inputs):
+    scheduler = RoundRobinScheduler()
+    scheduler.served(dummy_inputs[1])
+
+    assert scheduler.order(dummy_inputs) == dummy_inputs
+
+
+def test_weighted_fair_serves_the_inputs_by_their_weights(dummy_inputs):
+    served_names = serve(WeightedFairScheduler(), dummy_inputs, 400)
+
+    assert served_names.count("heavy") == 300
+    assert served_names.count("light") == 100
+
+
+def test_weighted_fair_idle_input_does_not_accumulate_credit(dummy_inputs):
+    scheduler = WeightedFairScheduler()
+    heavy_input, light_input = dummy_inputs
+
+    for _ in range(100):
+        scheduler.served(heavy_input)
+
+    served_names = serve(scheduler, dummy_inputs, 40)
+
+    assert 10 <= served_names.count("light") <= 11
+
+
+def test_priority_serves_the_highest_weight_first(dummy_inputs):
+    assert serve(PriorityScheduler(), list(reversed(dummy_inputs)), 3) == ["heavy", "heavy", "heavy"]
@@ -0,0 +1,54 @@
+import pytest
+from collections import OrderedDict
+from pipert2.utils.latency_tracker import LatencyTracker
+
+MS = 1_000_000
+
+
+@pytest.fixture()
+def dummy_latency_tracker():
+    return LatencyTracker()
+
+
+def test_queue_wait_and_service_time_are_separated(dummy_latency_tracker: LatencyTracker):
+    history = OrderedDict([("source", [None, 0]), ("middle", [10 * MS, 11 * MS]), ("destination", [12 * MS, 13 * MS])])
+
+    dummy_latency_tracker.record(history)
+    stats = dummy_latency_tracker.get_stats()
+
+    middle_stats = stats["hops"]["middle"]
+    assert middle_stats["queue_wait"]["mean"] == pytest.approx(0.01)
+    assert middle_stats["service_time"]["mean"] == pytest.approx(0.001)
+    assert stats["hops"]["source"]["service_time"]["count"] == 0
+    assert stats["paths"]["source -> middle -> destination"]["max"] == pytest.approx(0.013)
+
+
+def test_latency_percentiles(dummy_latency_tracker: LatencyTracker):
+    for latency in range(1, 1001):
+        dummy_latency_tracker.record(OrderedDict([("source", [None, 0]), ("destination", [latency * MS, latency * MS])]))
+
+    path_stats = dummy_latency_tracker.get_stats()["paths"]["source -> destination"]
+
+    assert path_stats["count"] == 1000
+    assert 0.5 <= path_stats["p50"] <= 0.5 * 1.25
+    assert 0.99 <= path_stats["p99"] <= path_stats["p99.9"] <= path_stats["max"] == pytest.approx(1)
+
+
+def test_paths_are_tracked_separately(dummy_latency_tracker: LatencyTracker):
+    dummy_latency_tracker.record(OrderedDict([("a", [None, 0]), ("destination", [MS, MS])]))
+    dummy_latency_tracker.record(OrderedDict([("b", [None, 0]), ("destination", [MS, 2 * MS])]))
+
+    assert set(dummy_latency_tracker.get_stats()["paths"]) == {"a -> destination", "b -> destination"}
+
+
+def test_cross_host_hops_are_not_recorded(dummy_latency_tracker: LatencyTracker):
+    history = OrderedDict([("source", [None, 5 * MS]), ("middle", [MS, 2 * MS]), ("destination", [3 * MS, 4 * MS])])
+
+    dummy_latency_tracker.record(history, cross_host_routines={"middle"})
+    stats = dummy_latency_tracker.get_stats()
+
+    assert stats["hops"]["middle"]["queue_wait"]["count"] == 0
+    assert stats["hops"]["middle"]["service_time"]["count"] == 1
+    assert stats["hops"]["destination"]["queue_wait"]["count"] == 1
+    assert stats["paths"] == {}
+    assert stats["cross_host_messages"] == 1
@@ -0,0 +1,63 @@
+import time
+import pytest
+from pipert2.utils.message_batcher import MessageBatcher
+
+
+@pytest.fixture
+def dummy_batches():
+    return []
+
+
+@pytest.fixture
+def dummy_batcher(dummy_batches):
+    return MessageBatcher(dummy_batches.append, max_size=3, max_delay=60)
+
+
+def test_batch_is_flushed_when_full(dummy_batcher, dummy_batches):
+    for message in range(7):
+        dummy_batcher.add(message)
+
+    assert dummy_batches == [[0, 1, 2], [3, 4, 5]]
+
+
+def test_flush_sends_partial_batch(dummy_batcher, dummy_batches):
+    dummy_batcher.add(0)
+    dummy_batcher.flush()
+    dummy_batcher.flush()
+
+    assert dummy_batches == [[0]]
+
+
+def test_batch_is_flushed_after_max_delay(dummy_batches):
+    dummy_batcher = MessageBatcher(dummy_batches.append, max_size=100, max_delay=0.01)
+
+    dummy_batcher.add(0)
+    dummy_batcher.add(1)
+
+    deadline = time.monotonic() + 1
+    while not dummy_batches and time.monotonic() < deadline:
+        time.sleep(0.005)
+
+    assert dummy_batches == [[0, 1]]
+
+
+def test_timer_keeps_flushing_after_a_failed_flush(mocker, dummy_batches):
+    def flush_batch(batch):
+        if batch == [0]:
+            raise ValueError("Failed to send")
+
+        dummy_batches.append(batch)
+
+    logger = mocker.MagicMock()
+    dummy_batcher = MessageBatcher(flush_batch, max_size=100, max_delay=0.01, get_logger=lambda: logger)
+
+    dummy_batcher.add(0)
+    time.sleep(0.05)
+    dummy_batcher.add(1)
+
+    deadline = time.monotonic() + 1
+    while not dummy_batches and time.monotonic() < deadline:
+        time.sleep(0.005)
+
+    assert dummy_batches == [[1]]
+    logger.exception.assert_called_once()
@@ -0,0 +1,50 @@
+import pytest
+from urllib.request import urlopen
+from urllib.error import HTTPError
+from pipert2.utils.metrics_server import MetricsServer, format_prometheus
+
+SERVICE_TIME = {"count": 4, "mean": 0.5, "max": 1.0, "p50": 0.25, "p90": 0.75, "p99": 1.0}
+ROUTINE_METRICS = {"messages_in": 4, "messages_out": 3, "exceptions": 1, "drops": 2, "queue_depth": 5,
+                   "max_queue_depth": 6, "service_time": SERVICE_TIME}
+METRICS = {"flow": {"routine": ROUTINE_METRICS}}
+
+
+@pytest.fixture()
+def dummy_metrics_server():
+    dummy_metrics_server = MetricsServer(lambda: METRICS)
+    dummy_metrics_server.start()
+    yield dummy_metrics_server
+    dummy_metrics_server.stop()
+
+
+def test_format_prometheus():
+    lines = format_prometheus(METRICS).splitlines()
+
+    assert "# TYPE pipert_routine_messages_in_total counter" in lines
+    assert 'pipert_routine_messages_in_total{flow="flow",routine="routine"} 4' in lines
+    assert 'pipert_routine_drops_total{flow="flow",routine="routine"} 2' in lines
+    assert 'pipert_routine_queue_depth{flow="flow",routine="routine"} 5' in lines
+    assert 'pipert_routine_service_time_seconds{flow="flow",routine="routine",quantile="0.99"} 1.0' in lines
+    assert 'pipert_routine_service_time_seconds_sum{flow="flow",routine="routine"} 2.0' in lines
+    assert 'pipert_routine_service_time_seconds_count{flow="flow",routine="routine"} 4' in lines
+
+
+def test_format_prometheus_escapes_labels():
+    lines = format_prometheus({'fl"ow': {"rou\\tine": ROUTINE_METRICS}}).splitlines()
+
+    assert 'pipert_routine_exceptions_total{flow="fl\\"ow",routine="rou\\\\tine"} 1' in lines
+
+
+def test_metrics_server(dummy_metrics_server: MetricsServer):
+    host, port = dummy_metrics_server.address
+
+    with urlopen(f"http://{host}:{port}/metrics") as response:
+        assert response.headers["Content-Type"].startswith("text/plain")
+        assert response.read().decode() == format_prometheus(METRICS)
+
+
+def test_metrics_server_unknown_path(dummy_metrics_server: MetricsServer):
+    host, port = dummy_metrics_server.address
+
+    with pytest.raises(HTTPError):
+        urlopen(f"http://{host}:{port}/other")
@@ -0,0 +1,40 @@
+from queue import Queue
+from pipert2.utils.output_route import OutputRoute, NO_DATA
+from pipert2.utils.distribution_policies import RoundRobin
+
+
+def test_route_without_conditions_passes_everything():
+    route = OutputRoute([1, 2])
+
+    assert route.get_data({"dummy": 1}) == {"dummy": 1}
+    assert route.select({"dummy": 1}, list) == [1, 2]
+    assert not route.is_conditional()
+
+
+def test_route_with_port_takes_port_data():
+    route = OutputRoute([0], port="night")
+
+    assert route.get_data({"night": {"frame": 1}, "day": {"frame": 2}}) == {"frame": 1}
+    assert route.get_data({"day": {"frame": 2}}) is NO_DATA
+    assert route.get_data(None) is NO_DATA
+
+
+def test_route_with_predicate_filters_data():
+    route = OutputRoute([0], predicate=lambda data: data["score"] > 0.5)
+
+    assert route.get_data({"score": 0.9}) == {"score": 0.9}
+    assert route.get_data({"score": 0.1}) is NO_DATA
+
+
+def test_route_with_distribution_policy_selects_among_its_outputs():
+    outputs = [Queue(), Queue(), Queue()]
+    route = OutputRoute([1, 2], distribution_policy=RoundRobin())
+
+    assert [route.select({}, lambda: outputs) for _ in range(3)] == [[1], [2], [1]]
+
+
+def test_disabled_route_passes_nothing():
+    route = OutputRoute([0], enabled=False)
+
+    assert route.get_data({"dummy": 1}) is NO_DATA
+    assert route.is_conditional()
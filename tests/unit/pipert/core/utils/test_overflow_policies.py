@@ -0,0 +1,90 @@
+import time
+import pytest
+from queue import Empty
+from pipert2.utils.frame_queue import FrameQueue
+from pipert2.utils.queue_wrapper import WakeupQueue
+from pipert2.utils.overflow_policies import DropOldest, DropNewest, BlockWithTimeout, KeepLatest, SampleEveryNth
+
+
+@pytest.fixture()
+def dummy_queue():
+    dummy_queue = WakeupQueue(maxsize=2)
+
+    return dummy_queue
+
+
+def get_all(queue):
+    values = []
+
+    while True:
+        try:
+            values.append(queue.get(block=False))
+        except Empty:
+            return values
+
+
+def test_drop_oldest(dummy_queue):
+    for value in range(4):
+        DropOldest().push(dummy_queue, value)
+
+    assert get_all(dummy_queue) == [2, 3]
+    assert dummy_queue.drops.value == 2
+
+
+def test_drop_newest(dummy_queue):
+    for value in range(4):
+        DropNewest().push(dummy_queue, value)
+
+    assert get_all(dummy_queue) == [0, 1]
+    assert dummy_queue.drops.value == 2
+
+
+def test_block_with_timeout_drops_after_timeout(dummy_queue):
+    policy = BlockWithTimeout(timeout=0.1)
+
+    for value in range(3):
+        policy.push(dummy_queue, value)
+
+    assert get_all(dummy_queue) == [0, 1]
+    assert dummy_queue.drops.value == 1
+
+
+def test_keep_latest(dummy_queue):
+    policy = KeepLatest()
+    policy.push(dummy_queue, 0)
+    policy.push(dummy_queue, 1)
+
+    assert get_all(dummy_queue) == [1]
+    assert dummy_queue.drops.value == 1
+
+
+def test_sample_every_nth(dummy_queue):
+    policy = SampleEveryNth(3)
+
+    for value in range(6):
+        policy.push(dummy_queue, value)
+
+    assert get_all(dummy_queue) == [0, 3]
+    assert dummy_queue.drops.value == 4
+
+
+def test_sample_every_nth_rejects_n_below_one():
+    with pytest.raises(ValueError):
+        SampleEveryNth(0)
+
+
+def test_keep_latest_evicts_frames_waiting_in_the_feeder():
+    frame_queue = FrameQueue(maxsize=2)
+
+    with frame_queue._write_lock:
+        frame_queue.put(b"0")
+
+        # The feeder takes the first frame and waits for the pipe, the second frame waits in its buffer.
+        while frame_queue._buffer:
+            time.sleep(0.001)
+
+        frame_queue.put(b"1")
+        KeepLatest().push(frame_queue, b"2")
+
+    assert [frame_queue.get(timeout=1) for _ in range(2)] == [b"0", b"2"]
+    assert frame_queue.drops.value == 1
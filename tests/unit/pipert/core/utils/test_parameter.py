@@ -0,0 +1,34 @@
+import pytest
+from pipert2.utils.parameter import Parameter
+from pipert2.utils.exceptions import InvalidRoutineParameter
+
+
+class DummyTunable:
+    threshold = Parameter(float, 0.5, validator=lambda value: 0 <= value <= 1)
+    size = Parameter(int, 10)
+
+
+@pytest.fixture()
+def dummy_tunable():
+    return DummyTunable()
+
+
+def test_parameter_default(dummy_tunable: DummyTunable):
+    assert dummy_tunable.threshold == 0.5
+    assert dummy_tunable.size == 10
+
+
+def test_parameter_set(dummy_tunable: DummyTunable):
+    dummy_tunable.threshold = 1
+    dummy_tunable.size = 20
+
+    assert dummy_tunable.threshold == 1.0
+    assert isinstance(dummy_tunable.threshold, float)
+    assert dummy_tunable.size == 20
+    assert DummyTunable().size == 10
+
+
+@pytest.mark.parametrize("name,value", [("threshold", "high"), ("threshold", 1.5), ("size", 2.5), ("size", True)])
+def test_invalid_parameter_value(dummy_tunable: DummyTunable, name, value):
+    with pytest.raises(InvalidRoutineParameter):
+        setattr(dummy_tunable, name, value)
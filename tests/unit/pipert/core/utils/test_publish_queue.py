@@ -56,3 +56,14 @@ def test_blocking_put(dummy_publish_queue):
     assert queue.get() == "1"
 
     dummy_publish_queue._queues = []
+
+
+def test_put_to_single_queue(dummy_publish_queue):
+    queue1 = Queue(maxsize=1)
+    queue2 = Queue(maxsize=1)
+    dummy_publish_queue.register(queue1)
+    dummy_publish_queue.register(queue2)
+    dummy_publish_queue.put_to(1, "message")
+
+    assert queue1.empty()
+    assert queue2.get() == "message"
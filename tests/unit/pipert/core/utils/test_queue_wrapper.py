@@ -1,8 +1,13 @@
+import os
 import time
 import pytest
-from queue import Queue as thQueue, Empty
-from multiprocessing import Queue as mpQueue
+from threading import Timer, Lock
+from queue import Queue as thQueue, Empty, Full
+from pipert2.core.base.message import Message
+from pipert2.utils.frame_queue import FrameQueue
 from pipert2.utils.queue_wrapper import QueueWrapper
+from pipert2.utils.publish_queue import PublishQueue
+from pipert2.utils.input_schedulers import PriorityScheduler
 
 
 @pytest.fixture()
@@ -15,9 +20,7 @@ def dummy_queue_wrapper():
 def test_get_queue_process_safe(dummy_queue_wrapper):
     return_queue = dummy_queue_wrapper.get_queue(process_safe=True)
 
-    assert isinstance(return_queue, type(mpQueue()))
-
-    dummy_queue_wrapper.kill_queue_worker()
+    assert isinstance(return_queue, FrameQueue)
 
 
 def test_get_queue_not_process_safe(dummy_queue_wrapper):
@@ -34,11 +37,133 @@ def test_get_from_threading_and_processing_queue(dummy_queue_wrapper):
     time.sleep(0.1)
     assert dummy_queue_wrapper.get(block=False, timeout=1) == "message"
 
-    process_queue.put("message")
+    process_queue.put(b"message")
     time.sleep(0.1)
-    assert dummy_queue_wrapper.get(block=False, timeout=1) == "message"
+    assert dummy_queue_wrapper.get(block=False, timeout=1) == b"message"
 
     with pytest.raises(Empty):
         dummy_queue_wrapper.get(block=True, timeout=1)
 
-    dummy_queue_wrapper.kill_queue_worker()
+
+def test_blocking_get_wakes_up_on_threading_queue_put(dummy_queue_wrapper):
+    thread_queue = dummy_queue_wrapper.get_queue(process_safe=False)
+    dummy_queue_wrapper.get_queue(process_safe=True)
+
+    Timer(0.1, thread_queue.put, args=("message",)).start()
+
+    start_time = time.time()
+    assert dummy_queue_wrapper.get(block=True, timeout=3) == "message"
+    assert time.time() - start_time < 1
+
+
+def test_blocking_get_wakes_up_on_process_queue_put(dummy_queue_wrapper):
+    dummy_queue_wrapper.get_queue(process_safe=False)
+    process_queue = dummy_queue_wrapper.get_queue(process_safe=True)
+
+    Timer(0.1, process_queue.put, args=(b"message",)).start()
+
+    start_time = time.time()
+    assert dummy_queue_wrapper.get(block=True, timeout=3) == b"message"
+    assert time.time() - start_time < 1
+
+
+def test_get_alternates_between_inputs():
+    dummy_queue_wrapper = QueueWrapper(max_queue_size=2)
+    thread_queue = dummy_queue_wrapper.get_queue(process_safe=False)
+    process_queue = dummy_queue_wrapper.get_queue(process_safe=True)
+
+    thread_queue.put("thread1")
+    thread_queue.put("thread2")
+    process_queue.put(b"process1")
+    time.sleep(0.1)
+
+    assert dummy_queue_wrapper.get(block=True, timeout=1) == "thread1"
+    assert dummy_queue_wrapper.get(block=True, timeout=1) == b"process1"
+    assert dummy_queue_wrapper.get(block=True, timeout=1) == "thread2"
+
+
+def test_each_input_name_gets_its_own_queue(dummy_queue_wrapper):
+    first_queue = dummy_queue_wrapper.get_queue(process_safe=False, input_name="first")
+    second_queue = dummy_queue_wrapper.get_queue(process_safe=False, input_name="second")
+
+    assert first_queue is not second_queue
+    assert dummy_queue_wrapper.get_queue(process_safe=False, input_name="first") is first_queue
+
+
+def test_get_by_input_priority():
+    dummy_queue_wrapper = QueueWrapper(max_queue_size=2, scheduler=PriorityScheduler())
+    low_queue = dummy_queue_wrapper.get_queue(process_safe=False, input_name="low", weight=1)
+    high_queue = dummy_queue_wrapper.get_queue(process_safe=False, input_name="high", weight=2)
+
+    low_queue.put("low")
+    high_queue.put("high1")
+    high_queue.put("high2")
+
+    assert dummy_queue_wrapper.get(block=True, timeout=1) == "high1"
+    assert dummy_queue_wrapper.get(block=True, timeout=1) == "high2"
+    assert dummy_queue_wrapper.get(block=True, timeout=1) == "low"
+
+
+def test_inputs_stats_count_depth_and_drops(dummy_queue_wrapper):
+    publish_queue = PublishQueue()
+    publish_queue.register(dummy_queue_wrapper.get_queue(process_safe=False, input_name="camera"))
+    dummy_queue_wrapper.get_queue(process_safe=False, input_name="sensor")
+
+    publish_queue.put("1")
+    publish_queue.put("2")
+    publish_queue.put("3")
+
+    assert dummy_queue_wrapper.get_inputs_stats() == {
+        "camera": {"depth": 1, "bytes": 0, "drops": 2},
+        "sensor": {"depth": 0, "bytes": 0, "drops": 0}
+    }
+
+
+def test_input_with_bytes_budget(dummy_queue_wrapper):
+    small_messages_queue = dummy_queue_wrapper.get_queue(process_safe=False, input_name="telemetry",
+                                                         max_size=100, max_bytes=10)
+
+    for _ in range(5):
+        small_messages_queue.put(b"ab", block=False)
+
+    with pytest.raises(Full):
+        small_messages_queue.put(b"ab", block=False)
+
+    assert dummy_queue_wrapper.get_inputs_stats()["telemetry"] == {"depth": 5, "bytes": 10, "drops": 0}
+
+
+def test_input_without_bytes_budget_doesnt_measure_messages(dummy_queue_wrapper, mocker):
+    item_size = mocker.patch("pipert2.utils.queue_wrapper._item_size")
+    messages_queue = dummy_queue_wrapper.get_queue(process_safe=False, input_name="camera", max_size=100)
+
+    messages_queue.put(b"abc", block=False)
+    messages_queue.get(block=False)
+
+    item_size.assert_not_called()
+
+
+def test_bytes_budget_counts_messages_that_were_not_pickled(dummy_queue_wrapper):
+    messages_queue = dummy_queue_wrapper.get_queue(process_safe=False, input_name="camera", max_size=100, max_bytes=10)
+    unpicklable_message = Message({"frame": b"12345678", "lock": Lock()}, "camera")
+
+    messages_queue.put(unpicklable_message, block=False)
+
+    with pytest.raises(Full):
+        messages_queue.put(unpicklable_message, block=False)
+
+    assert messages_queue.qbytes() == 8
+
+
+def test_close_closes_the_wakeup_pipe(dummy_queue_wrapper):
+    dummy_queue_wrapper.get_queue(process_safe=False, input_name="camera")
+    dummy_queue_wrapper.get_queue(process_safe=True, input_name="sensor")
+
+    with pytest.raises(Empty):
+        dummy_queue_wrapper.get(block=True, timeout=0.01)
+
+    wakeup_reader, wakeup_writer = dummy_queue_wrapper._wakeup_reader, dummy_queue_wrapper._wakeup_writer
+    dummy_queue_wrapper.close()
+
+    for descriptor in (wakeup_reader, wakeup_writer):
+        with pytest.raises(OSError):
+            os.fstat(descriptor)
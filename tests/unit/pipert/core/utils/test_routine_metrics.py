@@ -0,0 +1,63 @@
+import pytest
+from pipert2.utils.clock import perf_counter_ns
+from multiprocessing import Process
+from pipert2.utils.routine_metrics import RoutineMetrics, PUBLISH_EVERY_RECORDS
+
+
+@pytest.fixture()
+def dummy_routine_metrics():
+    dummy_routine_metrics = RoutineMetrics()
+    dummy_routine_metrics.queue_depth_getter = lambda: 3
+    return dummy_routine_metrics
+
+
+def test_metrics_are_published_when_flushed(dummy_routine_metrics: RoutineMetrics):
+    dummy_routine_metrics.record(perf_counter_ns(), sent=1)
+    dummy_routine_metrics.record(perf_counter_ns(), sent=0)
+    dummy_routine_metrics.record_exception()
+    dummy_routine_metrics.flush()
+
+    stats = dummy_routine_metrics.get_stats()
+
+    assert stats["messages_in"] == 3
+    assert stats["messages_out"] == 1
+    assert stats["exceptions"] == 1
+    assert stats["queue_depth"] == stats["max_queue_depth"] == 3
+    assert stats["service_time"]["count"] == 2
+    assert 0 < stats["service_time"]["p50"] <= stats["service_time"]["max"]
+
+
+def test_metrics_are_published_every_few_records(dummy_routine_metrics: RoutineMetrics):
+    dummy_routine_metrics.publish(perf_counter_ns())
+
+    for _ in range(PUBLISH_EVERY_RECORDS - 1):
+        dummy_routine_metrics.record(perf_counter_ns(), sent=1)
+
+    assert dummy_routine_metrics.get_stats()["messages_in"] == 0
+
+    dummy_routine_metrics.record(perf_counter_ns(), sent=1)
+
+    assert dummy_routine_metrics.get_stats()["messages_in"] == PUBLISH_EVERY_RECORDS
+
+
+def test_exceptions_are_published_every_few_records(dummy_routine_metrics: RoutineMetrics):
+    dummy_routine_metrics.publish(perf_counter_ns())
+
+    for _ in range(PUBLISH_EVERY_RECORDS):
+        dummy_routine_metrics.record_exception(received=0)
+
+    assert dummy_routine_metrics.get_stats()["exceptions"] == PUBLISH_EVERY_RECORDS
+
+
+def test_metrics_are_readable_from_another_process(dummy_routine_metrics: RoutineMetrics):
+    def record_messages():
+        for _ in range(10):
+            dummy_routine_metrics.record(perf_counter_ns(), sent=2, received=0)
+
+        dummy_routine_metrics.flush()
+
+    process = Process(target=record_messages)
+    process.start()
+    process.join()
+
+    assert dummy_routine_metrics.get_stats()["messages_out"] == 20
@@ -1,5 +1,7 @@
 import pytest
-from pipert2.utils.shared_memory_manager import SharedMemoryManager
+import threading
+from pipert2.utils.exceptions import SharedMemoryPayloadTooLarge
+from pipert2.utils.shared_memory_manager import SharedMemoryManager, aggregate_shared_memory_stats
 
 
 MAX_SEGMENT_COUNT = 50
@@ -35,6 +37,86 @@ def test_max_count(dummy_shared_memory_manager):
     assert test_data != dummy_shared_memory_manager.read_from_mem(first_memory, len(test_data))
 
 
+def test_stats_count_writes_and_reads(dummy_shared_memory_manager):
+    before = dummy_shared_memory_manager.get_stats()
+    memory_name = dummy_shared_memory_manager.write_to_mem(b"CCCC")
+    dummy_shared_memory_manager.read_from_mem(memory_name, 4)
+    after = dummy_shared_memory_manager.get_stats()
+
+    assert after["writes"] - before["writes"] == 1
+    assert after["bytes_written"] - before["bytes_written"] == 4
+    assert after["reads"] - before["reads"] == 1
+    assert after["bytes_read"] - before["bytes_read"] == 4
+    assert after["segments_allocated"] == MAX_SEGMENT_COUNT
+
+
+def test_stats_count_writes_from_concurrent_threads(dummy_shared_memory_manager):
+    before = dummy_shared_memory_manager.get_stats()
+
+    def write():
+        for _ in range(200):
+            dummy_shared_memory_manager.write_to_mem(b"D")
+
+    threads = [threading.Thread(target=write) for _ in range(4)]
+
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+    after = dummy_shared_memory_manager.get_stats()
+
+    assert after["writes"] - before["writes"] == 800
+    assert after["bytes_written"] - before["bytes_written"] == 800
+
+
+def test_stats_count_overwrites_of_unread_segments(dummy_shared_memory_manager):
+    for _ in range(MAX_SEGMENT_COUNT):
+        dummy_shared_memory_manager.read_from_mem(dummy_shared_memory_manager.write_to_mem(b"D"), 1)
+
+    before = dummy_shared_memory_manager.get_stats()
+
+    for _ in range(MAX_SEGMENT_COUNT):
+        dummy_shared_memory_manager.write_to_mem(b"E")
+
+    assert dummy_shared_memory_manager.get_stats()["segments_in_use"] == MAX_SEGMENT_COUNT
+    assert dummy_shared_memory_manager.get_stats()["overwrites"] == before["overwrites"]
+
+    dummy_shared_memory_manager.write_to_mem(b"F")
+
+    assert dummy_shared_memory_manager.get_stats()["overwrites"] == before["overwrites"] + 1
+
+
+def test_write_too_large_data_raises_and_is_counted(dummy_shared_memory_manager):
+    segment_size = dummy_shared_memory_manager.shared_memory_generator.segment_size
+    before = dummy_shared_memory_manager.get_stats()
+
+    with pytest.raises(SharedMemoryPayloadTooLarge):
+        dummy_shared_memory_manager.write_to_mem(bytes(segment_size + 1))
+
+    after = dummy_shared_memory_manager.get_stats()
+    assert after["oversize_failures"] == before["oversize_failures"] + 1
+    assert after["largest_oversize"] >= segment_size + 1
+    assert after["writes"] == before["writes"]
+
+
+def test_aggregate_shared_memory_stats_sums_counts_and_takes_maximal_sizes():
+    first = dict.fromkeys(["segments_allocated", "segments_in_use", "writes", "bytes_written", "reads", "bytes_read",
+                           "overwrites", "oversize_failures"], 1)
+    second = dict(first)
+    first.update(segment_size=10, largest_write=3, largest_oversize=0)
+    second.update(segment_size=10, largest_write=7, largest_oversize=12)
+
+    aggregated = aggregate_shared_memory_stats([first, second])
+
+    assert aggregated["writes"] == 2
+    assert aggregated["overwrites"] == 2
+    assert aggregated["largest_write"] == 7
+    assert aggregated["largest_oversize"] == 12
+    assert aggregated["segment_size"] == 10
+
+
 def test_cleanup(dummy_shared_memory_manager):
     dummy_shared_memory_manager.cleanup_memory()
     assert dummy_shared_memory_manager.shared_memory_generator.shared_memories == {}
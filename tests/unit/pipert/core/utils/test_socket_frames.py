@@ -0,0 +1,112 @@
+import os
+import socket
+import pytest
+from pipert2.utils.socket_frames import FrameReceiver, FrameSender, RECEIVE_SIZE
+
+
+@pytest.fixture
+def dummy_address(tmp_path):
+    return os.path.join(str(tmp_path), "dummy.sock")
+
+
+@pytest.fixture
+def dummy_receiver(dummy_address):
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(dummy_address)
+    listener.listen()
+
+    yield FrameReceiver(listener)
+
+    listener.close()
+
+
+def test_send_and_receive_small_frames(dummy_receiver, dummy_address):
+    sender = FrameSender(dummy_address)
+
+    for index in range(10):
+        assert sender.send(f"frame {index}".encode())
+
+    for index in range(10):
+        assert dummy_receiver.receive(timeout=1) == f"frame {index}".encode()
+
+    sender.close()
+
+
+def test_send_and_receive_large_frame(dummy_receiver, dummy_address):
+    sender = FrameSender(dummy_address)
+    large_frame = os.urandom(RECEIVE_SIZE * 4 + 3)
+
+    assert sender.send(large_frame)
+    assert sender.send(b"after")
+
+    received = None
+    while received is None:
+        sender.flush(timeout=0.01)
+        received = dummy_receiver.receive(timeout=0.01)
+
+    assert received == large_frame
+
+    assert dummy_receiver.receive(timeout=1) == b"after"
+
+    sender.close()
+
+
+def test_receive_returns_none_on_timeout(dummy_receiver):
+    assert dummy_receiver.receive(timeout=0.01) is None
+
+
+def test_send_without_receiver_counts_drop(dummy_address):
+    sender = FrameSender(dummy_address)
+
+    assert not sender.send(b"dummy")
+    assert sender.drops.value == 1
+
+
+def test_send_not_bytes_counts_drop(dummy_receiver, dummy_address):
+    sender = FrameSender(dummy_address)
+
+    assert not sender.send({"not": "bytes"})
+    assert sender.drops.value == 1
+
+    sender.close()
+
+
+def test_frames_that_dont_fit_the_backlog_are_dropped(dummy_receiver, dummy_address):
+    sender = FrameSender(dummy_address, max_pending_bytes=RECEIVE_SIZE)
+    frame = bytes(RECEIVE_SIZE)
+
+    sent_frames = sum(sender.send(frame) for _ in range(200))
+
+    assert sent_frames + sender.drops.value == 200
+    assert sender.drops.value > 0
+
+    sender.close()
+
+
+def test_reconnect_backs_off_after_failures(dummy_address):
+    sender = FrameSender(dummy_address)
+
+    assert not sender.send(b"dummy")
+    first_interval = sender._reconnect_interval
+
+    sender._next_connect_time = 0
+    assert not sender.send(b"dummy")
+
+    assert sender._reconnect_interval == first_interval * 2
+
+
+def test_sender_connects_once_receiver_listens(dummy_address):
+    sender = FrameSender(dummy_address)
+    assert not sender.send(b"dummy")
+
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(dummy_address)
+    listener.listen()
+    receiver = FrameReceiver(listener)
+
+    sender._next_connect_time = 0
+    assert sender.send(b"dummy")
+    assert receiver.receive(timeout=1) == b"dummy"
+
+    sender.close()
+    listener.close()
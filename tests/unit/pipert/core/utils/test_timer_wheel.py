@@ -0,0 +1,90 @@
+import pytest
+from pipert2.utils.timer_wheel import TimerWheel, JitterStats
+
+RESOLUTION = 0.001
+
+
+@pytest.fixture()
+def dummy_timer_wheel():
+    return TimerWheel(resolution=RESOLUTION, slot_bits=4, levels=3, start=0)
+
+
+def test_timer_expires_at_its_deadline(dummy_timer_wheel: TimerWheel):
+    dummy_timer_wheel.add(0.005, "timer")
+
+    assert dummy_timer_wheel.advance(0.0049) == []
+    assert dummy_timer_wheel.advance(0.005) == [("timer", pytest.approx(0.005))]
+    assert len(dummy_timer_wheel) == 0
+
+
+@pytest.mark.parametrize("deadline", [0.02, 0.3, 1.5, 4.095, 10])
+def test_far_timers_are_cascaded_to_their_deadline(dummy_timer_wheel: TimerWheel, deadline):
+    dummy_timer_wheel.add(deadline, "timer")
+
+    assert dummy_timer_wheel.advance(deadline - RESOLUTION) == []
+    assert dummy_timer_wheel.advance(deadline + RESOLUTION / 2) == [("timer", pytest.approx(deadline))]
+
+
+def test_timers_expire_by_the_order_of_their_deadlines(dummy_timer_wheel: TimerWheel):
+    deadlines = [0.9, 0.003, 0.25, 0.04, 2.1]
+
+    for deadline in deadlines:
+        dummy_timer_wheel.add(deadline, deadline)
+
+    expired = dummy_timer_wheel.advance(3)
+
+    assert [data for data, _ in expired] == sorted(deadlines)
+
+
+def test_periodic_timer(dummy_timer_wheel: TimerWheel):
+    dummy_timer_wheel.add(0.01, "periodic", interval=0.01)
+
+    fired = [time for time_index in range(1, 6) for _, time in dummy_timer_wheel.advance(time_index * 0.01)]
+
+    assert fired == pytest.approx([0.01, 0.02, 0.03, 0.04, 0.05])
+    assert len(dummy_timer_wheel) == 1
+
+
+def test_late_periodic_timer_fires_once(dummy_timer_wheel: TimerWheel):
+    dummy_timer_wheel.add(0.01, "periodic", interval=0.01)
+
+    assert len(dummy_timer_wheel.advance(0.055)) == 1
+    assert dummy_timer_wheel.advance(0.06) == [("periodic", pytest.approx(0.06))]
+
+
+def test_cancelled_timer_does_not_expire(dummy_timer_wheel: TimerWheel):
+    timer_id = dummy_timer_wheel.add(0.5, "timer")
+
+    assert dummy_timer_wheel.cancel(timer_id)
+    assert not dummy_timer_wheel.cancel(timer_id)
+    assert dummy_timer_wheel.advance(1) == []
+    assert dummy_timer_wheel.next_deadline() is None
+
+
+def test_next_deadline(dummy_timer_wheel: TimerWheel):
+    dummy_timer_wheel.add(0.007, "near")
+
+    assert dummy_timer_wheel.next_deadline() == pytest.approx(0.007)
+
+    dummy_timer_wheel.advance(0.007)
+    dummy_timer_wheel.add(2, "far")
+
+    # The far timer is placed in a higher level, the wheel has to be advanced to cascade it first.
+    assert dummy_timer_wheel.next_deadline() <= 2
+    assert dummy_timer_wheel.advance(dummy_timer_wheel.next_deadline()) == []
+
+
+def test_many_timers(dummy_timer_wheel: TimerWheel):
+    for timer_index in range(5000):
+        dummy_timer_wheel.add((timer_index % 1000) * RESOLUTION + RESOLUTION, timer_index)
+
+    assert len(dummy_timer_wheel.advance(0.5)) == 2500
+    assert len(dummy_timer_wheel.advance(1)) == 2500
+
+
+def test_jitter_stats():
+    jitter_stats = JitterStats()
+    jitter_stats.record(0.001)
+    jitter_stats.record(0.003)
+
+    assert jitter_stats.get_stats() == {"count": 2, "mean": pytest.approx(0.002), "max": 0.003}